@@ -0,0 +1,112 @@
+"""
+Per-page CPU time of HTML extraction on large synthetic pages (1-5 MB).
+
+"legacy" reproduces the former path: readability on the raw string, a re-parse of the
+summary, and a second full parse of the page with six XPath queries for the hero image.
+"single-parse" is `text_extractor.extract_from_html` on decoded text, and "bytes" the same
+on the raw response bytes (no decode/re-encode pass).
+
+Each size is measured with two layouts, reported separately with the tier that was taken:
+"article" wraps the body in <article> and hits the fast path, while "div" has no semantic
+container, so `extract_from_html` falls through to readability like the legacy path does.
+
+Usage:
+    python benchmarks/bench_extraction.py [--sizes-mb 1 2 5] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+from lxml import html
+from readability import Document
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from raindrop_digest.text_extractor import extract_from_html  # noqa: E402
+
+_WORDS = "記事 本文 データ 分析 結果 市場 技術 開発 企業 発表 the of and performance latency".split()
+
+
+def build_page(target_bytes: int, seed: int = 0, container: str = "article") -> str:
+    rng = random.Random(seed)
+    head = (
+        "<html><head><title>Bench</title>"
+        '<meta property="og:image" content="/images/hero.png" />'
+        "<style>" + "body{margin:0}" * 500 + "</style></head><body>"
+        "<nav>" + "".join(f'<a href="/c/{i}">Category {i}</a>' for i in range(200)) + "</nav>"
+    )
+    # <div> だと高速経路の対象にならず、readability まで進む
+    opening, closing = ("<article>", "</article>") if container == "article" else ('<div class="content">', "</div>")
+    chunks = [head, opening]
+    size = len(head)
+    while size < target_bytes:
+        paragraph = " ".join(rng.choice(_WORDS) for _ in range(120))
+        block = (
+            f"<p>{paragraph}</p>"
+            f"<!-- tracking block {size} -->"
+            f"<script>window.__data_{size} = {{'k': '{paragraph[:200]}'}};</script>"
+            f'<div class="share"><a href="/share?u={size}">share</a></div>'
+        )
+        chunks.append(block)
+        size += len(block.encode("utf-8"))
+    chunks.append(f"{closing}<footer>footer</footer></body></html>")
+    return "".join(chunks)
+
+
+def legacy_extract(html_text: str, url: str) -> tuple[str, str | None]:
+    doc = Document(html_text, url=url)
+    text = html.fromstring(doc.summary(html_partial=True)).text_content()
+    tree = html.fromstring(html_text)
+    candidates = []
+    for expr in (
+        "//meta[@property='og:image']/@content",
+        "//meta[@property='og:image:url']/@content",
+        "//meta[@property='og:image:secure_url']/@content",
+        "//meta[@name='twitter:image']/@content",
+        "//meta[@name='twitter:image:src']/@content",
+        "//link[@rel='image_src']/@href",
+    ):
+        candidates.extend(tree.xpath(expr))
+    return text, candidates[0] if candidates else None
+
+
+def _cpu_seconds(fn, *args, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.process_time()
+        fn(*args)
+        best = min(best, time.process_time() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 2, 5])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    url = "https://example.com/article"
+    for size_mb in args.sizes_mb:
+        for container in ("article", "div"):
+            page = build_page(int(size_mb * 1_000_000), container=container)
+            raw = page.encode("utf-8")
+            tier = extract_from_html(raw, url).tier or "readability"
+            legacy = _cpu_seconds(legacy_extract, page, url, repeat=args.repeat)
+            single = _cpu_seconds(extract_from_html, page, url, repeat=args.repeat)
+            from_bytes = _cpu_seconds(extract_from_html, raw, url, repeat=args.repeat)
+            print(
+                f"page={len(raw) / 1e6:4.1f} MB layout={container:<7} tier={tier:<11} "
+                f"legacy={legacy * 1000:8.1f} ms single-parse={single * 1000:8.1f} ms "
+                f"bytes={from_bytes * 1000:8.1f} ms speedup={legacy / from_bytes:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
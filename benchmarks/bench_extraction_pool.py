@@ -0,0 +1,86 @@
+"""
+Inline vs process-pool extraction over a local HTML corpus.
+
+Pages are handed to 8 threads (as the extraction stage does); "inline" parses in those
+threads, "pool" forwards the raw bytes to a ProcessPoolExecutor. Without --corpus, synthetic
+pages are generated (readability-bound: no <article>/<main> fast path).
+
+Usage:
+    python benchmarks/bench_extraction_pool.py [--corpus DIR] [--pages 48] [--workers N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from raindrop_digest.text_extractor import extract_cached  # noqa: E402
+
+_WORDS = "記事 本文 データ 分析 結果 市場 技術 開発 企業 発表 the of and performance latency".split()
+
+
+def synthetic_page(seed: int, paragraphs: int = 1500) -> bytes:
+    rng = random.Random(seed)
+    blocks = []
+    for idx in range(paragraphs):
+        text = " ".join(rng.choice(_WORDS) for _ in range(60))
+        blocks.append(f"<div class='c{idx % 7}'><p>{text}</p><a href='/x/{idx}'>related</a></div>")
+    return ("<html><head><title>t</title></head><body>" + "".join(blocks) + "</body></html>").encode("utf-8")
+
+
+def load_corpus(corpus: Optional[Path], pages: int) -> List[bytes]:
+    if corpus is None:
+        return [synthetic_page(seed) for seed in range(pages)]
+    files = sorted(p for p in corpus.rglob("*") if p.suffix.lower() in (".html", ".htm"))
+    if not files:
+        raise SystemExit(f"no .html files under {corpus}")
+    return [files[idx % len(files)].read_bytes() for idx in range(pages)]
+
+
+def run(documents: List[bytes], pool: Optional[ProcessPoolExecutor]) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as threads:
+        futures = [
+            threads.submit(extract_cached, doc, f"https://example.com/{idx}", "web", None, pool=pool)
+            for idx, doc in enumerate(documents)
+        ]
+        for future in futures:
+            try:
+                future.result()
+            except Exception:  # noqa: BLE001 - empty pages in a real corpus are expected
+                pass
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", type=Path, default=None, help="directory of saved .html pages")
+    parser.add_argument("--pages", type=int, default=48)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    documents = load_corpus(args.corpus, args.pages)
+    total_mb = sum(len(doc) for doc in documents) / 1e6
+    inline = run(documents, None)
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        run(documents[: args.workers], pool)  # ワーカーの起動と import を計測から外す
+        pooled = run(documents, pool)
+    print(
+        f"pages={len(documents)} ({total_mb:.1f} MB) workers={args.workers} "
+        f"inline={inline:.2f}s pool={pooled:.2f}s speedup={inline / pooled:.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
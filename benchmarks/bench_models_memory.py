@@ -0,0 +1,138 @@
+"""
+Peak memory of item/result models for large synthetic backlogs (tracemalloc).
+
+"before" uses the former plain dataclasses with eagerly parsed `created`;
+"after" uses the slotted models in raindrop_digest.models. Like a real run (`filter_new_items`
+and the final sort), it reads `created` of every item, so the lazy parse is not counted as a
+saving. Neither side keeps extracted text once an item is summarized, so the difference is the
+per-object overhead of the models.
+
+Usage:
+    python benchmarks/bench_models_memory.py [--sizes 10000 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from raindrop_digest.models import ExtractedContent, RaindropItem, SummaryResult  # noqa: E402
+from raindrop_digest.utils import parse_raindrop_datetime  # noqa: E402
+
+TEXT = "本文テキスト " * 400
+SUMMARY = "要約 " * 100
+
+
+@dataclass
+class _DictRaindropItem:
+    id: int
+    link: str
+    title: str
+    created: datetime
+    tags: List[str]
+    note: Optional[str] = None
+    collection_id: int = -1
+
+
+@dataclass
+class _DictExtractedContent:
+    text: str
+    source: str
+    length: int
+    hero_image_url: Optional[str] = None
+
+
+@dataclass
+class _DictSummaryResult:
+    item: _DictRaindropItem
+    status: str
+    summary: Optional[str] = None
+    error: Optional[str] = None
+    hero_image_url: Optional[str] = None
+    source_length: Optional[int] = None
+
+
+def _raw(idx: int) -> dict:
+    return {
+        "_id": idx,
+        "link": f"https://example.com/articles/{idx}",
+        "title": f"Article {idx}",
+        "created": f"2024-12-{1 + idx % 28:02d}T{idx % 24:02d}:00:00.000Z",
+        "tags": [],
+    }
+
+
+def _text_offset(raw: dict) -> int:
+    # 同一文字列の共有を避けるため、本文の長さを少しずつ変える。
+    return raw["_id"] % 997
+
+
+def _build_before(raws: List[dict]) -> list:
+    results = []
+    for raw in raws:
+        item = _DictRaindropItem(
+            id=raw["_id"],
+            link=raw["link"],
+            title=raw["title"],
+            created=parse_raindrop_datetime(raw["created"]),
+            tags=raw["tags"],
+        )
+        # 旧実装も抽出結果は要約後に手放していたので、ここでも保持しない。
+        content = _DictExtractedContent(text=TEXT[: 100 + _text_offset(raw)], source="web", length=len(TEXT))
+        results.append(_DictSummaryResult(item=item, status="success", summary=SUMMARY, source_length=content.length))
+    return [results]
+
+
+def _build_after(raws: List[dict]) -> list:
+    results = []
+    for raw in raws:
+        item = RaindropItem(
+            id=raw["_id"],
+            link=raw["link"],
+            title=raw["title"],
+            created=raw["created"],
+            tags=raw["tags"],
+        )
+        # 実行時は新着判定と並べ替えで全件の created を読むので、ここでも読んで解析させる。
+        _ = item.created
+        content = ExtractedContent(text=TEXT[: 100 + _text_offset(raw)], source="web", length=len(TEXT))
+        content.release_text()
+        results.append(SummaryResult(item=item, status="success", summary=SUMMARY, source_length=content.length))
+    return [results]
+
+
+def _peak(builder, raws: List[dict]) -> int:
+    tracemalloc.start()
+    kept = builder(raws)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        raws = [_raw(idx) for idx in range(size)]
+        before = _peak(_build_before, raws)
+        after = _peak(_build_after, raws)
+        print(
+            f"items={size:>7} before={before / 1e6:8.1f} MB after={after / 1e6:8.1f} MB "
+            f"ratio={after / before:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
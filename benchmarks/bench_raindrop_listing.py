@@ -0,0 +1,63 @@
+"""
+Compare sequential vs concurrent Raindrop listing against a simulated high-latency API.
+
+Usage:
+    python benchmarks/bench_raindrop_listing.py [--items 1000] [--latency 0.15]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from raindrop_digest.raindrop_client import RaindropClient  # noqa: E402
+
+
+def _build_transport(total: int, latency: float) -> httpx.MockTransport:
+    all_items = [
+        {
+            "_id": idx,
+            "link": f"https://example.com/{idx}",
+            "title": f"title {idx}",
+            "created": "2024-12-07T00:00:00Z",
+            "tags": [],
+        }
+        for idx in range(total)
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(latency)
+        page = int(request.url.params["page"])
+        perpage = int(request.url.params["perpage"])
+        chunk = all_items[page * perpage : (page + 1) * perpage]
+        return httpx.Response(200, json={"result": True, "items": chunk, "count": total})
+
+    return httpx.MockTransport(handler)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.15, help="simulated seconds per request")
+    args = parser.parse_args()
+
+    for concurrency in (1, 2, 4, 8):
+        client = RaindropClient(token="bench", transport=_build_transport(args.items, args.latency))
+        started = time.perf_counter()
+        items = client.fetch_unsorted_items(concurrency=concurrency)
+        elapsed = time.perf_counter() - started
+        client.close()
+        mode = "sequential" if concurrency == 1 else f"concurrent x{concurrency}"
+        print(f"{mode:<16} items={len(items):>5} elapsed={elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,4 +9,14 @@ __all__ = [
     "mailer",
     "email_formatter",
     "orchestrator",
+    "writeback",
+    "state_store",
+    "storage",
+    "concurrency",
+    "http_cache",
+    "extraction_cache",
+    "host_memory",
+    "compaction",
+    "link_resolver",
+    "summary_cache",
 ]
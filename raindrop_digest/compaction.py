@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Set
+
+# NOTE:
+# トークン数は tokenizer を持ち込まずに概算する。日本語（CJK）は 1 文字 ≒ 1 トークン、
+# それ以外はおおむね 4 文字 ≒ 1 トークン（OpenAI の目安）として数える。
+_CJK_RE = re.compile(r"[぀-ヿ㐀-䶿一-鿿豈-﫿ｦ-ﾟ]")
+_SPACES_RE = re.compile(r"[ \t　 ​]+")
+
+# 文末（日本語の句点・感嘆符、英語の . ! ? の後の空白）で区切る。
+_SENTENCE_END_RE = re.compile(r"(?<=[。．！？!?])|(?<=[.!?])\s+")
+
+# 共有ボタン・会員登録の誘導・著作権表示など、本文ではない定型句。
+# 語を含むだけでは消さず、短い行の大半がこれらで占められている場合だけ定型行とみなす。
+_BOILERPLATE_MAX_CHARS = 60
+_BOILERPLATE_MAX_REST_RATIO = 0.4
+_BOILERPLATE_RE = re.compile(
+    r"この記事をシェア|シェアする|シェア|ツイート|はてなブックマーク|LINEで送る|ブックマーク|フォローする|"
+    r"ログイン|会員登録|無料登録|メルマガ|ニュースレター|スポンサーリンク|広告|関連記事|おすすめ記事|"
+    r"人気記事|続きを読む|前の記事|次の記事|コメントする|コメント|"
+    r"\b(share( this( article| post)?)?|tweet|facebook|pinterest|linkedin|reddit|e-?mail|print|"
+    r"sign (in|up)|log ?in|subscribe|newsletter|follow us|advertisement|sponsored|"
+    r"related (posts|articles|stories)|read more|comments?|copyright|all rights reserved)\b|©",
+    re.IGNORECASE,
+)
+_NON_WORD_RE = re.compile(r"[\W\d_]+")
+
+# Cookie の同意バナーは一文が長いので、長さの上限を広げて別に判定する。
+# Cookie を話題にした本文を消さないよう、サイト自身の告知や同意ボタンの文言がある行だけを対象にする。
+_COOKIE_MAX_CHARS = 200
+_COOKIE_RE = re.compile(r"cookie|クッキー", re.IGNORECASE)
+_COOKIE_BANNER_RE = re.compile(
+    r"we use cookies|this (web)?site uses cookies|by (continuing|using)|accept (all|cookies)|"
+    r"cookie (policy|settings|preferences)|manage cookies|"
+    r"当サイト|本サイト|当ウェブサイト|同意する|同意します|同意の上|"
+    r"(cookie|クッキー) ?(ポリシー|設定)",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class CompactionResult:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    dropped_lines: int
+    truncated: bool
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+def estimate_tokens(text: str) -> int:
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def compact_text(text: str, *, max_tokens: int, max_chars: Optional[int] = None) -> CompactionResult:
+    """
+    Shrink extracted text before summarization.
+
+    Collapses whitespace, drops repeated and boilerplate lines (share buttons, cookie notices,
+    navigation leftovers), then keeps whole sentences until the estimated `max_tokens` budget
+    (or `max_chars` characters, if given) is used up, instead of cutting mid-sentence.
+    """
+    if max_chars is None:
+        max_chars = len(text)
+    tokens_before = estimate_tokens(text)
+    lines: List[str] = []
+    seen: Set[str] = set()
+    dropped = 0
+    for raw_line in text.splitlines():
+        line = _SPACES_RE.sub(" ", raw_line).strip()
+        if not line:
+            continue
+        if line in seen or _is_boilerplate(line):
+            dropped += 1
+            continue
+        seen.add(line)
+        lines.append(line)
+
+    kept, truncated = _take_sentences(lines, max_tokens, max_chars)
+    compacted = "\n".join(kept)
+    if not compacted and text.strip():
+        # すべて定型行と判定された場合は、判定を誤った可能性が高いので元の本文を予算内で使う。
+        compacted = _cut_to_budget(_SPACES_RE.sub(" ", text).strip(), max_tokens, max_chars)
+        truncated = len(compacted) < len(text.strip())
+    return CompactionResult(
+        text=compacted,
+        tokens_before=tokens_before,
+        tokens_after=estimate_tokens(compacted),
+        dropped_lines=dropped,
+        truncated=truncated,
+    )
+
+
+def _is_boilerplate(line: str) -> bool:
+    if len(line) <= _BOILERPLATE_MAX_CHARS and _BOILERPLATE_RE.search(line):
+        rest = _NON_WORD_RE.sub("", _BOILERPLATE_RE.sub("", line))
+        words = _NON_WORD_RE.sub("", line)
+        if len(rest) <= len(words) * _BOILERPLATE_MAX_REST_RATIO:
+            return True
+    return len(line) <= _COOKIE_MAX_CHARS and bool(_COOKIE_RE.search(line)) and bool(_COOKIE_BANNER_RE.search(line))
+
+
+def _take_sentences(lines: List[str], max_tokens: int, max_chars: int) -> "tuple[List[str], bool]":
+    kept: List[str] = []
+    budget = max_tokens
+    # 行や文をつなぐ改行・空白も 1 文字として数える（先頭の 1 文字分はあらかじめ足しておく）
+    chars_left = max_chars + 1
+    for line in lines:
+        cost = estimate_tokens(line)
+        if cost <= budget and len(line) + 1 <= chars_left:
+            kept.append(line)
+            budget -= cost
+            chars_left -= len(line) + 1
+            continue
+        partial: List[str] = []
+        # 改行の 1 文字を先に引き、英語などは文の間の空白も数える
+        chars_left -= 1
+        separator = 1 if _is_spaced(line) else 0
+        for sentence in _SENTENCE_END_RE.split(line):
+            if not sentence:
+                continue
+            sentence_cost = estimate_tokens(sentence)
+            if sentence_cost > budget or len(sentence) + separator > chars_left:
+                break
+            partial.append(sentence)
+            budget -= sentence_cost
+            chars_left -= len(sentence) + separator
+        if partial:
+            kept.append(" ".join(s.strip() for s in partial) if _is_spaced(line) else "".join(partial))
+        elif not kept:
+            # 句点のない巨大な1行しかない場合だけは、予算に収まる長さで切る。
+            kept.append(_cut_to_budget(line, max_tokens, max_chars))
+        return kept, True
+    return kept, False
+
+
+def _is_spaced(line: str) -> bool:
+    return not _CJK_RE.search(line)
+
+
+def _cut_to_budget(line: str, max_tokens: int, max_chars: int) -> str:
+    low, high = 0, min(len(line), max_chars)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(line[:mid]) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return line[:low]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter, deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+def host_of(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+class HostLimitedExecutor:
+    """
+    Thread pool with a global cap and a per-hostname cap.
+
+    Unlike a plain pool with per-host semaphores, a worker never blocks on a busy host: it picks
+    the oldest queued task whose host still has a free slot, so one slow domain cannot occupy
+    every worker. Futures are returned in submission order by the caller, which keeps results
+    aligned with the input order.
+    """
+
+    def __init__(self, max_workers: int, per_host: int, *, thread_name_prefix: str = "host-limited"):
+        if max_workers < 1 or per_host < 1:
+            raise ValueError("max_workers and per_host must be >= 1")
+        self._per_host = per_host
+        self._cond = threading.Condition()
+        self._queue: Deque[Tuple[str, Future, Callable[..., Any], tuple]] = deque()
+        self._active: Counter[str] = Counter()
+        self._shutdown = False
+        self._threads: List[threading.Thread] = []
+        for idx in range(max_workers):
+            thread = threading.Thread(target=self._worker, name=f"{thread_name_prefix}-{idx}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, url: str, fn: Callable[..., Any], *args: Any) -> Future:
+        future: Future = Future()
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("cannot submit after shutdown")
+            self._queue.append((host_of(url), future, fn, args))
+            self._cond.notify()
+        return future
+
+    def shutdown(self, *, cancel_pending: bool = False) -> None:
+        with self._cond:
+            self._shutdown = True
+            if cancel_pending:
+                while self._queue:
+                    _host, future, _fn, _args = self._queue.popleft()
+                    future.cancel()
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self) -> "HostLimitedExecutor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown(cancel_pending=exc_type is not None)
+
+    def _next_task(self) -> Optional[Tuple[str, Future, Callable[..., Any], tuple]]:
+        with self._cond:
+            while True:
+                for idx, task in enumerate(self._queue):
+                    if self._active[task[0]] < self._per_host:
+                        del self._queue[idx]
+                        self._active[task[0]] += 1
+                        return task
+                if self._shutdown and not self._queue:
+                    return None
+                self._cond.wait()
+
+    def _worker(self) -> None:
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            host, future, fn, args = task
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args))
+                    except BaseException as exc:  # noqa: BLE001 - delivered through the future
+                        future.set_exception(exc)
+            finally:
+                with self._cond:
+                    self._active[host] -= 1
+                    self._cond.notify_all()
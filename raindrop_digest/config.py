@@ -21,14 +21,94 @@ def _env_int(name: str, default: int, *, min_value: int | None = None) -> int:
 
     return parsed
 
+def _env_collection_ids(name: str, default: tuple[int, ...]) -> tuple[int, ...]:
+    raw_value = os.getenv(name)
+    if raw_value is None or not raw_value.strip():
+        return default
+
+    if raw_value.strip().lower() == "all":
+        return (ALL_COLLECTIONS_ID,)
+
+    try:
+        parsed = tuple(int(part.strip()) for part in raw_value.split(",") if part.strip())
+    except ValueError as exc:
+        raise ValueError(
+            f"Environment variable {name} must be 'all' or comma-separated integers, got {raw_value!r}."
+        ) from exc
+    if not parsed:
+        return default
+    return tuple(dict.fromkeys(parsed))
+
 # --------------------------------
 # 設定値
 
 # 何日前までのリンクを処理するか（日数）
 BATCH_LOOKBACK_DAYS = _env_int("BATCH_LOOKBACK_DAYS", default=1, min_value=1)
 
-# 抽出する最大文字数
-MAX_EXTRACT_CHARS = 10_000
+# Raindrop 一覧取得の並列数（1 なら従来どおり逐次取得）
+RAINDROP_FETCH_CONCURRENCY = _env_int("RAINDROP_FETCH_CONCURRENCY", default=4, min_value=1)
+
+# Raindrop への note 書き戻しの並列数
+RAINDROP_WRITE_CONCURRENCY = _env_int("RAINDROP_WRITE_CONCURRENCY", default=4, min_value=1)
+
+# 本文抽出の並列数（全体）と、同一ホストへの同時リクエスト数の上限
+EXTRACT_CONCURRENCY = _env_int("EXTRACT_CONCURRENCY", default=8, min_value=1)
+EXTRACT_PER_HOST_CONCURRENCY = _env_int("EXTRACT_PER_HOST_CONCURRENCY", default=2, min_value=1)
+
+# HTML の解析（readability / lxml）を別プロセスで行うワーカー数。0 でスレッド内で実行、-1 で CPU コア数
+EXTRACT_PROCESS_WORKERS = _env_int("EXTRACT_PROCESS_WORKERS", default=0, min_value=-1)
+
+# 実行間で引き継ぐ状態・キャッシュの保存先（GitHub Actions ではキャッシュで復元する）
+CACHE_DIR = os.getenv("RAINDROP_DIGEST_CACHE_DIR", "").strip() or ".cache/raindrop_digest"
+
+# 抽出する最大文字数（要約に渡す前に compaction でトークン予算まで圧縮するので、ここは余裕を持たせる）
+MAX_EXTRACT_CHARS = 30_000
+
+# OpenAI への要約リクエストの最大同時実行数（レート制限ヘッダと 429 に応じて自動で絞る）
+SUMMARY_CONCURRENCY = _env_int("SUMMARY_CONCURRENCY", default=4, min_value=1)
+
+# 要約対象がこの件数以上なら OpenAI Batch API でまとめて投げる（0 で無効）。
+# 締め切りまでに終わらなかった分は通常のリクエストで要約する。
+SUMMARY_BATCH_MIN_ITEMS = _env_int("SUMMARY_BATCH_MIN_ITEMS", default=0, min_value=0)
+SUMMARY_BATCH_DEADLINE_MINUTES = _env_int("SUMMARY_BATCH_DEADLINE_MINUTES", default=60, min_value=1)
+
+# 短い記事（SHORT_ARTICLE_CHAR_THRESHOLD 文字未満）をこの推定トークン数までまとめて 1 リクエストで要約する（0 で無効）
+SUMMARY_PACK_MAX_TOKENS = _env_int("SUMMARY_PACK_MAX_TOKENS", default=0, min_value=0)
+
+# 要約に渡す本文の推定トークン数の上限（定型行を除いたうえで、文の切れ目で打ち切る）。
+# 日本語は 1 文字 ≒ 1 トークンなので、以前の 10,000 文字の上限を下回らない値にしている
+SUMMARY_INPUT_MAX_TOKENS = _env_int("SUMMARY_INPUT_MAX_TOKENS", default=10_000, min_value=100)
+
+# 要約に渡す本文の最大文字数。英語などは 4 文字 ≒ 1 トークンと数えるため、トークン予算だけでは
+# 以前の 10,000 文字の上限より多く送ってしまう。圧縮後もこの文字数を超えないようにする
+SUMMARY_INPUT_MAX_CHARS = 10_000
+
+# 1記事あたりに読み込む本文の最大バイト数（これを超えた分は読まずに切り捨てる）
+MAX_FETCH_BYTES = _env_int("MAX_FETCH_BYTES", default=3_000_000, min_value=1)
+
+# 1記事の取得にかける合計時間の上限（接続・読み込み・User-Agent の切り替えをすべて含む）
+FETCH_DEADLINE_SECONDS = _env_int("FETCH_DEADLINE_SECONDS", default=30, min_value=1)
+
+# 最初の User-Agent がこの時間（ミリ秒）応答しなければ、次の候補を並行して投げる（0 で無効）
+FETCH_HEDGE_DELAY_MS = _env_int("FETCH_HEDGE_DELAY_MS", default=0, min_value=0)
+
+# 連続する実行で取得に失敗し続けたホストをスキップする時間（分）。ホストごとに成功した User-Agent も覚えておく
+# 1日1回の定期実行で次の実行まで残るよう、既定値は 25 時間にしている
+HOST_NEGATIVE_CACHE_MINUTES = _env_int("HOST_NEGATIVE_CACHE_MINUTES", default=1_500, min_value=0)
+
+# 短縮 URL（t.co / bit.ly など）の解決結果を保持する日数
+SHORT_LINK_CACHE_DAYS = _env_int("SHORT_LINK_CACHE_DAYS", default=30, min_value=1)
+
+# 記事本文の HTTP キャッシュ（CACHE_DIR 配下）。合計サイズの上限（0 で無効）と保持期間
+HTTP_CACHE_MAX_BYTES = _env_int("HTTP_CACHE_MAX_BYTES", default=100_000_000, min_value=0)
+HTTP_CACHE_TTL_HOURS = _env_int("HTTP_CACHE_TTL_HOURS", default=72, min_value=1)
+
+# 抽出結果キャッシュ（URL と本文ハッシュ → 抽出結果）の最大件数（0 で無効）
+EXTRACTION_CACHE_MAX_ENTRIES = _env_int("EXTRACTION_CACHE_MAX_ENTRIES", default=5_000, min_value=0)
+
+# 要約キャッシュ（モデル・プロンプト・入力本文のハッシュ → 要約）の最大件数（0 で無効）と保持期間
+SUMMARY_CACHE_MAX_ENTRIES = _env_int("SUMMARY_CACHE_MAX_ENTRIES", default=5_000, min_value=0)
+SUMMARY_CACHE_TTL_DAYS = _env_int("SUMMARY_CACHE_TTL_DAYS", default=30, min_value=1)
 
 # 要約の最大文字数
 SUMMARY_CHAR_LIMIT = 500
@@ -59,6 +139,12 @@ TAG_FAILED = "要約失敗"
 
 # Raindrop API の未整理コレクションID
 UNSORTED_COLLECTION_ID = -1
+
+# Raindrop API の「すべて」（ゴミ箱以外の全コレクション）を表すID
+ALL_COLLECTIONS_ID = 0
+
+# 要約対象のコレクションID（カンマ区切り、または "all"）。未設定なら未整理のみ。
+RAINDROP_COLLECTION_IDS = _env_collection_ids("RAINDROP_COLLECTION_IDS", default=(UNSORTED_COLLECTION_ID,))
 # --------------------------------
 
 @dataclass
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .models import ExtractedContent
+from .storage import connect_sqlite
+from .utils import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExtractionCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evicted: int = 0
+
+
+def content_hash(body: str | bytes) -> str:
+    if isinstance(body, str):
+        body = body.encode("utf-8", "replace")
+    return hashlib.sha256(body).hexdigest()
+
+
+class ExtractionCache:
+    """
+    Persisted `ExtractedContent` keyed by canonical URL and a hash of the fetched page.
+
+    An unchanged page therefore skips parsing, readability and hero-image detection entirely.
+    `variant` identifies the extraction settings (e.g. the character cap); entries written
+    under another variant are treated as misses. At most `max_entries` are kept, evicting the
+    least recently used.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        max_entries: int,
+        variant: str = "",
+        clock: Callable[[], float] = time.time,
+    ):
+        self._max_entries = max_entries
+        self._variant = variant
+        self._clock = clock
+        self._stats = ExtractionCacheStats()
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS extraction_cache (
+                url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                variant TEXT NOT NULL,
+                text TEXT NOT NULL,
+                source TEXT NOT NULL,
+                length INTEGER NOT NULL,
+                hero_image_url TEXT,
+                tier TEXT,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (url, content_hash)
+            );
+            CREATE INDEX IF NOT EXISTS extraction_cache_accessed ON extraction_cache (accessed_at);
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(extraction_cache)")}
+        if "tier" not in columns:
+            self._conn.execute("ALTER TABLE extraction_cache ADD COLUMN tier TEXT")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> ExtractionCacheStats:
+        with self._lock:
+            return ExtractionCacheStats(**vars(self._stats))
+
+    def get(self, url: str, body_hash: str) -> Optional[ExtractedContent]:
+        key = canonicalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, source, length, hero_image_url, tier FROM extraction_cache "
+                "WHERE url = ? AND content_hash = ? AND variant = ?",
+                (key, body_hash, self._variant),
+            ).fetchone()
+            if row is None:
+                self._stats.misses += 1
+                return None
+            self._stats.hits += 1
+            self._conn.execute(
+                "UPDATE extraction_cache SET accessed_at = ? WHERE url = ? AND content_hash = ?",
+                (self._clock(), key, body_hash),
+            )
+        text, source, length, hero_image_url, tier = row
+        return ExtractedContent(text=text, source=source, length=length, hero_image_url=hero_image_url, tier=tier)
+
+    def put(self, url: str, body_hash: str, content: ExtractedContent) -> None:
+        key = canonicalize_url(url)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                # 同じ URL の古い版は再利用されないので、書き込みのついでに捨てる。
+                self._conn.execute("DELETE FROM extraction_cache WHERE url = ?", (key,))
+                self._conn.execute(
+                    "INSERT INTO extraction_cache "
+                    "(url, content_hash, variant, text, source, length, hero_image_url, tier, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        body_hash,
+                        self._variant,
+                        content.text,
+                        content.source,
+                        content.length,
+                        content.hero_image_url,
+                        content.tier,
+                        self._clock(),
+                    ),
+                )
+                cursor = self._conn.execute(
+                    "DELETE FROM extraction_cache WHERE rowid IN ("
+                    "SELECT rowid FROM extraction_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self._max_entries,),
+                )
+                self._stats.evicted += max(cursor.rowcount, 0)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
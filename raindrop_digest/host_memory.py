@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Set
+
+from .storage import connect_sqlite
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HostState:
+    user_agent: Optional[str]
+    failures: int
+    blocked_until: Optional[float]
+    reason: Optional[str]
+
+
+class HostMemory:
+    """
+    Persisted per-host fetch outcomes.
+
+    Remembers the User-Agent that last succeeded for each host so it can be tried first, and
+    puts hosts that failed in `failure_threshold` consecutive runs (blocked by every User-Agent,
+    unreachable, too slow) into a negative cache for `negative_ttl_seconds`. While an entry is
+    live, fetches to the host fail fast with the cached reason.
+
+    One instance covers one run: a host is counted at most once per instance, so several
+    links to a host that hiccups during a single run do not block it.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        negative_ttl_seconds: float,
+        failure_threshold: int = 2,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._negative_ttl_seconds = negative_ttl_seconds
+        self._failure_threshold = failure_threshold
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failed_this_run: Set[str] = set()
+        self._conn = connect_sqlite(path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS host_memory (
+                host TEXT PRIMARY KEY,
+                user_agent TEXT,
+                failures INTEGER NOT NULL DEFAULT 0,
+                blocked_until REAL,
+                reason TEXT,
+                updated_at REAL NOT NULL
+            );
+            """
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def preferred_user_agent(self, host: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT user_agent FROM host_memory WHERE host = ?", (host,)).fetchone()
+        return row[0] if row else None
+
+    def blocked_reason(self, host: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT reason FROM host_memory WHERE host = ? AND blocked_until > ?", (host, self._clock())
+            ).fetchone()
+        return row[0] if row else None
+
+    def record_success(self, host: str, user_agent: str) -> None:
+        with self._lock:
+            self._failed_this_run.discard(host)
+            self._conn.execute(
+                "INSERT INTO host_memory (host, user_agent, failures, blocked_until, reason, updated_at) "
+                "VALUES (?, ?, 0, NULL, NULL, ?) "
+                "ON CONFLICT(host) DO UPDATE SET user_agent = excluded.user_agent, failures = 0, "
+                "blocked_until = NULL, reason = NULL, updated_at = excluded.updated_at",
+                (host, user_agent, self._clock()),
+            )
+
+    def record_failure(self, host: str, reason: str) -> bool:
+        """Count a host-level failure (once per run); returns True when the host is now negatively cached."""
+        now = self._clock()
+        with self._lock:
+            if host in self._failed_this_run:
+                # 同じ実行内の2回目以降は一時的な不調の可能性が高いので数えない
+                row = self._conn.execute(
+                    "SELECT 1 FROM host_memory WHERE host = ? AND blocked_until > ?", (host, now)
+                ).fetchone()
+                return row is not None
+            self._failed_this_run.add(host)
+            row = self._conn.execute("SELECT failures FROM host_memory WHERE host = ?", (host,)).fetchone()
+            failures = (row[0] if row else 0) + 1
+            blocked_until = now + self._negative_ttl_seconds if failures >= self._failure_threshold else None
+            self._conn.execute(
+                "INSERT INTO host_memory (host, user_agent, failures, blocked_until, reason, updated_at) "
+                "VALUES (?, NULL, ?, ?, ?, ?) "
+                "ON CONFLICT(host) DO UPDATE SET failures = excluded.failures, "
+                "blocked_until = excluded.blocked_until, reason = excluded.reason, updated_at = excluded.updated_at",
+                (host, failures, blocked_until, reason, now),
+            )
+        if blocked_until is not None:
+            logger.warning("Host %s failed %s times in a row; skipping it for %.0fs", host, failures, self._negative_ttl_seconds)
+        return blocked_until is not None
+
+    def snapshot(self) -> Dict[str, HostState]:
+        """Current state of every remembered host (for debugging and logs)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT host, user_agent, failures, blocked_until, reason FROM host_memory ORDER BY host"
+            ).fetchall()
+        return {
+            host: HostState(user_agent=user_agent, failures=failures, blocked_until=blocked_until, reason=reason)
+            for host, user_agent, failures, blocked_until, reason in rows
+        }
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .storage import connect_sqlite
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    body: bytes
+    encoding: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    On-disk cache of article bodies for conditional revalidation across runs.
+
+    Entries are keyed by the final (post-redirect) URL; the requested URL is kept as an alias
+    so a retried link finds the entry before it is fetched. Only responses carrying an `ETag`
+    or `Last-Modified` are stored, since the body is only ever reused after a 304. Entries
+    expire after `ttl_seconds`, and the least recently used ones are evicted once the stored
+    bodies exceed `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        max_bytes: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._max_bytes = max_bytes
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                encoding TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS http_cache_accessed ON http_cache (accessed_at);
+            CREATE TABLE IF NOT EXISTS http_cache_aliases (
+                request_url TEXT PRIMARY KEY,
+                final_url TEXT NOT NULL
+            );
+            """
+        )
+        self._expire()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT final_url FROM http_cache_aliases WHERE request_url = ?", (url,)
+            ).fetchone()
+            final_url = row[0] if row else url
+            row = self._conn.execute(
+                "SELECT body, encoding, etag, last_modified, stored_at FROM http_cache WHERE url = ?",
+                (final_url,),
+            ).fetchone()
+            if row is None:
+                return None
+            body, encoding, etag, last_modified, stored_at = row
+            if now - stored_at > self._ttl_seconds:
+                self._conn.execute("DELETE FROM http_cache WHERE url = ?", (final_url,))
+                return None
+            self._conn.execute("UPDATE http_cache SET accessed_at = ? WHERE url = ?", (now, final_url))
+        return CachedResponse(url=final_url, body=body, encoding=encoding, etag=etag, last_modified=last_modified)
+
+    def store(
+        self,
+        request_url: str,
+        final_url: str,
+        body: bytes,
+        encoding: str,
+        *,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> bool:
+        """Store a 200 response; returns False when it is not cacheable (no validators or too large)."""
+        if not (etag or last_modified) or len(body) > self._max_bytes:
+            return False
+        now = self._clock()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO http_cache "
+                    "(url, body, encoding, etag, last_modified, size, stored_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (final_url, body, encoding, etag, last_modified, len(body), now, now),
+                )
+                if request_url != final_url:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO http_cache_aliases (request_url, final_url) VALUES (?, ?)",
+                        (request_url, final_url),
+                    )
+                self._evict_locked()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def refresh(self, url: str, *, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Mark an entry as revalidated after a 304, picking up any updated validators."""
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE http_cache SET stored_at = ?, accessed_at = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (now, now, etag, last_modified, url),
+            )
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+
+    def _expire(self) -> None:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM http_cache WHERE stored_at < ?", (self._clock() - self._ttl_seconds,)
+            )
+            if cursor.rowcount:
+                logger.info("HTTP cache: expired %s entries", cursor.rowcount)
+            self._delete_orphan_aliases_locked()
+
+    def _evict_locked(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        evicted = []
+        for url, size in self._conn.execute("SELECT url, size FROM http_cache ORDER BY accessed_at").fetchall():
+            if total <= self._max_bytes:
+                break
+            evicted.append((url,))
+            total -= size
+        self._conn.executemany("DELETE FROM http_cache WHERE url = ?", evicted)
+        self._delete_orphan_aliases_locked()
+        logger.info("HTTP cache: evicted %s least recently used entries", len(evicted))
+
+    def _delete_orphan_aliases_locked(self) -> None:
+        self._conn.execute(
+            "DELETE FROM http_cache_aliases WHERE final_url NOT IN (SELECT url FROM http_cache)"
+        )
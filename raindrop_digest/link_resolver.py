@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+from .concurrency import host_of
+from .storage import connect_sqlite
+from .text_extractor import DEFAULT_PRIMARY_USER_AGENT, get_http_client
+
+logger = logging.getLogger(__name__)
+
+# リダイレクトするだけの短縮 URL サービス（本文はリダイレクト先にしかない）
+SHORTENER_HOSTS = frozenset(
+    {
+        "t.co",
+        "bit.ly",
+        "lnkd.in",
+        "buff.ly",
+        "ow.ly",
+        "tinyurl.com",
+        "goo.gl",
+        "is.gd",
+        "t.ly",
+        "rebrand.ly",
+        "ift.tt",
+        "dlvr.it",
+        "trib.al",
+        "fb.me",
+        "amzn.to",
+        "amzn.asia",
+        "htn.to",
+        "nkbp.jp",
+    }
+)
+
+_RESOLVE_TIMEOUT_SECONDS = 10.0
+
+
+def is_shortened(url: str) -> bool:
+    return host_of(url) in SHORTENER_HOSTS
+
+
+class LinkResolver:
+    """
+    Resolve links on known shortener hosts to their destination URL.
+
+    Resolution uses HEAD requests (a body-less GET when the shortener rejects HEAD) run in
+    parallel, and successful resolutions are cached on disk for `ttl_seconds`. Failures are
+    not cached and map back to the original link.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        ttl_seconds: float,
+        max_workers: int = 8,
+        client: httpx.Client | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._ttl_seconds = ttl_seconds
+        self._max_workers = max(1, max_workers)
+        self._client = client
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS short_links (
+                url TEXT PRIMARY KEY,
+                resolved TEXT NOT NULL,
+                resolved_at REAL NOT NULL
+            );
+            """
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def resolve_many(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Map every URL to its destination; URLs that are not shortened map to themselves."""
+        resolved: Dict[str, str] = {}
+        pending: List[str] = []
+        for url in urls:
+            if url in resolved or url in pending:
+                continue
+            if not is_shortened(url):
+                resolved[url] = url
+                continue
+            cached = self._cached(url)
+            if cached is not None:
+                resolved[url] = cached
+            else:
+                pending.append(url)
+        if not pending:
+            return resolved
+
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(pending)), thread_name_prefix="resolve") as pool:
+            destinations = list(pool.map(self._resolve, pending))
+        fresh = [(url, dest) for url, dest in zip(pending, destinations) if dest is not None]
+        for url, dest in zip(pending, destinations):
+            resolved[url] = dest or url
+        if fresh:
+            self._store(fresh)
+        logger.info("Resolved %s/%s short links", len(fresh), len(pending))
+        return resolved
+
+    def _cached(self, url: str) -> Optional[str]:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT resolved FROM short_links WHERE url = ? AND resolved_at > ?",
+                    (url, self._clock() - self._ttl_seconds),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Short link cache unavailable: %s", exc)
+            return None
+        return row[0] if row else None
+
+    def _store(self, pairs: List[tuple]) -> None:
+        now = self._clock()
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO short_links (url, resolved, resolved_at) VALUES (?, ?, ?)",
+                    [(url, dest, now) for url, dest in pairs],
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Failed to persist short link resolutions: %s", exc)
+
+    def _resolve(self, url: str) -> Optional[str]:
+        client = self._client or get_http_client()
+        headers = {"User-Agent": DEFAULT_PRIMARY_USER_AGENT}
+        try:
+            response = client.head(url, headers=headers, follow_redirects=True, timeout=_RESOLVE_TIMEOUT_SECONDS)
+            if str(response.url) == url and response.status_code >= 400:
+                # HEAD を受け付けない短縮サービス向け。リダイレクト先だけ分かればよいので本文は読まない。
+                with client.stream(
+                    "GET", url, headers=headers, follow_redirects=True, timeout=_RESOLVE_TIMEOUT_SECONDS
+                ) as streamed:
+                    response = streamed
+        except httpx.HTTPError as exc:
+            logger.warning("Failed to resolve short link %s: %s", url, exc)
+            return None
+        destination = str(response.url)
+        if destination == url:
+            return None
+        logger.info("Short link %s -> %s", url, destination)
+        return destination
@@ -2,35 +2,121 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple, Union
 
+# NOTE:
+# 大量のアイテムを扱うバックログ実行ではインスタンスごとの __dict__ が効いてくるため、
+# 要素数の多いモデルは __slots__ 付きの素朴なクラスにしています（Python 3.9 では
+# dataclass(slots=True) が使えないため）。__repr__ / __eq__ は dataclass 相当です。
 
-@dataclass
-class RaindropItem:
-    id: int
-    link: str
-    title: str
-    created: datetime
-    tags: List[str]
-    note: Optional[str] = None
 
+class _SlottedModel:
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
 
-@dataclass
-class ExtractedContent:
-    text: str
-    source: str  # e.g., "youtube", "x", "web"
-    length: int
-    hero_image_url: Optional[str] = None
+    def _values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self._fields)
 
+    def __repr__(self) -> str:
+        args = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({args})"
 
-@dataclass
-class SummaryResult:
-    item: RaindropItem
-    status: str  # "success" | "failed"
-    summary: Optional[str] = None
-    error: Optional[str] = None
-    hero_image_url: Optional[str] = None
-    source_length: Optional[int] = None
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()  # type: ignore[attr-defined]
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+class RaindropItem(_SlottedModel):
+    """
+    A Raindrop bookmark.
+
+    `created` may be given as the raw API string; it is parsed on first access so that items
+    filtered out by tags never pay for datetime parsing.
+    """
+
+    __slots__ = ("id", "link", "title", "_created", "_created_raw", "tags", "note", "collection_id")
+    _fields = ("id", "link", "title", "created", "tags", "note", "collection_id")
+
+    def __init__(
+        self,
+        id: int,
+        link: str,
+        title: str,
+        created: Union[datetime, str],
+        tags: List[str],
+        note: Optional[str] = None,
+        collection_id: int = -1,  # Raindrop の未整理コレクション
+    ):
+        self.id = id
+        self.link = link
+        self.title = title
+        self.created = created
+        self.tags = tags
+        self.note = note
+        self.collection_id = collection_id
+
+    @property
+    def created(self) -> datetime:
+        if self._created is None:
+            from .utils import parse_raindrop_datetime
+
+            self._created = parse_raindrop_datetime(self._created_raw)  # type: ignore[arg-type]
+            self._created_raw = None
+        return self._created
+
+    @created.setter
+    def created(self, value: Union[datetime, str]) -> None:
+        if isinstance(value, str):
+            self._created, self._created_raw = None, value
+        else:
+            self._created, self._created_raw = value, None
+
+
+class ExtractedContent(_SlottedModel):
+    __slots__ = ("text", "source", "length", "hero_image_url", "tier")
+    _fields = ("text", "source", "length", "hero_image_url", "tier")
+
+    def __init__(
+        self,
+        text: str,
+        source: str,  # e.g., "youtube", "x", "web"
+        length: int,
+        hero_image_url: Optional[str] = None,
+        tier: Optional[str] = None,  # 本文を取り出した抽出段: "jsonld" | "article" | "main" | "readability"
+    ):
+        self.text = text
+        self.source = source
+        self.length = length
+        self.hero_image_url = hero_image_url
+        self.tier = tier
+
+    def release_text(self) -> None:
+        """Drop the extracted text once it has been summarized; `length` is kept for the email."""
+        self.text = ""
+
+
+class SummaryResult(_SlottedModel):
+    __slots__ = ("item", "status", "summary", "error", "hero_image_url", "source_length")
+    _fields = ("item", "status", "summary", "error", "hero_image_url", "source_length")
+
+    def __init__(
+        self,
+        item: RaindropItem,
+        status: str,  # "success" | "failed"
+        summary: Optional[str] = None,
+        error: Optional[str] = None,
+        hero_image_url: Optional[str] = None,
+        source_length: Optional[int] = None,
+    ):
+        self.item = item
+        self.status = status
+        self.summary = summary
+        self.error = error
+        self.hero_image_url = hero_image_url
+        self.source_length = source_length
 
     def is_success(self) -> bool:
         return self.status == "success"
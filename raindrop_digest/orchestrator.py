@@ -1,32 +1,85 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Tuple
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 from . import config
-from .config import BATCH_LOOKBACK_DAYS, TAG_DELIVERED, TAG_FAILED
+from .config import (
+    BATCH_LOOKBACK_DAYS,
+    CACHE_DIR,
+    EXTRACT_CONCURRENCY,
+    EXTRACT_PER_HOST_CONCURRENCY,
+    RAINDROP_COLLECTION_IDS,
+    RAINDROP_FETCH_CONCURRENCY,
+    RAINDROP_WRITE_CONCURRENCY,
+    SHORT_LINK_CACHE_DAYS,
+    SUMMARY_BATCH_DEADLINE_MINUTES,
+    SUMMARY_BATCH_MIN_ITEMS,
+    SUMMARY_CACHE_MAX_ENTRIES,
+    SUMMARY_CACHE_TTL_DAYS,
+    SUMMARY_INPUT_MAX_CHARS,
+    SUMMARY_INPUT_MAX_TOKENS,
+    SUMMARY_PACK_MAX_TOKENS,
+    TAG_DELIVERED,
+)
+from .compaction import compact_text
 from .email_formatter import build_email_body, build_email_subject
 from .mailer import MailError, build_mailer
-from .models import RaindropItem, SummaryResult
-from .raindrop_client import RaindropApiError, RaindropClient, RaindropConnectionError
-from .summarizer import Summarizer, SummaryConnectionError, SummaryError, SummaryRateLimitError
-from .text_extractor import ExtractionError, extract_text
+from .concurrency import HostLimitedExecutor
+from .link_resolver import LinkResolver, is_shortened
+from .models import ExtractedContent, RaindropItem, SummaryResult
+from .raindrop_client import EXCLUDED_TAGS, RaindropApiError, RaindropClient, RaindropConnectionError
+from .state_store import SyncStateStore
+from .summary_cache import SummaryCache
+from .summarizer import (
+    Summarizer,
+    SummaryConnectionError,
+    SummaryError,
+    SummaryOutcome,
+    SummaryRateLimitError,
+    SummarySession,
+)
+from .text_extractor import (
+    EXTRACTION_METRICS,
+    ExtractionError,
+    close_extraction_cache,
+    close_http_client,
+    extract_text,
+    shutdown_extraction_pool,
+)
+from .writeback import apply_writeback
 
 from .utils import canonicalize_url, choose_preferred_duplicate, filter_new_items, threshold_from_now, to_jst, utc_now
 
 logger = logging.getLogger(__name__)
 
 
-def run(settings: config.Settings) -> List[SummaryResult]:
+def run(settings: config.Settings, collection_ids: Optional[Iterable[int]] = None) -> List[SummaryResult]:
+    """
+    Run one digest batch over `collection_ids` (default: `RAINDROP_COLLECTION_IDS`).
+
+    Several collections are listed concurrently under the client's shared rate budget and
+    merged into one deduplicated digest.
+    """
+    collection_ids = tuple(collection_ids) if collection_ids is not None else RAINDROP_COLLECTION_IDS
     now = utc_now()
     now_jst = to_jst(now)
     threshold = threshold_from_now(now_jst, BATCH_LOOKBACK_DAYS)
 
     raindrop = RaindropClient(token=settings.raindrop_token)
+    state = _open_state_store()
+    resolver = _open_link_resolver()
+    summary_cache = _open_summary_cache()
     summarizer = Summarizer(
         api_key=settings.openai_api_key,
         model=settings.openai_model,
         system_prompt=settings.summary_system_prompt,
+        cache=summary_cache,
     )
     mailer = build_mailer(
         brevo_api_key=settings.brevo_api_key,
@@ -43,21 +96,76 @@ def run(settings: config.Settings) -> List[SummaryResult]:
     logger.info("Using mail provider=%s", mailer.provider)
 
     failure_notified = False
+    EXTRACTION_METRICS.reset()
     try:
-        raw_items = raindrop.fetch_unsorted_items()
-        targets = filter_new_items(raw_items, threshold)
-        targets, duplicates = _dedupe_targets(targets)
+        since = threshold
+        cursor = state.created_cursor() if state is not None else None
+        if cursor is not None and cursor > since:
+            logger.info("Resuming from sync cursor %s", cursor.isoformat())
+            since = cursor
+        processed_ids = state.processed_ids() if state is not None else set()
+
+        # ページが届いた順に本文抽出を並列で始め、後続ページの取得と重ねる。
+        # 抽出が終わった項目から順に要約へ回し、結果は元の順序に並べ直す。
+        groups = _DuplicateGroups()
+        listed = 0
+        with _SummaryPipeline(summarizer) as pipeline:
+            with HostLimitedExecutor(
+                EXTRACT_CONCURRENCY, EXTRACT_PER_HOST_CONCURRENCY, thread_name_prefix="extract"
+            ) as extractor:
+                with closing(
+                    raindrop.iter_collections_pages(
+                        collection_ids,
+                        concurrency=RAINDROP_FETCH_CONCURRENCY,
+                        created_since=since,
+                        exclude_tags=EXCLUDED_TAGS,
+                    )
+                ) as pages:
+                    for page_items in pages:
+                        listed += len(page_items)
+                        new_items = [
+                            item for item in filter_new_items(page_items, since) if item.id not in processed_ids
+                        ]
+                        # 短縮 URL はリダイレクト先で重複判定し、本文もリダイレクト先から直接取る。
+                        targets = (
+                            resolver.resolve_many(item.link for item in new_items) if resolver is not None else {}
+                        )
+                        for item in new_items:
+                            target = targets.get(item.link, item.link)
+                            if not groups.add(item, target):
+                                continue
+                            pipeline.add(item, extractor.submit(target, extract_text, target))
+            results = pipeline.results()
+
+        duplicates: List[RaindropItem] = []
+        cross_collection: List[RaindropItem] = []
+        for result in results:
+            result.item, group_duplicates = groups.resolve(result.item)
+            for dup in group_duplicates:
+                # 別コレクションに保存された同一URLは削除せず、配信済みとして今後の対象から外す。
+                if dup.collection_id == result.item.collection_id:
+                    duplicates.append(dup)
+                else:
+                    cross_collection.append(dup)
         if duplicates:
             logger.info("Detected %s duplicate items; deleting redundant ones", len(duplicates))
-            for dup in duplicates:
+            for collection_id, ids in _ids_by_collection(duplicates).items():
+                try:
+                    raindrop.delete_items(ids, collection_id)
+                except (RaindropConnectionError, RaindropApiError) as exc:
+                    logger.warning("Failed to delete duplicate items ids=%s: %s", ids, exc)
+        if cross_collection:
+            logger.info("Detected %s duplicates in other collections; tagging them as delivered", len(cross_collection))
+            for collection_id, ids in _ids_by_collection(cross_collection).items():
                 try:
-                    raindrop.delete_item(dup.id)
+                    raindrop.bulk_add_tags(ids, [TAG_DELIVERED], collection_id)
                 except (RaindropConnectionError, RaindropApiError) as exc:
-                    logger.warning("Failed to delete duplicate item id=%s: %s", dup.id, exc)
-        logger.info("Processing %s target items (from %s total)", len(targets), len(raw_items))
+                    logger.warning("Failed to tag duplicate items ids=%s: %s", ids, exc)
+        # 複数コレクションはページが到着順に混ざるので、メールは従来どおり新しい順に並べる。
+        results.sort(key=lambda r: r.item.created, reverse=True)
+        logger.info("Processed %s target items (from %s listed)", len(results), listed)
 
-        results: List[SummaryResult] = []
-        if not targets:
+        if not results:
             logger.info("No new items to process; sending empty report.")
             subject = build_email_subject(now_jst)
             empty_text = f"過去{BATCH_LOOKBACK_DAYS}日分の保存リンクは0件でした。"
@@ -66,53 +174,6 @@ def run(settings: config.Settings) -> List[SummaryResult]:
             logger.info("Empty report sent.")
             return results
 
-        for idx, item in enumerate(targets, start=1):
-            logger.info("---- Processing item %s/%s ----", idx, len(targets))
-            logger.info("Raindrop id=%s title=%s", item.id, item.title)
-            logger.info("link=%s", item.link)
-            try:
-                content = extract_text(item.link)
-                logger.info("Extracted content: chars=%s source=%s", content.length, content.source)
-                try:
-                    summary_text = summarizer.summarize(content.text)
-                    results.append(
-                        SummaryResult(
-                            item=item,
-                            status="success",
-                            summary=summary_text,
-                            hero_image_url=content.hero_image_url,
-                            source_length=content.length,
-                        )
-                    )
-                except (SummaryRateLimitError, SummaryConnectionError) as exc:
-                    logger.exception("OpenAI transient failure for item %s: %s", item.id, exc)
-                    results.append(
-                        SummaryResult(
-                            item=item,
-                            status="failed",
-                            error=str(exc),
-                            hero_image_url=content.hero_image_url,
-                            source_length=content.length,
-                        )
-                    )
-                except SummaryError as exc:
-                    logger.exception("Summarization failed for item %s: %s", item.id, exc)
-                    results.append(
-                        SummaryResult(
-                            item=item,
-                            status="failed",
-                            error=str(exc),
-                            hero_image_url=content.hero_image_url,
-                            source_length=content.length,
-                        )
-                    )
-            except (ExtractionError, SummaryError) as exc:
-                logger.exception("Failed to process item %s: %s", item.id, exc)
-                results.append(SummaryResult(item=item, status="failed", error=str(exc)))
-            except Exception as exc:  # noqa: BLE001
-                logger.exception("Unexpected failure for item %s: %s", item.id, exc)
-                results.append(SummaryResult(item=item, status="failed", error=str(exc)))
-
         subject = build_email_subject(now_jst)
         text_body, html_body = build_email_body(now_jst, results)
         try:
@@ -129,17 +190,23 @@ def run(settings: config.Settings) -> List[SummaryResult]:
             _log_batch_counts(results)
             return results
 
-        for result in results:
+        failed_ids = apply_writeback(raindrop, results, max_workers=RAINDROP_WRITE_CONCURRENCY)
+        incomplete = raindrop.incomplete_listings()
+        if state is not None and incomplete:
+            # 読めなかったページの項目はカーソルより古くなるため、カーソルを進めず次回もう一度一覧する。
+            # 今回配信した項目は書き戻したタグで次回の一覧から外れる。
+            logger.warning(
+                "Listing was incomplete for collections %s; keeping the sync cursor", sorted(incomplete)
+            )
+        elif state is not None:
             try:
-                if result.is_success() and result.summary:
-                    note_text = f"▼サマリー\n{result.summary}"
-                    raindrop.append_note_and_tags(result.item, note_text, [TAG_DELIVERED])
-                else:
-                    error_note = f"要約失敗: {result.error}" if result.error else "要約失敗"
-                    raindrop.append_note_and_tags(result.item, error_note, [TAG_DELIVERED, TAG_FAILED])
-            except (RaindropConnectionError, RaindropApiError) as exc:
-                logger.exception("Failed to update Raindrop item %s: %s", result.item.id, exc)
-                continue
+                state.record_run(
+                    processed=[r.item for r in results if r.item.id not in failed_ids],
+                    unprocessed=[r.item for r in results if r.item.id in failed_ids],
+                    processed_at=now,
+                )
+            except sqlite3.Error as exc:
+                logger.warning("Failed to persist sync state: %s", exc)
 
         _log_batch_counts(results)
         return results
@@ -152,7 +219,26 @@ def run(settings: config.Settings) -> List[SummaryResult]:
                 logger.exception("Failed to send failure notification email.")
         raise
     finally:
+        stats = raindrop.rate_limit_stats()
+        logger.info(
+            "Raindrop requests=%s throttled=%.1fs (waits=%s, 429=%s)",
+            stats.requests,
+            stats.throttled_seconds,
+            stats.throttle_count,
+            stats.rate_limited_responses,
+        )
+        _log_extraction_tiers()
+        if summary_cache is not None:
+            _log_summary_cache(summary_cache)
+            summary_cache.close()
         raindrop.close()
+        if state is not None:
+            state.close()
+        if resolver is not None:
+            resolver.close()
+        close_http_client()
+        close_extraction_cache()
+        shutdown_extraction_pool()
 
 
 def _count_success(results: List[SummaryResult]) -> int:
@@ -170,28 +256,233 @@ def _log_batch_counts(results: List[SummaryResult]) -> None:
     logger.info("Batch completed. Total=%s Success=%s Failure=%s", total, success, failure)
 
 
-def _dedupe_targets(targets: List[RaindropItem]) -> Tuple[List[RaindropItem], List[RaindropItem]]:
-    by_key: Dict[str, List[RaindropItem]] = {}
-    for item in targets:
-        key = canonicalize_url(item.link)
-        by_key.setdefault(key, []).append(item)
+def _log_extraction_tiers() -> None:
+    tiers = EXTRACTION_METRICS.snapshot()
+    if not tiers:
+        return
+    logger.info(
+        "Extraction tiers: %s",
+        " ".join(
+            f"{tier}={stats.count} ({stats.seconds:.2f}s cpu)" for tier, stats in sorted(tiers.items())
+        ),
+    )
+
+
+def _open_state_store() -> Optional[SyncStateStore]:
+    # キャッシュディレクトリは毎回復元されるので、壊れたファイルで毎回落ちないよう状態なしで続行する
+    try:
+        return SyncStateStore(Path(CACHE_DIR) / "sync_state.sqlite3")
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("Sync state unavailable; processing the full lookback window: %s", exc)
+        return None
+
+
+def _open_link_resolver() -> Optional[LinkResolver]:
+    try:
+        return LinkResolver(
+            Path(CACHE_DIR) / "short_links.sqlite3",
+            ttl_seconds=SHORT_LINK_CACHE_DAYS * 86400,
+            max_workers=EXTRACT_CONCURRENCY,
+        )
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("Short link resolution disabled: %s", exc)
+        return None
+
+
+def _open_summary_cache() -> Optional[SummaryCache]:
+    if SUMMARY_CACHE_MAX_ENTRIES <= 0:
+        return None
+    try:
+        return SummaryCache(
+            Path(CACHE_DIR) / "summaries.sqlite3",
+            ttl_seconds=SUMMARY_CACHE_TTL_DAYS * 86400,
+            max_entries=SUMMARY_CACHE_MAX_ENTRIES,
+        )
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("Summary cache disabled: %s", exc)
+        return None
+
+
+def _log_summary_cache(cache: SummaryCache) -> None:
+    stats = cache.stats()
+    logger.info(
+        "Summary cache: hits=%s misses=%s (hit ratio %.0f%%) tokens_saved~%s evicted=%s",
+        stats.hits,
+        stats.misses,
+        stats.hit_ratio * 100,
+        stats.tokens_saved,
+        stats.evicted,
+    )
+
+
+class _SummaryPipeline:
+    """
+    Hands each item to the summarizer as soon as its extraction finishes; `results` returns
+    them in the order they were added.
+
+    Compaction runs in the extraction callback and the article text is released right away,
+    so the compacted text is only referenced by its summary request until it completes. In
+    batch or pack mode the compacted texts are collected instead and summarized together once
+    every extraction is done.
+    """
+
+    def __init__(self, summarizer: Summarizer):
+        self._summarizer = summarizer
+        self._collect = bool(SUMMARY_BATCH_MIN_ITEMS or SUMMARY_PACK_MAX_TOKENS)
+        self._session: Optional[SummarySession] = None if self._collect else summarizer.session()
+        self._lock = threading.Lock()
+        # 各位置は SummaryResult（確定）か (item, content, 要約の Future または圧縮済み本文)
+        self._slots: List[Any] = []
+
+    def __enter__(self) -> "_SummaryPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._session is not None:
+            self._session.close()
+
+    def add(self, item: RaindropItem, extraction: "Future[ExtractedContent]") -> None:
+        with self._lock:
+            position = len(self._slots)
+            self._slots.append(None)
+        extraction.add_done_callback(lambda done: self._on_extracted(position, item, done))
+
+    def _on_extracted(self, position: int, item: RaindropItem, extraction: "Future[ExtractedContent]") -> None:
+        try:
+            slot = _prepare_item(item, extraction)
+            if not isinstance(slot, SummaryResult):
+                content, text = slot
+                # メールに使うのは長さと画像だけなので、元の本文はここで手放す
+                content.release_text()
+                slot = (item, content, text if self._session is None else self._session.submit(text))
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Unexpected failure for item %s: %s", item.id, exc)
+            slot = SummaryResult(item=item, status="failed", error=str(exc))
+        with self._lock:
+            self._slots[position] = slot
+
+    def results(self) -> List[SummaryResult]:
+        """Wait for every summary; call after all extractions have finished."""
+        if self._collect:
+            self._summarize_collected()
+        results: List[SummaryResult] = []
+        for position, slot in enumerate(self._slots):
+            if isinstance(slot, tuple):
+                item, content, request = slot
+                slot = _summary_result(item, content, request.result())
+                self._slots[position] = slot
+            results.append(slot)
+        return results
+
+    def _summarize_collected(self) -> None:
+        positions = [position for position, slot in enumerate(self._slots) if isinstance(slot, tuple)]
+        texts = [self._slots[position][2] for position in positions]
+        if SUMMARY_BATCH_MIN_ITEMS and len(texts) >= SUMMARY_BATCH_MIN_ITEMS:
+            # 溜まったバックログは Batch API（半額）で流し、終わらなかった分だけ同期で要約する。
+            outcomes = self._summarizer.summarize_batch(texts, deadline_seconds=SUMMARY_BATCH_DEADLINE_MINUTES * 60)
+        elif SUMMARY_PACK_MAX_TOKENS:
+            outcomes = self._summarizer.summarize_packed(texts, max_tokens=SUMMARY_PACK_MAX_TOKENS)
+        else:
+            outcomes = self._summarizer.summarize_many(texts)
+        del texts
+        for position, outcome in zip(positions, outcomes):
+            item, content, _ = self._slots[position]
+            self._slots[position] = _summary_result(item, content, outcome)
+
 
-    kept: List[RaindropItem] = []
-    duplicates: List[RaindropItem] = []
-    for key, items in by_key.items():
+def _prepare_item(
+    item: RaindropItem, extraction: "Future[ExtractedContent]"
+) -> Union[SummaryResult, Tuple[ExtractedContent, str]]:
+    """Wait for the item's extraction and compact it; returns a failed result when extraction fails."""
+    logger.info("Raindrop id=%s title=%s", item.id, item.title)
+    logger.info("link=%s", item.link)
+    try:
+        content = extraction.result()
+    except ExtractionError as exc:
+        logger.exception("Failed to process item %s: %s", item.id, exc)
+        return SummaryResult(item=item, status="failed", error=str(exc))
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Unexpected failure for item %s: %s", item.id, exc)
+        return SummaryResult(item=item, status="failed", error=str(exc))
+    logger.info("Extracted content: chars=%s source=%s tier=%s", content.length, content.source, content.tier)
+    compacted = compact_text(
+        content.text, max_tokens=SUMMARY_INPUT_MAX_TOKENS, max_chars=SUMMARY_INPUT_MAX_CHARS
+    )
+    logger.info(
+        "Compacted content: tokens=%s->%s (saved %s, dropped_lines=%s%s)",
+        compacted.tokens_before,
+        compacted.tokens_after,
+        compacted.tokens_saved,
+        compacted.dropped_lines,
+        ", truncated" if compacted.truncated else "",
+    )
+    return content, compacted.text
+
+
+def _summary_result(item: RaindropItem, content: ExtractedContent, outcome: SummaryOutcome) -> SummaryResult:
+    if outcome.error is None and outcome.summary is not None:
+        return SummaryResult(
+            item=item,
+            status="success",
+            summary=outcome.summary,
+            hero_image_url=content.hero_image_url,
+            source_length=content.length,
+        )
+    exc = outcome.error or SummaryError("OpenAI returned no summary.")
+    if isinstance(exc, (SummaryRateLimitError, SummaryConnectionError)):
+        logger.error("OpenAI transient failure for item %s: %s", item.id, exc)
+    else:
+        logger.error("Summarization failed for item %s: %s", item.id, exc)
+    return SummaryResult(
+        item=item,
+        status="failed",
+        error=str(exc),
+        hero_image_url=content.hero_image_url,
+        source_length=content.length,
+    )
+
+
+def _ids_by_collection(items: List[RaindropItem]) -> Dict[int, List[int]]:
+    grouped: Dict[int, List[int]] = {}
+    for item in items:
+        grouped.setdefault(item.collection_id, []).append(item.id)
+    return grouped
+
+
+class _DuplicateGroups:
+    """
+    Incremental URL dedupe over a stream of items.
+
+    The first item of each canonical URL is processed right away; later duplicates only join
+    its group. Items are keyed by their resolved URL when given (short links). Once the stream
+    ends, `resolve` swaps in the preferred item of the group (the processed content is the same
+    page), never a short link when a direct one exists, and returns the rest for deletion.
+    """
+
+    def __init__(self) -> None:
+        self._keys: Dict[int, str] = {}
+        self._groups: Dict[str, List[RaindropItem]] = {}
+
+    def add(self, item: RaindropItem, resolved_url: Optional[str] = None) -> bool:
+        key = canonicalize_url(resolved_url or item.link)
+        group = self._groups.setdefault(key, [])
+        group.append(item)
+        if len(group) > 1:
+            return False
+        self._keys[item.id] = key
+        return True
+
+    def resolve(self, first: RaindropItem) -> Tuple[RaindropItem, List[RaindropItem]]:
+        key = self._keys[first.id]
+        items = self._groups[key]
         if len(items) == 1:
-            kept.append(items[0])
-            continue
-        preferred = choose_preferred_duplicate(items)
-        kept.append(preferred)
-        for item in items:
-            if item.id != preferred.id:
-                duplicates.append(item)
+            return first, []
+        preferred = choose_preferred_duplicate([i for i in items if not is_shortened(i.link)] or items)
+        duplicates = [i for i in items if i.id != preferred.id]
         logger.info(
             "Duplicate URL group: canonical=%s kept=%s deleted=%s",
             key,
             preferred.link,
-            [i.link for i in items if i.id != preferred.id],
+            [i.link for i in duplicates],
         )
-
-    return kept, duplicates
+        return preferred, duplicates
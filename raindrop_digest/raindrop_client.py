@@ -1,17 +1,35 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
-from typing import List, Optional
+import math
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 import httpx
 
 from .config import TAG_CONFIRMED, TAG_DELIVERED, TAG_FAILED, UNSORTED_COLLECTION_ID
 from .models import RaindropItem
-from .utils import append_note, parse_raindrop_datetime
 
 logger = logging.getLogger(__name__)
 
+# 一括更新・削除 API に 1 リクエストで渡す id 数の上限
+BULK_CHUNK_SIZE = 100
+
+# Raindrop API のレート制限（1 ユーザあたり 120 リクエスト/分）
+DEFAULT_RATE_LIMIT = 120
+RATE_LIMIT_PERIOD_SECONDS = 60.0
+
+# 429 を受けたときに reset まで待って再試行する最大回数
+MAX_RATE_LIMIT_RETRIES = 5
+
+
 class RaindropError(Exception):
     """Raised when Raindrop operations fail."""
 
@@ -24,71 +42,406 @@ class RaindropApiError(RaindropError):
     """Raised when Raindrop returns an error response."""
 
 
+@dataclass
+class RateLimitStats:
+    requests: int
+    throttle_count: int
+    throttled_seconds: float
+    rate_limited_responses: int
+
+
+class RateLimitScheduler:
+    """
+    Thread-safe token bucket that paces Raindrop requests.
+
+    The bucket starts from the documented per-minute quota and is kept in sync with the
+    `X-RateLimit-Limit/Remaining/Reset` response headers: the local budget never exceeds what
+    the server reports as remaining, and once it reaches zero (or a 429 arrives) every caller
+    waits until the reported reset time.
+    """
+
+    def __init__(
+        self,
+        limit: int = DEFAULT_RATE_LIMIT,
+        period: float = RATE_LIMIT_PERIOD_SECONDS,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._lock = threading.Lock()
+        self._period = period
+        self._capacity = float(limit)
+        self._tokens = float(limit)
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self._blocked_until = 0.0
+        self._requests = 0
+        self._throttle_count = 0
+        self._throttled_seconds = 0.0
+        self._rate_limited_responses = 0
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0 and self._tokens >= 1:
+                    self._tokens -= 1
+                    self._requests += 1
+                    return
+                if wait <= 0:
+                    wait = (1 - self._tokens) * self._period / self._capacity
+                self._throttle_count += 1
+                self._throttled_seconds += wait
+            logger.debug("Raindrop rate limit: waiting %.2fs", wait)
+            self._sleep(wait)
+
+    def observe(self, response: httpx.Response) -> None:
+        limit = _header_int(response, "X-RateLimit-Limit")
+        remaining = _header_int(response, "X-RateLimit-Remaining")
+        reset_after = self._seconds_until_reset(response)
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if limit:
+                self._capacity = float(limit)
+            if remaining is not None:
+                self._tokens = min(self._tokens, float(remaining))
+                if remaining <= 0 and reset_after is not None:
+                    self._blocked_until = max(self._blocked_until, now + reset_after)
+
+    def defer(self, response: httpx.Response) -> float:
+        """Block all callers after a 429 until Raindrop's reset time; returns the wait in seconds."""
+        wait = _header_int(response, "Retry-After")
+        if wait is None:
+            reset_after = self._seconds_until_reset(response)
+            wait = reset_after if reset_after is not None else self._period
+        with self._lock:
+            self._rate_limited_responses += 1
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, self._clock() + max(wait, 0))
+        return float(wait)
+
+    def stats(self) -> RateLimitStats:
+        with self._lock:
+            return RateLimitStats(
+                requests=self._requests,
+                throttle_count=self._throttle_count,
+                throttled_seconds=self._throttled_seconds,
+                rate_limited_responses=self._rate_limited_responses,
+            )
+
+    def _refill(self, now: float) -> None:
+        if self._blocked_until and now >= self._blocked_until:
+            # reset 時刻を過ぎたらサーバ側の枠が戻るので、バケットも満タンに戻す。
+            self._blocked_until = 0.0
+            self._tokens = self._capacity
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self._capacity, self._tokens + elapsed * self._capacity / self._period)
+        self._updated_at = now
+
+    def _seconds_until_reset(self, response: httpx.Response) -> float | None:
+        reset_epoch = _header_int(response, "X-RateLimit-Reset")
+        if reset_epoch is None:
+            return None
+        return max(reset_epoch - self._wall_clock(), 0.0)
+
+
 class RaindropClient:
-    def __init__(self, token: str, base_url: str = "https://api.raindrop.io"):
+    def __init__(
+        self,
+        token: str,
+        base_url: str = "https://api.raindrop.io",
+        *,
+        transport: httpx.BaseTransport | None = None,
+        scheduler: RateLimitScheduler | None = None,
+    ):
         self._client = httpx.Client(
-            base_url=base_url, headers={"Authorization": f"Bearer {token}"}, timeout=20.0
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=20.0,
+            transport=transport,
         )
+        self._scheduler = scheduler or RateLimitScheduler()
+        self._incomplete_lock = threading.Lock()
+        self._incomplete_collections: Set[int] = set()
 
     def close(self) -> None:
         self._client.close()
 
-    def fetch_unsorted_items(self, perpage: int = 50, max_pages: int = 20) -> List[RaindropItem]:
+    def rate_limit_stats(self) -> RateLimitStats:
+        return self._scheduler.stats()
+
+    def incomplete_listings(self) -> Set[int]:
+        """Collections whose last listing stopped early (a skipped page or the `max_pages` cap)."""
+        with self._incomplete_lock:
+            return set(self._incomplete_collections)
+
+    def fetch_unsorted_items(
+        self,
+        perpage: int = 50,
+        max_pages: int = 20,
+        *,
+        concurrency: int = 1,
+        created_since: datetime | None = None,
+        exclude_tags: Iterable[str] = (),
+    ) -> List[RaindropItem]:
+        """List Unsorted items sorted by `-created` (see `iter_pages`)."""
         items: List[RaindropItem] = []
-        for page in range(max_pages):
-            response = self._request_with_retry(
-                "GET",
-                f"/rest/v1/raindrops/{UNSORTED_COLLECTION_ID}",
-                params={"page": page, "perpage": perpage, "sort": "-created"},
-            )
-            if response is None:
-                logger.warning("Skipping fetch page %s due to transient errors.", page)
-                break
-            data = response.json()
-            page_items = data.get("items", [])
-            logger.info("Fetched %s items from page %s", len(page_items), page)
-            for raw in page_items:
-                item = self._to_model(raw)
-                items.append(item)
-            if len(page_items) < perpage:
-                break
+        for page_items in self.iter_unsorted_pages(
+            perpage,
+            max_pages,
+            concurrency=concurrency,
+            created_since=created_since,
+            exclude_tags=exclude_tags,
+        ):
+            items.extend(page_items)
         return items
 
-    def append_note_and_tags(
+    def iter_unsorted_pages(
         self,
-        item: RaindropItem,
-        note_addition: Optional[str],
-        extra_tags: List[str],
-    ) -> None:
-        merged_note = append_note(item.note, note_addition) if note_addition else item.note or ""
-        merged_tags = list({*item.tags, *extra_tags})
-        payload = {"note": merged_note, "tags": merged_tags}
-        logger.info("Updating Raindrop item %s with tags=%s", item.id, merged_tags)
-        response = self._request_with_retry("PUT", f"/rest/v1/raindrop/{item.id}", json=payload)
+        perpage: int = 50,
+        max_pages: int = 20,
+        *,
+        concurrency: int = 1,
+        created_since: datetime | None = None,
+        exclude_tags: Iterable[str] = (),
+    ) -> Iterator[List[RaindropItem]]:
+        return self.iter_pages(
+            UNSORTED_COLLECTION_ID,
+            perpage,
+            max_pages,
+            concurrency=concurrency,
+            created_since=created_since,
+            exclude_tags=exclude_tags,
+        )
+
+    def iter_collections_pages(
+        self,
+        collection_ids: Iterable[int],
+        perpage: int = 50,
+        max_pages: int = 20,
+        *,
+        concurrency: int = 1,
+        created_since: datetime | None = None,
+        exclude_tags: Iterable[str] = (),
+    ) -> Iterator[List[RaindropItem]]:
+        """
+        Yield pages from several collections, listing them concurrently.
+
+        Pages are yielded as soon as any collection delivers one, so the order across
+        collections is not defined (within a collection it stays `-created`). All listings share
+        this client's rate-limit scheduler.
+        """
+        ids = list(dict.fromkeys(collection_ids))
+        if len(ids) == 1:
+            yield from self.iter_pages(
+                ids[0],
+                perpage,
+                max_pages,
+                concurrency=concurrency,
+                created_since=created_since,
+                exclude_tags=exclude_tags,
+            )
+            return
+
+        pages: "queue.Queue[Tuple[Optional[List[RaindropItem]], Optional[BaseException]]]" = queue.Queue()
+        stop = threading.Event()
+
+        def produce(collection_id: int) -> None:
+            try:
+                with closing(
+                    self.iter_pages(
+                        collection_id,
+                        perpage,
+                        max_pages,
+                        concurrency=concurrency,
+                        created_since=created_since,
+                        exclude_tags=exclude_tags,
+                    )
+                ) as collection_pages:
+                    for page_items in collection_pages:
+                        if stop.is_set():
+                            break
+                        pages.put((page_items, None))
+            except BaseException as exc:  # noqa: BLE001 - re-raised in the consumer
+                pages.put((None, exc))
+                return
+            pages.put((None, None))
+
+        executor = ThreadPoolExecutor(max_workers=len(ids))
+        for collection_id in ids:
+            executor.submit(produce, collection_id)
+        remaining = len(ids)
+        try:
+            while remaining:
+                page_items, error = pages.get()
+                if error is not None:
+                    raise error
+                if page_items is None:
+                    remaining -= 1
+                    continue
+                yield page_items
+        finally:
+            stop.set()
+            executor.shutdown(wait=True)
+
+    def iter_pages(
+        self,
+        collection_id: int,
+        perpage: int = 50,
+        max_pages: int = 20,
+        *,
+        concurrency: int = 1,
+        created_since: datetime | None = None,
+        exclude_tags: Iterable[str] = (),
+    ) -> Iterator[List[RaindropItem]]:
+        """
+        Yield a collection's items page by page in `-created` order while later pages load.
+
+        The first page is fetched alone to learn the total `count`; afterwards up to
+        `concurrency` pages stay in flight in background threads (`concurrency=1` keeps the
+        original one-request-at-a-time paging, but still prefetches the next page while the
+        caller works on the current one).
+
+        `created_since` / `exclude_tags` are pushed into the Raindrop `search` query, and paging
+        stops as soon as a page reaches items older than `created_since`. The server-side date
+        filter is day-granular, so callers must still apply their exact filter (`filter_new_items`).
+
+        When a page is skipped after transient errors or `max_pages` is reached before the end,
+        the collection is reported by `incomplete_listings()` once the iteration finishes.
+        """
+        with self._incomplete_lock:
+            self._incomplete_collections.discard(collection_id)
+        search = build_search_query(created_since, exclude_tags)
+        window = max(1, concurrency)
+        executor = ThreadPoolExecutor(max_workers=window)
+        pending: Deque[Future] = deque([executor.submit(self._fetch_page, collection_id, 0, perpage, search)])
+        next_page = 1
+        last_page = max_pages
+        total_pages: Optional[int] = None
+        complete = False
+        seen_ids: Set[int] = set()
+        try:
+            while pending:
+                data = pending.popleft().result()
+                if data is None:
+                    break
+                raw_items = data.get("items", [])
+                if next_page == 1 and isinstance(data.get("count"), int):
+                    total_pages = math.ceil(data["count"] / perpage)
+                    last_page = min(max_pages, total_pages)
+
+                page_items: List[RaindropItem] = []
+                for raw in raw_items:
+                    item = self._to_model(raw, collection_id)
+                    # 取得中に新規保存があるとページ境界がずれるため、id で重複を除く。
+                    if item.id in seen_ids:
+                        continue
+                    seen_ids.add(item.id)
+                    page_items.append(item)
+
+                done = len(raw_items) < perpage or _crosses_threshold(page_items, created_since)
+                while not done and next_page < last_page and len(pending) < window:
+                    pending.append(executor.submit(self._fetch_page, collection_id, next_page, perpage, search))
+                    next_page += 1
+                if page_items:
+                    yield page_items
+                if done:
+                    complete = True
+                    break
+            else:
+                # count どおりに最後のページまで読めたときだけ完了とみなす（max_pages で打ち切った場合は未完了）
+                complete = total_pages is not None and next_page >= total_pages
+            if not complete:
+                logger.warning("Listing of collection %s stopped before its end", collection_id)
+                with self._incomplete_lock:
+                    self._incomplete_collections.add(collection_id)
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _fetch_page(self, collection_id: int, page: int, perpage: int, search: str | None = None) -> Optional[dict]:
+        params: dict[str, str | int] = {"page": page, "perpage": perpage, "sort": "-created"}
+        if search:
+            params["search"] = search
+        response = self._request_with_retry(
+            "GET",
+            f"/rest/v1/raindrops/{collection_id}",
+            params=params,
+        )
         if response is None:
-            raise RaindropApiError("Raindrop update failed after retries (502/503/504).")
+            logger.warning("Skipping fetch page %s of collection %s due to transient errors.", page, collection_id)
+            return None
+        data = response.json()
+        logger.info("Fetched %s items from page %s of collection %s", len(data.get("items", [])), page, collection_id)
+        return data
 
-    def delete_item(self, item_id: int) -> None:
-        logger.info("Deleting duplicate Raindrop item %s", item_id)
-        response = self._request_with_retry("DELETE", f"/rest/v1/raindrop/{item_id}")
+    def update_note(self, item: RaindropItem, note: str) -> None:
+        logger.info("Updating note of Raindrop item %s", item.id)
+        response = self._request_with_retry("PUT", f"/rest/v1/raindrop/{item.id}", json={"note": note})
         if response is None:
-            raise RaindropApiError("Raindrop delete failed after retries (502/503/504).")
+            raise RaindropApiError("Raindrop update failed after retries (502/503/504).")
+
+    def bulk_add_tags(
+        self,
+        item_ids: Sequence[int],
+        tags: List[str],
+        collection_id: int = UNSORTED_COLLECTION_ID,
+    ) -> None:
+        """Append `tags` to many items at once (Raindrop appends, it does not replace)."""
+        if not tags:
+            # 空配列を送ると既存タグが全削除されるため、呼び出し側のミスでも送らない。
+            raise ValueError("tags must not be empty")
+        for chunk in _chunks(item_ids, BULK_CHUNK_SIZE):
+            logger.info("Bulk tagging %s Raindrop items with tags=%s", len(chunk), tags)
+            response = self._request_with_retry(
+                "PUT", f"/rest/v1/raindrops/{collection_id}", json={"ids": chunk, "tags": tags}
+            )
+            if response is None:
+                raise RaindropApiError("Raindrop bulk update failed after retries (502/503/504).")
+
+    def delete_items(self, item_ids: Sequence[int], collection_id: int = UNSORTED_COLLECTION_ID) -> None:
+        for chunk in _chunks(item_ids, BULK_CHUNK_SIZE):
+            logger.info("Bulk deleting %s duplicate Raindrop items", len(chunk))
+            response = self._request_with_retry(
+                "DELETE", f"/rest/v1/raindrops/{collection_id}", json={"ids": chunk}
+            )
+            if response is None:
+                raise RaindropApiError("Raindrop bulk delete failed after retries (502/503/504).")
 
     def _request_with_retry(self, method: str, path: str, **kwargs) -> httpx.Response | None:
-        for attempt in range(2):
+        attempt = 0
+        rate_limited = 0
+        while attempt < 2:
+            self._scheduler.acquire()
             try:
                 response = self._client.request(method, path, **kwargs)
+                self._scheduler.observe(response)
+                if response.status_code == 429 and rate_limited < MAX_RATE_LIMIT_RETRIES:
+                    rate_limited += 1
+                    wait = self._scheduler.defer(response)
+                    logger.warning("Raindrop rate limited for %s %s; waiting %.1fs before retry", method, path, wait)
+                    continue
                 response.raise_for_status()
                 return response
             except httpx.RequestError as exc:
                 logger.warning("Raindrop request error %s %s: %s", method, path, exc)
                 if attempt == 0:
+                    attempt += 1
                     continue
                 raise RaindropConnectionError(f"Raindrop request failed: {exc}") from exc
             except httpx.HTTPStatusError as exc:
                 status = exc.response.status_code
                 if status in {502, 503, 504} and attempt == 0:
                     logger.warning("Raindrop transient status %s for %s %s; retrying once", status, method, path)
+                    attempt += 1
                     continue
                 if status in {502, 503, 504}:
                     logger.warning("Raindrop transient status %s for %s %s; giving up", status, method, path)
@@ -97,15 +450,58 @@ class RaindropClient:
         return None
 
     @staticmethod
-    def _to_model(raw: dict) -> RaindropItem:
+    def _to_model(raw: dict, collection_id: int = UNSORTED_COLLECTION_ID) -> RaindropItem:
+        collection = raw.get("collection")
+        # 「すべて」(0) で一覧した場合も、書き戻し先は各アイテムの実際のコレクション。
+        if isinstance(collection, dict) and isinstance(collection.get("$id"), int):
+            collection_id = collection["$id"]
         return RaindropItem(
             id=raw["_id"] if "_id" in raw else raw["id"],
             link=raw["link"],
             title=raw.get("title") or raw.get("domain") or raw["link"],
-            created=parse_raindrop_datetime(raw["created"]),
+            created=raw["created"],
             tags=raw.get("tags", []),
             note=raw.get("note") or None,
+            collection_id=collection_id,
         )
 
 
 EXCLUDED_TAGS = {TAG_CONFIRMED, TAG_DELIVERED, TAG_FAILED}
+
+
+def build_search_query(created_since: datetime | None, exclude_tags: Iterable[str] = ()) -> str | None:
+    """
+    Build a Raindrop `search` query that narrows listing to new, untagged items.
+
+    Raindrop's `created:` operator only compares dates, so the bound is widened by one day
+    to never drop items near the threshold.
+    """
+    terms: List[str] = []
+    if created_since is not None:
+        since_date = (created_since.astimezone(timezone.utc) - timedelta(days=1)).date()
+        terms.append(f"created:>{since_date.isoformat()}")
+    for tag in sorted(set(exclude_tags)):
+        terms.append(f'-#"{tag}"' if " " in tag else f"-#{tag}")
+    return " ".join(terms) or None
+
+
+def _header_int(response: httpx.Response, name: str) -> int | None:
+    raw = response.headers.get(name)
+    if raw is None:
+        return None
+    try:
+        return int(float(raw.strip()))
+    except ValueError:
+        return None
+
+
+def _chunks(values: Sequence[int], size: int) -> Iterable[List[int]]:
+    for start in range(0, len(values), size):
+        yield list(values[start : start + size])
+
+
+def _crosses_threshold(page_items: List[RaindropItem], created_since: datetime | None) -> bool:
+    # 結果は -created 順なので、ページ末尾が閾値より古ければ以降のページは不要。
+    if created_since is None or not page_items:
+        return False
+    return page_items[-1].created < created_since
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Iterable, Optional, Set
+
+from .models import RaindropItem
+from .storage import connect_sqlite
+
+logger = logging.getLogger(__name__)
+
+_CURSOR_KEY = "created_cursor"
+
+
+class SyncStateStore:
+    """
+    Persisted incremental-sync state between batch runs.
+
+    Keeps the `created` cursor (items older than it were all written back) and the ids already
+    processed at or after the cursor, so the next run only lists and processes the delta.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]):
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS processed_items (
+                id INTEGER PRIMARY KEY,
+                created TEXT NOT NULL,
+                processed_at TEXT NOT NULL
+            );
+            """
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def created_cursor(self) -> Optional[datetime]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (_CURSOR_KEY,)).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def processed_ids(self) -> Set[int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id FROM processed_items").fetchall()
+        return {row[0] for row in rows}
+
+    def record_run(
+        self,
+        processed: Iterable[RaindropItem],
+        unprocessed: Iterable[RaindropItem],
+        processed_at: datetime,
+    ) -> Optional[datetime]:
+        """
+        Record written-back items and advance the cursor.
+
+        The cursor never moves past an item that still has to be retried, so a failed writeback
+        is listed again next time. Returns the effective cursor (None when nothing was processed).
+        """
+        processed = list(processed)
+        if not processed:
+            return None
+        cursor = max(item.created for item in processed)
+        retry_created = [item.created for item in unprocessed]
+        if retry_created:
+            cursor = min(cursor, min(retry_created))
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO processed_items (id, created, processed_at) VALUES (?, ?, ?)",
+                    [(item.id, item.created.isoformat(), processed_at.isoformat()) for item in processed],
+                )
+                row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (_CURSOR_KEY,)).fetchone()
+                previous = datetime.fromisoformat(row[0]) if row else None
+                if previous is not None and previous >= cursor:
+                    cursor = previous
+                else:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+                        (_CURSOR_KEY, cursor.isoformat()),
+                    )
+                # カーソルより古いアイテムは一覧取得の対象外になるので、処理済み id も不要。
+                stale = [
+                    (item_id,)
+                    for item_id, created in self._conn.execute("SELECT id, created FROM processed_items")
+                    if datetime.fromisoformat(created) < cursor
+                ]
+                self._conn.executemany("DELETE FROM processed_items WHERE id = ?", stale)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        logger.info("Sync cursor at %s (pruned %s processed ids)", cursor.isoformat(), len(stale))
+        return cursor
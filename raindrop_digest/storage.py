@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+
+def connect_sqlite(path: str | os.PathLike[str]) -> sqlite3.Connection:
+    """
+    Open a SQLite file used for cross-run state, creating parent directories as needed.
+
+    Connections are shared between worker threads, so callers must serialize access
+    (each store guards its connection with a lock).
+    """
+    db_path = Path(path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
@@ -1,7 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from typing import Any, Optional, Tuple, Type, TYPE_CHECKING
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Type, TYPE_CHECKING
 
 try:
     from openai import APIConnectionError, APITimeoutError, OpenAI, RateLimitError
@@ -17,10 +26,40 @@ if TYPE_CHECKING:  # pragma: no cover - type checking only
 else:
     OpenAIType = Any
 
-from .config import DEFAULT_SYSTEM_PROMPT
+from .compaction import estimate_tokens
+from .config import DEFAULT_SYSTEM_PROMPT, SHORT_ARTICLE_CHAR_THRESHOLD, SUMMARY_CONCURRENCY
+from .summary_cache import SummaryCache, summary_key
 
 logger = logging.getLogger(__name__)
 
+# 429 を受けたときに同じ入力を再試行する回数（それでも駄目ならその項目だけ失敗にする）
+MAX_RATE_LIMIT_RETRIES = 5
+_DEFAULT_RATE_LIMIT_BACKOFF_SECONDS = 2.0
+_MAX_RATE_LIMIT_BACKOFF_SECONDS = 60.0
+
+# 残りトークンがこれを下回ったら同時実行数を 1 まで絞る（1 リクエストの入力上限の目安）
+_LOW_REMAINING_TOKENS = 20_000
+
+# Batch API のジョブ状態のうち、これ以上進まないもの
+_BATCH_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+_BATCH_ENDPOINT = "/v1/chat/completions"
+# キャンセル後に cancelled になるまで待つ上限（実 API では最大10分ほど cancelling が続く）
+_BATCH_CANCEL_GRACE_SECONDS = 600.0
+
+# まとめて要約するときに system prompt の後ろに付ける出力形式の指示
+_PACK_INSTRUCTIONS = """
+# Multiple articles
+The user message contains several articles, each starting with a line "### Article <id>".
+Summarize every article independently, following the rules and format above.
+Respond with a JSON object only: {"summaries": [{"id": <id>, "summary": "<summary text>"}]}
+with exactly one entry per article.
+""".strip()
+# 記事ごとの見出し行と JSON の枠にかかる分の概算
+_PACK_ARTICLE_OVERHEAD_TOKENS = 20
+
+_DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
 
 class SummaryError(Exception):
     """Raised when summarization fails."""
@@ -33,6 +72,155 @@ class SummaryConnectionError(SummaryError):
 class SummaryRateLimitError(SummaryError):
     """Raised when summarization fails due to rate limits."""
 
+    def __init__(self, message: str, *, retry_after: Optional[float] = None, retryable: bool = True):
+        super().__init__(message)
+        self.retry_after = retry_after
+        # insufficient_quota（課金上限）は待っても回復しないので再試行しない
+        self.retryable = retryable
+
+
+@dataclass
+class SummaryOutcome:
+    """Result of one input of `summarize_many`: either `summary` or `error` is set."""
+
+    summary: Optional[str] = None
+    error: Optional[SummaryError] = None
+
+    def is_success(self) -> bool:
+        return self.error is None and self.summary is not None
+
+
+class AdaptiveConcurrency:
+    """
+    Concurrency limit for OpenAI requests that follows the account's rate-limit headers.
+
+    The limit drops towards `x-ratelimit-remaining-requests` (and to 1 when the remaining
+    token budget gets low), grows back by one per healthy response, and is halved on a 429,
+    which also pauses new requests until the advertised reset.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.max_limit = max(1, max_limit)
+        self._limit = self.max_limit
+        self._active = 0
+        self._paused_until = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        with self._cond:
+            return self._limit
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        self._acquire()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def _acquire(self) -> None:
+        while True:
+            with self._cond:
+                wait = self._paused_until - self._clock()
+                if wait <= 0 and self._active < self._limit:
+                    self._active += 1
+                    return
+                if wait <= 0:
+                    self._cond.wait()
+                    continue
+            self._sleep(wait)
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        remaining_requests = _header_int(headers, "x-ratelimit-remaining-requests")
+        remaining_tokens = _header_int(headers, "x-ratelimit-remaining-tokens")
+        with self._cond:
+            limit = min(self.max_limit, self._limit + 1)
+            if remaining_requests is not None:
+                limit = min(limit, max(1, remaining_requests))
+            if remaining_tokens is not None and remaining_tokens < _LOW_REMAINING_TOKENS:
+                limit = 1
+            if remaining_requests == 0 or remaining_tokens == 0:
+                reset = max(
+                    _parse_duration(headers.get("x-ratelimit-reset-requests")) or 0.0,
+                    _parse_duration(headers.get("x-ratelimit-reset-tokens")) or 0.0,
+                )
+                self._paused_until = max(self._paused_until, self._clock() + reset)
+            if limit != self._limit:
+                logger.info("OpenAI concurrency %s -> %s", self._limit, limit)
+                self._limit = limit
+            self._cond.notify_all()
+
+    def on_rate_limited(self, retry_after: Optional[float], attempt: int) -> float:
+        """Halve the limit and pause new requests; returns the pause in seconds."""
+        wait = retry_after if retry_after is not None else _DEFAULT_RATE_LIMIT_BACKOFF_SECONDS * (2**attempt)
+        wait = min(wait, _MAX_RATE_LIMIT_BACKOFF_SECONDS)
+        with self._cond:
+            self._limit = max(1, self._limit // 2)
+            self._paused_until = max(self._paused_until, self._clock() + wait)
+        return wait
+
+
+class SummarySession:
+    """
+    Streaming front end of `Summarizer.summarize_many`.
+
+    Each `submit` returns a future for one text, so callers can start summarizing items as
+    they become ready. All requests share one `AdaptiveConcurrency`; the text is only
+    referenced by its task and is dropped as soon as that request finishes.
+    """
+
+    def __init__(self, summarizer: "Summarizer", limiter: AdaptiveConcurrency, *, max_workers: Optional[int] = None):
+        self._summarizer = summarizer
+        self._limiter = limiter
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or limiter.max_limit, thread_name_prefix="summarize")
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._succeeded = 0
+
+    def submit(self, text: str, *, use_cache: bool = True) -> "Future[SummaryOutcome]":
+        with self._lock:
+            self._submitted += 1
+        return self._pool.submit(self._run, text, use_cache)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+        if self._submitted:
+            logger.info(
+                "Summarized %s/%s texts (final concurrency=%s)",
+                self._succeeded,
+                self._submitted,
+                self._limiter.limit,
+            )
+
+    def __enter__(self) -> "SummarySession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _run(self, text: str, use_cache: bool) -> SummaryOutcome:
+        cached = self._summarizer._cached_summary(text) if use_cache else None
+        outcome = (
+            SummaryOutcome(summary=cached)
+            if cached is not None
+            else self._summarizer._summarize_with_retries(text, self._limiter)
+        )
+        if outcome.is_success():
+            with self._lock:
+                self._succeeded += 1
+        return outcome
+
 
 class Summarizer:
     def __init__(
@@ -41,6 +229,8 @@ class Summarizer:
         model: str = "gpt-4.1-mini",
         client: Optional[OpenAIType] = None,
         system_prompt: Optional[str] = None,
+        max_concurrency: int = SUMMARY_CONCURRENCY,
+        cache: Optional[SummaryCache] = None,
     ):
         if not model or not model.strip():
             raise ValueError("OpenAI model must be provided.")
@@ -48,6 +238,8 @@ class Summarizer:
         self._model = model.strip()
         self._rate_limit_error, self._connection_errors = self._load_error_classes(client is None)
         self._system_prompt = (system_prompt or DEFAULT_SYSTEM_PROMPT).strip()
+        self._max_concurrency = max(1, max_concurrency)
+        self._cache = cache
 
     @staticmethod
     def _build_client(api_key: str) -> OpenAIType:
@@ -64,20 +256,96 @@ class Summarizer:
         return RateLimitError, (APIConnectionError, APITimeoutError)
 
     def summarize(self, text: str) -> str:
+        cached = self._cached_summary(text)
+        if cached is not None:
+            return cached
+        summary = self._summarize(text)
+        self._remember(text, summary)
+        return summary
+
+    def summarize_many(
+        self,
+        texts: Sequence[str],
+        *,
+        max_concurrency: Optional[int] = None,
+        limiter: Optional[AdaptiveConcurrency] = None,
+    ) -> List[SummaryOutcome]:
+        """
+        Summarize several texts concurrently; outcomes are returned in input order.
+
+        Concurrency adapts to the rate-limit headers of each response. A 429 pauses new
+        requests and the input is retried (up to `MAX_RATE_LIMIT_RETRIES`) instead of failing;
+        other errors fail only their own input.
+        """
+        outcomes, pending = self._lookup_cached(texts)
+        fresh = self._summarize_concurrently([texts[idx] for idx in pending], max_concurrency, limiter)
+        for idx, outcome in zip(pending, fresh):
+            outcomes[idx] = outcome
+        return [outcome for outcome in outcomes if outcome is not None]
+
+    def session(self, *, max_concurrency: Optional[int] = None) -> "SummarySession":
+        """Open a streaming session: texts can be submitted while earlier ones are in flight."""
+        return SummarySession(self, AdaptiveConcurrency(max_concurrency or self._max_concurrency))
+
+    def _summarize_concurrently(
+        self,
+        texts: Sequence[str],
+        max_concurrency: Optional[int] = None,
+        limiter: Optional[AdaptiveConcurrency] = None,
+    ) -> List[SummaryOutcome]:
+        if not texts:
+            return []
+        limiter = limiter or AdaptiveConcurrency(max_concurrency or self._max_concurrency)
+        with SummarySession(self, limiter, max_workers=min(limiter.max_limit, len(texts))) as session:
+            futures = [session.submit(text, use_cache=False) for text in texts]
+            return [future.result() for future in futures]
+
+    def _summarize_with_retries(self, text: str, limiter: AdaptiveConcurrency) -> SummaryOutcome:
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            try:
+                with limiter.slot():
+                    summary = self._summarize(text, limiter.observe_headers)
+                self._remember(text, summary)
+                return SummaryOutcome(summary=summary)
+            except SummaryRateLimitError as exc:
+                if not exc.retryable or attempt == MAX_RATE_LIMIT_RETRIES:
+                    return SummaryOutcome(error=exc)
+                wait = limiter.on_rate_limited(exc.retry_after, attempt)
+                logger.warning(
+                    "OpenAI rate limited; backing off %.1fs (retry %s/%s, concurrency=%s)",
+                    wait,
+                    attempt + 1,
+                    MAX_RATE_LIMIT_RETRIES,
+                    limiter.limit,
+                )
+            except SummaryError as exc:
+                return SummaryOutcome(error=exc)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def asummarize_many(
+        self,
+        texts: Sequence[str],
+        *,
+        max_concurrency: Optional[int] = None,
+    ) -> List[SummaryOutcome]:
+        """Awaitable `summarize_many`; the requests run on a worker thread pool."""
+        return await asyncio.to_thread(self.summarize_many, texts, max_concurrency=max_concurrency)
+
+    def _summarize(self, text: str, on_headers: Optional[Callable[[Mapping[str, str]], None]] = None) -> str:
         logger.info("Summarization request: chars=%s", len(text))
+        content = self._complete(self._messages(text), on_headers)
+        logger.info("Summary generated (%s chars)", len(content))
+        return content
+
+    def _complete(
+        self,
+        messages: List[dict],
+        on_headers: Optional[Callable[[Mapping[str, str]], None]] = None,
+        **options: Any,
+    ) -> str:
         for attempt in range(2):
             try:
-                response = self._client.chat.completions.create(
-                    model=self._model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": self._system_prompt,
-                        },
-                        {"role": "user", "content": text},
-                    ],
-                    temperature=0.3,
-                )
+                response = self._create(messages, on_headers, **options)
                 break
             except Exception as exc:  # noqa: BLE001
                 status_code = _extract_status_code(exc)
@@ -85,7 +353,11 @@ class Summarizer:
                     logger.warning("OpenAI transient error (status=%s); retrying once", status_code)
                     continue
                 if isinstance(exc, self._rate_limit_error):  # type: ignore[arg-type]
-                    raise SummaryRateLimitError(f"OpenAI rate limit: {exc}") from exc
+                    raise SummaryRateLimitError(
+                        f"OpenAI rate limit: {exc}",
+                        retry_after=_retry_after(exc),
+                        retryable=getattr(exc, "code", None) != "insufficient_quota",
+                    ) from exc
                 if isinstance(exc, self._connection_errors):  # type: ignore[arg-type]
                     raise SummaryConnectionError(f"OpenAI connection failed: {exc}") from exc
                 raise SummaryError(f"OpenAI API call failed: {exc}") from exc
@@ -95,9 +367,328 @@ class Summarizer:
         content: Optional[str] = response.choices[0].message.content
         if not content:
             raise SummaryError("OpenAI returned empty content.")
-        logger.info("Summary generated (%s chars)", len(content))
         return content.strip()
 
+    def summarize_packed(
+        self,
+        texts: Sequence[str],
+        *,
+        max_tokens: int,
+        short_chars: int = SHORT_ARTICLE_CHAR_THRESHOLD,
+    ) -> List[SummaryOutcome]:
+        """
+        Summarize texts, packing short ones into shared JSON-mode requests; input order is kept.
+
+        Texts under `short_chars` are grouped (in order) into requests of at most `max_tokens`
+        estimated input tokens, so the system prompt is sent once per group. Longer texts, and
+        every text of a group whose response fails or cannot be split back per article, are
+        summarized with single requests.
+        """
+        packed_prompt = self._packed_system_prompt()
+        # 短い記事もグループが 1 件だけになったりまとめた要約が失敗したりすると単独で要約されるので、
+        # まとめた要約の鍵に加えて単独要約の鍵も引く
+        outcomes, pending = self._lookup_cached(
+            texts,
+            lambda text: (packed_prompt, self._system_prompt) if len(text) < short_chars else (self._system_prompt,),
+        )
+        packs: List[List[int]] = []
+        singles: List[int] = []
+        budget = 0
+        for idx in pending:
+            cost = estimate_tokens(texts[idx]) + _PACK_ARTICLE_OVERHEAD_TOKENS
+            if len(texts[idx]) >= short_chars or cost > max_tokens:
+                singles.append(idx)
+                continue
+            if not packs or cost > budget:
+                packs.append([])
+                budget = max_tokens
+            packs[-1].append(idx)
+            budget -= cost
+        # 1件だけのグループはまとめる意味がないので通常の要約に回す
+        singles.extend(idx for pack in packs if len(pack) == 1 for idx in pack)
+        packs = [pack for pack in packs if len(pack) > 1]
+
+        limiter = AdaptiveConcurrency(self._max_concurrency)
+
+        def run(pack: List[int]) -> Optional[List[str]]:
+            try:
+                with limiter.slot():
+                    return self._summarize_pack([texts[idx] for idx in pack], limiter.observe_headers)
+            except SummaryError as exc:
+                logger.warning("Packed summarization of %s texts failed; summarizing them one by one: %s", len(pack), exc)
+                return None
+
+        if packs:
+            with ThreadPoolExecutor(max_workers=min(limiter.max_limit, len(packs)), thread_name_prefix="summarize") as pool:
+                packed = list(pool.map(run, packs))
+            for pack, summaries in zip(packs, packed):
+                if summaries is None:
+                    singles.extend(pack)
+                    continue
+                for idx, summary in zip(pack, summaries):
+                    self._remember(texts[idx], summary, packed_prompt)
+                    outcomes[idx] = SummaryOutcome(summary=summary)
+            logger.info(
+                "Packed %s short texts into %s requests (%s fell back to single requests)",
+                sum(len(pack) for pack in packs),
+                len(packs),
+                sum(len(pack) for pack, summaries in zip(packs, packed) if summaries is None),
+            )
+
+        singles.sort()
+        for idx, outcome in zip(singles, self._summarize_concurrently([texts[idx] for idx in singles], limiter=limiter)):
+            outcomes[idx] = outcome
+        return [outcome for outcome in outcomes if outcome is not None]
+
+    def _summarize_pack(
+        self, texts: Sequence[str], on_headers: Optional[Callable[[Mapping[str, str]], None]] = None
+    ) -> List[str]:
+        logger.info("Packed summarization request: texts=%s chars=%s", len(texts), sum(len(text) for text in texts))
+        articles = "\n\n".join(f"### Article {idx}\n{text}" for idx, text in enumerate(texts))
+        content = self._complete(
+            [
+                {
+                    "role": "system",
+                    "content": self._packed_system_prompt(),
+                },
+                {"role": "user", "content": articles},
+            ],
+            on_headers,
+            response_format={"type": "json_object"},
+        )
+        return _parse_packed_summaries(content, len(texts))
+
+    def summarize_batch(
+        self,
+        texts: Sequence[str],
+        *,
+        deadline_seconds: float,
+        poll_interval_seconds: float = 30.0,
+        cancel_grace_seconds: float = _BATCH_CANCEL_GRACE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> List[SummaryOutcome]:
+        """
+        Summarize texts through the OpenAI Batch API; outcomes are returned in input order.
+
+        All requests are uploaded as one JSONL file and the batch is polled until it finishes
+        or `deadline_seconds` pass. It is then cancelled and polled for up to
+        `cancel_grace_seconds` more, since the partial output only appears once the batch
+        reaches `cancelled`. Inputs without a usable result (unfinished, errored, or the whole
+        batch failing to submit) fall back to `summarize_many`.
+        """
+        outcomes, pending = self._lookup_cached(texts)
+        if not pending:
+            return [outcome for outcome in outcomes if outcome is not None]
+        batch_texts = [texts[idx] for idx in pending]
+        summaries: Dict[int, str] = {}
+        try:
+            summaries = self._run_batch(
+                batch_texts, deadline_seconds, poll_interval_seconds, cancel_grace_seconds, clock, sleep
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("OpenAI batch failed; falling back to synchronous requests: %s", exc)
+        logger.info("OpenAI batch returned %s/%s summaries", len(summaries), len(batch_texts))
+
+        remaining: List[int] = []
+        for batch_idx, idx in enumerate(pending):
+            if batch_idx in summaries:
+                self._remember(texts[idx], summaries[batch_idx])
+                outcomes[idx] = SummaryOutcome(summary=summaries[batch_idx])
+            else:
+                remaining.append(idx)
+        if remaining:
+            logger.info("Summarizing %s remaining texts synchronously", len(remaining))
+            for idx, outcome in zip(remaining, self._summarize_concurrently([texts[idx] for idx in remaining])):
+                outcomes[idx] = outcome
+        return [outcome for outcome in outcomes if outcome is not None]
+
+    def _packed_system_prompt(self) -> str:
+        return f"{self._system_prompt}\n\n{_PACK_INSTRUCTIONS}"
+
+    def _lookup_cached(
+        self, texts: Sequence[str], prompts_for: Optional[Callable[[str], Sequence[str]]] = None
+    ) -> Tuple[List[Optional[SummaryOutcome]], List[int]]:
+        """Cached outcomes in input order (None where missing) and the indices still to summarize."""
+        outcomes: List[Optional[SummaryOutcome]] = []
+        pending: List[int] = []
+        for idx, text in enumerate(texts):
+            cached = self._cached_summary(text, prompts_for(text) if prompts_for is not None else ())
+            outcomes.append(SummaryOutcome(summary=cached) if cached is not None else None)
+            if cached is None:
+                pending.append(idx)
+        if self._cache is not None and texts:
+            logger.info("Summary cache: %s/%s texts already summarized", len(texts) - len(pending), len(texts))
+        return outcomes, pending
+
+    def _cached_summary(self, text: str, prompts: Sequence[str] = ()) -> Optional[str]:
+        # prompts は要約を作りうるシステムプロンプトを優先順に並べたもの
+        # （まとめて要約した結果は別の鍵で持つ）
+        if self._cache is None:
+            return None
+        keys = [summary_key(self._model, prompt, text) for prompt in prompts or (self._system_prompt,)]
+        try:
+            return self._cache.get(*keys)
+        except sqlite3.Error as exc:
+            logger.warning("Summary cache unavailable: %s", exc)
+            return None
+
+    def _remember(self, text: str, summary: str, prompt: Optional[str] = None) -> None:
+        if self._cache is None:
+            return
+        prompt = prompt or self._system_prompt
+        tokens = estimate_tokens(prompt) + estimate_tokens(text) + estimate_tokens(summary)
+        try:
+            self._cache.put(summary_key(self._model, prompt, text), summary, tokens=tokens)
+        except sqlite3.Error as exc:
+            logger.warning("Failed to persist summary: %s", exc)
+
+    def _run_batch(
+        self,
+        texts: Sequence[str],
+        deadline_seconds: float,
+        poll_interval_seconds: float,
+        cancel_grace_seconds: float,
+        clock: Callable[[], float],
+        sleep: Callable[[float], None],
+    ) -> Dict[int, str]:
+        deadline = clock() + deadline_seconds
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": str(idx),
+                    "method": "POST",
+                    "url": _BATCH_ENDPOINT,
+                    "body": {"model": self._model, "messages": self._messages(text), "temperature": 0.3},
+                },
+                ensure_ascii=False,
+            )
+            for idx, text in enumerate(texts)
+        ]
+        upload = self._client.files.create(
+            file=("summaries.jsonl", ("\n".join(lines) + "\n").encode("utf-8")), purpose="batch"
+        )
+        batch = self._client.batches.create(
+            input_file_id=upload.id, endpoint=_BATCH_ENDPOINT, completion_window="24h"
+        )
+        logger.info("Submitted OpenAI batch id=%s requests=%s", batch.id, len(lines))
+        cancelled = False
+        while batch.status not in _BATCH_TERMINAL_STATUSES:
+            remaining = deadline - clock()
+            if remaining <= 0:
+                if cancelled:
+                    break
+                logger.warning("OpenAI batch %s not finished by the deadline (status=%s); cancelling", batch.id, batch.status)
+                try:
+                    batch = self._client.batches.cancel(batch.id)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Failed to cancel OpenAI batch %s: %s", batch.id, exc)
+                    break
+                # cancelling の間は出力ファイルがまだないので、cancelled になるまで少し待つ
+                cancelled = True
+                deadline = clock() + cancel_grace_seconds
+                continue
+            sleep(min(poll_interval_seconds, remaining))
+            batch = self._client.batches.retrieve(batch.id)
+        logger.info("OpenAI batch %s status=%s", batch.id, batch.status)
+
+        # 期限切れ・キャンセル済みでも、完了していた分は output_file に入っている
+        if not batch.output_file_id:
+            if batch.status not in _BATCH_TERMINAL_STATUSES:
+                logger.warning("OpenAI batch %s still %s; its finished requests are lost", batch.id, batch.status)
+            return {}
+        output = self._client.files.content(batch.output_file_id).text
+        return _parse_batch_output(output, len(texts))
+
+    def _messages(self, text: str) -> List[dict]:
+        return [
+            {
+                "role": "system",
+                "content": self._system_prompt,
+            },
+            {"role": "user", "content": text},
+        ]
+
+    def _create(
+        self, messages: List[dict], on_headers: Optional[Callable[[Mapping[str, str]], None]], **options: Any
+    ) -> Any:
+        completions = self._client.chat.completions
+        raw_api = getattr(completions, "with_raw_response", None) if on_headers is not None else None
+        if raw_api is None:
+            return completions.create(model=self._model, messages=messages, temperature=0.3, **options)
+        # レスポンスヘッダ（x-ratelimit-*）を見るために raw response 経由で呼ぶ。
+        raw = raw_api.create(model=self._model, messages=messages, temperature=0.3, **options)
+        on_headers(raw.headers)
+        return raw.parse()
+
+
+def _parse_packed_summaries(content: str, count: int) -> List[str]:
+    """Split a packed JSON response into one summary per article, in article order."""
+    try:
+        entries = json.loads(content)["summaries"]
+        summaries = {int(entry["id"]): str(entry["summary"]).strip() for entry in entries}
+    except (ValueError, KeyError, TypeError) as exc:
+        raise SummaryError(f"Packed summary response could not be parsed: {exc}") from exc
+    if sorted(summaries) != list(range(count)) or not all(summaries.values()):
+        raise SummaryError(f"Packed summary response covers articles {sorted(summaries)}, expected {count}.")
+    return [summaries[idx] for idx in range(count)]
+
+
+def _parse_batch_output(output: str, count: int) -> Dict[int, str]:
+    """Map input index -> summary for the successful lines of a batch output file."""
+    summaries: Dict[int, str] = {}
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            idx = int(record["custom_id"])
+            response = record.get("response") or {}
+            if response.get("status_code") != 200 or not 0 <= idx < count:
+                continue
+            content = response["body"]["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError) as exc:
+            logger.warning("Skipping malformed batch output line: %s", exc)
+            continue
+        if content and content.strip():
+            summaries[idx] = content.strip()
+    return summaries
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    try:
+        value = headers.get(name)
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse OpenAI reset durations such as "1s", "6m0s" or "20ms"."""
+    if not value:
+        return None
+    parts = _DURATION_PART_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        try:
+            if value is not None:
+                return float(value) * scale
+        except ValueError:
+            continue
+    return _parse_duration(headers.get("x-ratelimit-reset-requests")) or _parse_duration(
+        headers.get("x-ratelimit-reset-tokens")
+    )
+
 
 def _extract_status_code(exc: Exception) -> Optional[int]:
     status_code = getattr(exc, "status_code", None)
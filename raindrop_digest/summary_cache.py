@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .storage import connect_sqlite
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SummaryCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evicted: int = 0
+    tokens_saved: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def summary_key(model: str, system_prompt: str, text: str) -> str:
+    # モデルやプロンプトが変われば鍵も変わるので、古い要約は明示的に消さなくても使われない
+    digest = hashlib.sha256()
+    for part in (model, system_prompt, text):
+        digest.update(part.encode("utf-8", "replace"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """
+    Persisted summaries keyed by a hash of (model, system prompt, input text).
+
+    Entries expire after `ttl_seconds`, and at most `max_entries` are kept, evicting the least
+    recently used. `tokens` records the estimated prompt + completion tokens of the original
+    request, so hits can be reported as tokens saved.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        ttl_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._stats = SummaryCacheStats()
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS summary_cache (
+                key TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                tokens INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS summary_cache_accessed ON summary_cache (accessed_at);
+            """
+        )
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM summary_cache WHERE stored_at < ?", (self._clock() - self._ttl_seconds,)
+            )
+            if cursor.rowcount:
+                logger.info("Summary cache: expired %s entries", cursor.rowcount)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> SummaryCacheStats:
+        with self._lock:
+            return SummaryCacheStats(**vars(self._stats))
+
+    def get(self, key: str, *fallback_keys: str) -> Optional[str]:
+        """Summary stored under the first live key; one lookup counts as one hit or one miss."""
+        now = self._clock()
+        with self._lock:
+            for candidate in (key, *fallback_keys):
+                row = self._conn.execute(
+                    "SELECT summary, tokens FROM summary_cache WHERE key = ? AND stored_at >= ?",
+                    (candidate, now - self._ttl_seconds),
+                ).fetchone()
+                if row is not None:
+                    break
+            else:
+                self._stats.misses += 1
+                return None
+            self._stats.hits += 1
+            self._stats.tokens_saved += row[1]
+            self._conn.execute("UPDATE summary_cache SET accessed_at = ? WHERE key = ?", (now, candidate))
+        return row[0]
+
+    def put(self, key: str, summary: str, *, tokens: int) -> None:
+        now = self._clock()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO summary_cache (key, summary, tokens, stored_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, summary, tokens, now, now),
+                )
+                cursor = self._conn.execute(
+                    "DELETE FROM summary_cache WHERE rowid IN ("
+                    "SELECT rowid FROM summary_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self._max_entries,),
+                )
+                self._stats.evicted += max(cursor.rowcount, 0)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
@@ -1,14 +1,42 @@
 from __future__ import annotations
 
+import codecs
+import functools
+import importlib.util
+import json
 import logging
+import multiprocessing
 import os
-from typing import Tuple, List
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple, List
 from urllib.parse import urljoin, urlparse
 
 import httpx
-from lxml import html
+from lxml import etree, html
 from readability import Document
-from .config import MAX_EXTRACT_CHARS
+from .config import (
+    CACHE_DIR,
+    EXTRACTION_CACHE_MAX_ENTRIES,
+    EXTRACT_PROCESS_WORKERS,
+    FETCH_DEADLINE_SECONDS,
+    FETCH_HEDGE_DELAY_MS,
+    HOST_NEGATIVE_CACHE_MINUTES,
+    HTTP_CACHE_MAX_BYTES,
+    HTTP_CACHE_TTL_HOURS,
+    MAX_EXTRACT_CHARS,
+    MAX_FETCH_BYTES,
+)
+from .concurrency import host_of
+from .extraction_cache import ExtractionCache, content_hash
+from .host_memory import HostMemory
+from .http_cache import CachedResponse, HttpCache
 from .models import ExtractedContent
 from .utils import trim_text
 
@@ -26,10 +54,163 @@ DEFAULT_SECONDARY_USER_AGENT = (
 )
 
 
+_UTF8_PARSER = html.HTMLParser(encoding="utf-8")
+
+# 本文にも見出し画像にも寄与しない要素。パース直後に落としておくと後段の走査が軽くなる。
+_PRECLEAN_TAGS = ("script", "style", "noscript", "template", "nav")
+
+# JSON-LD は script 要素なので、事前クリーニングの前に取り出しておく。
+_JSONLD_XPATH = etree.XPath("//script[@type='application/ld+json']/text()")
+
+# 本文以外の定型部分（記事要素の内側にあっても本文に数えない）
+_FAST_PATH_TEXT_XPATH = etree.XPath(
+    ".//text()[not(ancestor::aside or ancestor::footer or ancestor::header or ancestor::form "
+    "or ancestor::button or ancestor::figcaption)]"
+)
+_FAST_PATH_LINK_TEXT_XPATH = etree.XPath(
+    ".//a//text()[not(ancestor::aside or ancestor::footer or ancestor::header or ancestor::form "
+    "or ancestor::button or ancestor::figcaption)]"
+)
+
+# 高速経路の採用条件。短すぎる・リンクだらけの候補は見送り、次の段（最後は readability）に回す。
+_FAST_PATH_MIN_CHARS = 500
+_FAST_PATH_MAX_LINK_DENSITY = 0.3
+
+# 優先順に並べた見出し画像の候補（og:image → Twitter card → image_src）
+_HERO_IMAGE_XPATHS = tuple(
+    etree.XPath(expr)
+    for expr in (
+        "//meta[@property='og:image']/@content",
+        "//meta[@property='og:image:url']/@content",
+        "//meta[@property='og:image:secure_url']/@content",
+        "//meta[@name='twitter:image']/@content",
+        "//meta[@name='twitter:image:src']/@content",
+        "//link[@rel='image_src']/@href",
+    )
+)
+
+# HTML として扱う Content-Type。Content-Type が無い・汎用バイナリの場合は先頭バイトで判定する。
+_HTML_CONTENT_TYPES = frozenset(
+    {"text/html", "application/xhtml+xml", "text/xml", "application/xml", "text/plain"}
+)
+_UNLABELED_CONTENT_TYPES = frozenset({"", "application/octet-stream", "binary/octet-stream"})
+
+# 代表的なバイナリ形式のマジックバイト（Content-Type を偽っている配信元対策）
+_BINARY_SIGNATURES = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF8", "image/gif"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"RIFF", "audio/video (RIFF)"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\x1f\x8b", "application/gzip"),
+    (b"ID3", "audio/mpeg"),
+    (b"OggS", "audio/ogg"),
+    (b"\x1a\x45\xdf\xa3", "video/webm"),
+)
+
+_SNIFF_BYTES = 512
+
+# 1リクエストあたりのタイムアウト（記事全体の締め切り FETCH_DEADLINE_SECONDS の残り時間で更に絞る）
+_REQUEST_TIMEOUT_SECONDS = 20.0
+
+# <meta charset> / http-equiv の charset を探す範囲（HTML 仕様の事前スキャンと同じ 1024 バイトより少し広め）
+_CHARSET_SNIFF_BYTES = 4096
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+?charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+
+# ブラウザ（WHATWG Encoding）と同じく、ラベルを実際に使われている上位互換の符号化に寄せる。
+# 例: Shift_JIS と宣言されたページの多くは機種依存文字（①など）を含む CP932。
+_PYTHON_LABEL_ALIASES = {"x-sjis": "cp932", "windows-31j": "cp932", "x-euc-jp": "euc_jp"}
+_SUPERSET_ENCODINGS = {
+    "shift_jis": "cp932",
+    "ascii": "cp1252",
+    "latin_1": "cp1252",
+    "iso8859-1": "cp1252",
+    "gb2312": "gb18030",
+    "gbk": "gb18030",
+    "euc_kr": "cp949",
+}
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_shared_client: httpx.Client | None = None
+_shared_client_lock = threading.Lock()
+_shared_cache: HttpCache | None = None
+_shared_extraction_cache: ExtractionCache | None = None
+_shared_host_memory: HostMemory | None = None
+_shared_process_pool: ProcessPoolExecutor | None = None
+# 開けなかったキャッシュ（壊れたファイル・ロック中など）。その実行中は開き直さずに使わない。
+_unavailable_stores: set[str] = set()
+
+# 抽出ロジックを変えたら上げる（古いキャッシュ結果を使わないため）
+_EXTRACTOR_VERSION = 2
+
+
 class ExtractionError(Exception):
     """Raised when content extraction fails."""
 
 
+class _HostError(ExtractionError):
+    """A failure attributable to the host rather than the page (blocked, unreachable, too slow)."""
+
+
+class _Blocked(Exception):
+    """An attempt got 403/406; another User-Agent may still succeed."""
+
+    def __init__(self, status: int):
+        super().__init__(status)
+        self.status = status
+
+
+@dataclass
+class FetchedPage:
+    """Raw page bytes with the sniffed encoding; parsing works on the bytes directly."""
+
+    url: str
+    content: bytes
+    encoding: str
+    user_agent: str | None = None
+
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+
+@dataclass
+class TierStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class ExtractionMetrics:
+    """
+    Which extraction tier produced each page, with the CPU time spent in the tier chain.
+
+    Comparing the average time of the fast tiers with that of readability shows how much
+    readability time the fast paths saved in a run.
+    """
+
+    tiers: Dict[str, TierStats] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, tier: str, seconds: float) -> None:
+        with self._lock:
+            stats = self.tiers.setdefault(tier, TierStats())
+            stats.count += 1
+            stats.seconds += seconds
+
+    def snapshot(self) -> Dict[str, TierStats]:
+        with self._lock:
+            return {tier: TierStats(stats.count, stats.seconds) for tier, stats in self.tiers.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.tiers.clear()
+
+
+EXTRACTION_METRICS = ExtractionMetrics()
+
+
 def detect_source(url: str) -> str:
     parsed = urlparse(url)
     host = parsed.hostname or ""
@@ -70,43 +251,502 @@ def _user_agent_candidates() -> list[str]:
     return unique
 
 
-def fetch_html(url: str, *, transport: httpx.BaseTransport | None = None) -> str:
+def build_http_client(*, transport: httpx.BaseTransport | None = None) -> httpx.Client:
+    """
+    Build a keep-alive client for article fetches.
+
+    User-Agent and the other browser-like headers are set per request, so one client (and its
+    connection pool) serves every item and every User-Agent attempt. HTTP/2 is enabled when the
+    optional `h2` package is installed; httpx advertises gzip/deflate (and br when `brotli` is
+    installed) and decodes the body transparently.
+    """
+    return httpx.Client(
+        timeout=_REQUEST_TIMEOUT_SECONDS,
+        follow_redirects=True,
+        transport=transport,
+        http2=transport is None and _HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=30.0),
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """Return the module-level client shared by all fetches in a run (created lazily)."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = build_http_client()
+        return _shared_client
+
+
+def get_http_cache() -> HttpCache | None:
+    """Return the on-disk HTTP cache under `CACHE_DIR` (None when `HTTP_CACHE_MAX_BYTES=0`)."""
+    global _shared_cache
+    if HTTP_CACHE_MAX_BYTES <= 0:
+        return None
+    with _shared_client_lock:
+        if _shared_cache is None:
+            _shared_cache = _open_store(
+                "HTTP cache",
+                lambda: HttpCache(
+                    Path(CACHE_DIR) / "http_cache.sqlite3",
+                    max_bytes=HTTP_CACHE_MAX_BYTES,
+                    ttl_seconds=HTTP_CACHE_TTL_HOURS * 3600,
+                ),
+            )
+        return _shared_cache
+
+
+def close_http_client() -> None:
+    """
+    Close the shared client, HTTP cache and host memory at the end of a run; the next fetch
+    reopens them.
+    """
+    global _shared_client, _shared_cache, _shared_host_memory
+    with _shared_client_lock:
+        _unavailable_stores.difference_update({"HTTP cache", "Host memory"})
+        if _shared_client is not None:
+            _shared_client.close()
+            _shared_client = None
+        if _shared_cache is not None:
+            _shared_cache.close()
+            _shared_cache = None
+        if _shared_host_memory is not None:
+            blocked = [
+                host
+                for host, state in _cache_call(_shared_host_memory.snapshot, default={}).items()
+                if state.blocked_until is not None and state.blocked_until > time.time()
+            ]
+            if blocked:
+                logger.info("Hosts in the negative cache: %s", ", ".join(blocked))
+            _shared_host_memory.close()
+            _shared_host_memory = None
+
+
+def get_host_memory() -> HostMemory | None:
+    """Return the persisted per-host User-Agent affinity / negative cache (None when disabled)."""
+    global _shared_host_memory
+    if HOST_NEGATIVE_CACHE_MINUTES <= 0:
+        return None
+    with _shared_client_lock:
+        if _shared_host_memory is None:
+            _shared_host_memory = _open_store(
+                "Host memory",
+                lambda: HostMemory(
+                    Path(CACHE_DIR) / "host_memory.sqlite3",
+                    negative_ttl_seconds=HOST_NEGATIVE_CACHE_MINUTES * 60,
+                ),
+            )
+        return _shared_host_memory
+
+
+def get_extraction_pool() -> ProcessPoolExecutor | None:
+    """
+    Return the process pool for HTML parsing (None when `EXTRACT_PROCESS_WORKERS=0`).
+
+    Workers are spawned rather than forked: the pool is created from extraction threads while
+    other threads hold locks (logging, SQLite, the HTTP pool).
+    """
+    global _shared_process_pool
+    workers = (os.cpu_count() or 1) if EXTRACT_PROCESS_WORKERS < 0 else EXTRACT_PROCESS_WORKERS
+    if workers <= 0:
+        return None
+    with _shared_client_lock:
+        if _shared_process_pool is None:
+            logger.info("Parsing HTML in %s worker processes", workers)
+            _shared_process_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _shared_process_pool
+
+
+def shutdown_extraction_pool() -> None:
+    global _shared_process_pool
+    with _shared_client_lock:
+        if _shared_process_pool is not None:
+            _shared_process_pool.shutdown(wait=True, cancel_futures=True)
+            _shared_process_pool = None
+
+
+def get_extraction_cache() -> ExtractionCache | None:
+    """Return the extraction-result cache under `CACHE_DIR` (None when disabled)."""
+    global _shared_extraction_cache
+    if EXTRACTION_CACHE_MAX_ENTRIES <= 0:
+        return None
+    with _shared_client_lock:
+        if _shared_extraction_cache is None:
+            _shared_extraction_cache = _open_store(
+                "Extraction cache",
+                lambda: ExtractionCache(
+                    Path(CACHE_DIR) / "extraction_cache.sqlite3",
+                    max_entries=EXTRACTION_CACHE_MAX_ENTRIES,
+                    variant=f"v{_EXTRACTOR_VERSION}:chars={MAX_EXTRACT_CHARS}",
+                ),
+            )
+        return _shared_extraction_cache
+
+
+def close_extraction_cache() -> None:
+    """Log the cache hit ratio for the run and close the extraction cache."""
+    global _shared_extraction_cache
+    with _shared_client_lock:
+        _unavailable_stores.discard("Extraction cache")
+        if _shared_extraction_cache is None:
+            return
+        stats = _shared_extraction_cache.stats()
+        logger.info(
+            "Extraction cache hits=%s misses=%s evicted=%s",
+            stats.hits,
+            stats.misses,
+            stats.evicted,
+        )
+        _shared_extraction_cache.close()
+        _shared_extraction_cache = None
+
+
+def fetch_html(
+    url: str,
+    *,
+    transport: httpx.BaseTransport | None = None,
+    client: httpx.Client | None = None,
+    cache: HttpCache | None = None,
+    hosts: HostMemory | None = None,
+) -> str:
+    """Fetch a page as text (see `fetch_page`)."""
+    return fetch_page(url, transport=transport, client=client, cache=cache, hosts=hosts).text()
+
+
+def fetch_page(
+    url: str,
+    *,
+    transport: httpx.BaseTransport | None = None,
+    client: httpx.Client | None = None,
+    cache: HttpCache | None = None,
+    hosts: HostMemory | None = None,
+) -> FetchedPage:
+    """
+    Fetch a page as bytes with its sniffed encoding.
+
+    Without an injected client or transport the shared client, on-disk cache and host memory
+    are used; an injected client only uses the cache and host memory passed explicitly.
+    """
+    if client is not None:
+        return _fetch_page_remembering_host(client, url, cache, hosts)
+    if transport is not None:
+        with build_http_client(transport=transport) as transport_client:
+            return _fetch_page_remembering_host(transport_client, url, cache, hosts)
+    return _fetch_page_remembering_host(
+        get_http_client(),
+        url,
+        cache if cache is not None else get_http_cache(),
+        hosts if hosts is not None else get_host_memory(),
+    )
+
+
+def _fetch_page_remembering_host(
+    client: httpx.Client,
+    url: str,
+    cache: HttpCache | None,
+    hosts: HostMemory | None,
+) -> FetchedPage:
+    if hosts is None:
+        return _fetch_page_with_client(client, url, cache)
+    host = host_of(url)
+    reason = _cache_call(hosts.blocked_reason, host)
+    if reason is not None:
+        raise ExtractionError(f"Skipped: {host} failed recently ({reason})")
+    preferred = _cache_call(hosts.preferred_user_agent, host)
+    try:
+        page = _fetch_page_with_client(client, url, cache, preferred_user_agent=preferred)
+    except _HostError as exc:
+        _cache_call(hosts.record_failure, host, str(exc))
+        raise
+    if page.user_agent is not None:
+        _cache_call(hosts.record_success, host, page.user_agent)
+    return page
+
+
+def _fetch_page_with_client(
+    client: httpx.Client,
+    url: str,
+    cache: HttpCache | None = None,
+    *,
+    preferred_user_agent: str | None = None,
+) -> FetchedPage:
+    """
+    Fetch with User-Agent fallback under one deadline (`FETCH_DEADLINE_SECONDS`) for the item.
+
+    Each request's timeout is capped by the time left, and body reads stop at the deadline.
+    With `FETCH_HEDGE_DELAY_MS` set, a slow first attempt is raced against the next candidate.
+    """
     logger.info("Fetching URL: %s", url)
-    last_status: int | None = None
+    deadline = time.monotonic() + FETCH_DEADLINE_SECONDS
+    cached = _cache_lookup(cache, url)
     user_agents = _user_agent_candidates()
-    for idx, user_agent in enumerate(user_agents, start=1):
-        with httpx.Client(
-            headers=_request_headers(user_agent),
-            timeout=20.0,
-            follow_redirects=True,
-            transport=transport,
-        ) as client:
-            try:
-                response = client.get(url)
-            except httpx.RequestError as exc:
-                raise ExtractionError(f"HTTP request failed: {exc}") from exc
+    if preferred_user_agent in user_agents:
+        # 前回このホストで通った User-Agent から試す（403 の空振りを避ける）。
+        user_agents.remove(preferred_user_agent)
+        user_agents.insert(0, preferred_user_agent)
+    attempt = functools.partial(_fetch_attempt, client, url, cache, cached, deadline)
+    if FETCH_HEDGE_DELAY_MS > 0 and len(user_agents) > 1:
+        return _fetch_hedged(attempt, url, user_agents, deadline, FETCH_HEDGE_DELAY_MS / 1000)
 
-            last_status = response.status_code
-            if response.status_code in (403, 406) and idx < len(user_agents):
+    last_status: int | None = None
+    for idx, user_agent in enumerate(user_agents, start=1):
+        try:
+            return attempt(user_agent, None)
+        except _Blocked as blocked:
+            last_status = blocked.status
+            if idx < len(user_agents):
                 logger.warning(
                     "HTTP %s for %s; retrying with another User-Agent (attempt %s/%s)",
-                    response.status_code,
+                    blocked.status,
                     url,
                     idx,
                     len(user_agents),
                 )
+    raise _blocked_error(last_status)
+
+
+def _fetch_hedged(
+    attempt: Callable[[str, Optional[threading.Event]], FetchedPage],
+    url: str,
+    user_agents: List[str],
+    deadline: float,
+    hedge_delay: float,
+) -> FetchedPage:
+    # 応答の遅い試行を待ち続けず、hedge_delay ごとに次の User-Agent を並行で投げて先に成功した方を使う。
+    # 負けた試行は cancelled を見て本文の読み込みを打ち切る。
+    cancelled = threading.Event()
+    candidates = list(user_agents)
+    pending: Set[Future] = set()
+    last_status: int | None = None
+    last_error: ExtractionError | None = None
+    executor = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="fetch-hedge")
+
+    def launch() -> None:
+        pending.add(executor.submit(attempt, candidates.pop(0), cancelled))
+
+    try:
+        launch()
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(
+                pending,
+                timeout=min(remaining, hedge_delay) if candidates else remaining,
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                if candidates:
+                    logger.info("No response from %s after %.2fs; hedging with another User-Agent", url, hedge_delay)
+                    launch()
                 continue
+            for future in done:
+                pending.discard(future)
+                try:
+                    return future.result()
+                except _Blocked as blocked:
+                    last_status = blocked.status
+                    if candidates:
+                        launch()
+                except ExtractionError as exc:
+                    last_error = exc
+            if last_error is not None and not pending:
+                raise last_error
+    finally:
+        cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+    if last_error is not None:
+        raise last_error
+    if last_status is not None and not candidates:
+        raise _blocked_error(last_status)
+    raise _HostError(f"HTTP fetch failed: deadline of {FETCH_DEADLINE_SECONDS}s exceeded")
+
+
+def _fetch_attempt(
+    client: httpx.Client,
+    url: str,
+    cache: HttpCache | None,
+    cached: CachedResponse | None,
+    deadline: float,
+    user_agent: str,
+    cancelled: threading.Event | None,
+) -> FetchedPage:
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise _HostError(f"HTTP fetch failed: deadline of {FETCH_DEADLINE_SECONDS}s exceeded")
+    headers = _request_headers(user_agent)
+    if cached is not None:
+        headers.update(cached.conditional_headers())
+    try:
+        with client.stream(
+            "GET", url, headers=headers, timeout=min(_REQUEST_TIMEOUT_SECONDS, remaining)
+        ) as response:
+            if response.status_code == 304 and cached is not None:
+                logger.info("Not modified: %s (reusing cached body)", url)
+                _cache_call(
+                    cache.refresh,  # type: ignore[union-attr]
+                    cached.url,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+                return FetchedPage(
+                    url=cached.url, content=cached.body, encoding=cached.encoding, user_agent=user_agent
+                )
+            if response.status_code in (403, 406):
+                raise _Blocked(response.status_code)
 
             try:
                 response.raise_for_status()
             except httpx.HTTPStatusError as exc:
-                hint = ""
-                if exc.response.status_code == 403:
-                    hint = " (site may block automated fetch; try setting HTTP_USER_AGENT to a browser UA)"
-                raise ExtractionError(f"HTTP fetch failed: {exc}{hint}") from exc
-            return response.text
+                raise ExtractionError(f"HTTP fetch failed: {exc}") from exc
+            content = _read_html_body(response, url, MAX_FETCH_BYTES, deadline=deadline, cancelled=cancelled)
+            # response.text を使わず、BOM / ヘッダ / <meta> から自前で判定する（本文全体のデコードを避ける）。
+            encoding = sniff_encoding(content, response.charset_encoding)
+            if cache is not None:
+                _cache_call(
+                    cache.store,
+                    url,
+                    str(response.url),
+                    content,
+                    encoding,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+            return FetchedPage(url=str(response.url), content=content, encoding=encoding, user_agent=user_agent)
+    except httpx.RequestError as exc:
+        raise _HostError(f"HTTP request failed: {exc}") from exc
+
+
+def _blocked_error(status: int | None) -> ExtractionError:
+    hint = ""
+    if status == 403:
+        hint = " (site may block automated fetch; try setting HTTP_USER_AGENT to a browser UA)"
+    return _HostError(f"HTTP fetch failed: status={status}{hint}")
+
+
+def sniff_encoding(content: bytes, header_charset: str | None = None) -> str:
+    """
+    Pick the encoding of a page: BOM, then the Content-Type charset, then `<meta charset>`
+    in the first few KB, defaulting to UTF-8. Returns a Python codec name.
+    """
+    if content.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if content.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    header_encoding = _normalize_encoding(header_charset)
+    if header_encoding:
+        return header_encoding
+    match = _META_CHARSET_RE.search(content[:_CHARSET_SNIFF_BYTES])
+    if match:
+        meta_encoding = _normalize_encoding(match.group(1).decode("ascii", "ignore"))
+        # バイト列として読めている以上、<meta> の UTF-16 宣言は誤り（HTML 仕様でも UTF-8 扱い）。
+        if meta_encoding and not meta_encoding.startswith("utf-16"):
+            return meta_encoding
+    return "utf-8"
 
-    raise ExtractionError(f"HTTP fetch failed: status={last_status}")
+
+def _normalize_encoding(label: str | None) -> str | None:
+    if not label:
+        return None
+    label = label.strip().lower()
+    try:
+        name = codecs.lookup(_PYTHON_LABEL_ALIASES.get(label, label)).name
+    except LookupError:
+        return None
+    return _SUPERSET_ENCODINGS.get(name, name)
+
+
+def _cache_lookup(cache: HttpCache | None, url: str) -> CachedResponse | None:
+    if cache is None:
+        return None
+    return _cache_call(cache.lookup, url)
+
+
+def _open_store(name: str, factory):
+    # _shared_client_lock を保持した状態で呼ぶ。開けなければ None を返し、実行の終わりまで再試行しない。
+    if name in _unavailable_stores:
+        return None
+    try:
+        return factory()
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("%s unavailable for this run: %s", name, exc)
+        _unavailable_stores.add(name)
+        return None
+
+
+def _cache_call(fn, *args, default=None, **kwargs):
+    # キャッシュは最適化にすぎないので、SQLite の失敗で記事の取得自体は失敗させない。
+    try:
+        return fn(*args, **kwargs)
+    except sqlite3.Error as exc:
+        logger.warning("Cache unavailable: %s", exc)
+        return default
+
+
+def _read_html_body(
+    response: httpx.Response,
+    url: str,
+    max_bytes: int,
+    *,
+    deadline: float | None = None,
+    cancelled: threading.Event | None = None,
+) -> bytes:
+    """
+    Read at most `max_bytes` of an HTML response body.
+
+    Declared non-HTML types are rejected before any body is read; the first bytes are then
+    sniffed for well-known binary signatures (and, for unlabeled responses, for markup).
+    Reading stops at the cap, at `deadline` (monotonic) or once `cancelled` is set, and the
+    connection is released without draining the rest.
+    """
+    content_type = response.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+    if content_type not in _HTML_CONTENT_TYPES and content_type not in _UNLABELED_CONTENT_TYPES:
+        raise ExtractionError(f"Unsupported content type: {content_type}")
+
+    declared_length = _content_length(response)
+    if declared_length is not None and declared_length > max_bytes:
+        logger.info("Content-Length %s exceeds %s bytes for %s; reading the head only", declared_length, max_bytes, url)
+
+    chunks: List[bytes] = []
+    received = 0
+    sniffed = False
+    for chunk in response.iter_bytes():
+        if cancelled is not None and cancelled.is_set():
+            raise ExtractionError("HTTP fetch cancelled: another attempt finished first")
+        if deadline is not None and time.monotonic() > deadline:
+            raise _HostError(f"HTTP fetch failed: deadline of {FETCH_DEADLINE_SECONDS}s exceeded while reading")
+        chunks.append(chunk)
+        received += len(chunk)
+        if not sniffed and (received >= _SNIFF_BYTES or received >= max_bytes):
+            _sniff_html(b"".join(chunks)[:_SNIFF_BYTES], content_type)
+            sniffed = True
+        if received >= max_bytes:
+            logger.info("Stopped reading %s after %s bytes (MAX_FETCH_BYTES)", url, max_bytes)
+            break
+    body = b"".join(chunks)[:max_bytes]
+    if not sniffed:
+        _sniff_html(body[:_SNIFF_BYTES], content_type)
+    return body
+
+
+def _content_length(response: httpx.Response) -> int | None:
+    raw = response.headers.get("Content-Length")
+    try:
+        return int(raw) if raw is not None else None
+    except ValueError:
+        return None
+
+
+def _sniff_html(head: bytes, content_type: str) -> None:
+    for signature, detected in _BINARY_SIGNATURES:
+        if head.startswith(signature):
+            raise ExtractionError(f"Unsupported content: looks like {detected} (Content-Type: {content_type or 'none'})")
+    if content_type in _UNLABELED_CONTENT_TYPES:
+        stripped = head.lstrip(b"\xef\xbb\xbf \t\r\n")
+        if not stripped.startswith(b"<"):
+            raise ExtractionError(f"Unsupported content: body does not look like HTML (Content-Type: {content_type or 'none'})")
 
 
 def extract_text(url: str) -> ExtractedContent:
@@ -117,26 +757,176 @@ def extract_text(url: str) -> ExtractedContent:
         raise ExtractionError("YouTubeリンクは非対応です。対応を希望する場合は、開発者までご連絡ください。")
     if source == "speakerdeck":
         raise ExtractionError("SpeakerDeckリンクは非対応です。対応を希望する場合は、開発者までご連絡ください。")
-    html_text = fetch_html(url)
-    text = _extract_readability(html_text, url)
-    hero_image_url = _extract_hero_image_url(html_text, url)
+    page = fetch_page(url)
+    return extract_cached(
+        page.content,
+        url,
+        source,
+        get_extraction_cache(),
+        encoding=page.encoding,
+        pool=get_extraction_pool(),
+    )
+
+
+def extract_cached(
+    document: str | bytes,
+    url: str,
+    source: str,
+    cache: ExtractionCache | None,
+    *,
+    encoding: str | None = None,
+    pool: Executor | None = None,
+) -> ExtractedContent:
+    """
+    `extract_from_html` memoized on (canonical URL, hash of the fetched page).
+
+    With `pool`, parsing runs in a worker process: only the raw bytes go in and the small
+    `ExtractedContent` comes back, while the calling thread simply waits.
+    """
+    if cache is None:
+        return _extract(document, url, source, encoding, pool)
+    body_hash = content_hash(document)
+    cached = _cache_call(cache.get, url, body_hash)
+    if cached is not None:
+        logger.info("Extraction cache hit for %s (%s characters)", url, cached.length)
+        return cached
+    content = _extract(document, url, source, encoding, pool)
+    _cache_call(cache.put, url, body_hash, content)
+    return content
+
+
+def _extract(
+    document: str | bytes,
+    url: str,
+    source: str,
+    encoding: str | None,
+    pool: Executor | None,
+) -> ExtractedContent:
+    if pool is None:
+        return extract_from_html(document, url, source, encoding=encoding)
+    try:
+        content, seconds = pool.submit(_extract_content, document, url, source, encoding).result()
+    except BrokenProcessPool as exc:
+        logger.warning("Extraction worker pool is broken (%s); parsing %s in-process", exc, url)
+        return extract_from_html(document, url, source, encoding=encoding)
+    EXTRACTION_METRICS.record(content.tier or "readability", seconds)
+    return content
+
+
+def extract_from_html(
+    document: str | bytes,
+    url: str,
+    source: str = "web",
+    *,
+    encoding: str | None = None,
+) -> ExtractedContent:
+    """
+    Build `ExtractedContent` from a fetched page (raw bytes, or already decoded text).
+
+    The page is parsed once; hero-image detection reads the tree first because readability
+    drops hidden nodes from its input before working on its own cleaned copy. The article text
+    comes from the first tier in `_iter_tiers` whose candidate passes the quality threshold.
+    """
+    content, seconds = _extract_content(document, url, source, encoding)
+    EXTRACTION_METRICS.record(content.tier or "readability", seconds)
+    return content
+
+
+def _extract_content(
+    document: str | bytes,
+    url: str,
+    source: str,
+    encoding: str | None,
+) -> Tuple[ExtractedContent, float]:
+    # プロセスプールからも呼ぶので、メトリクスは記録せずに抽出段の CPU 時間を返す。
+    tree = _parse_tree(document, encoding)
+    jsonld_blocks = [str(block) for block in _JSONLD_XPATH(tree)]
+    _preclean(tree)
+    hero_image_url = _extract_hero_image_url(tree, url)
+    started = time.thread_time()
+    tier, text = _extract_tiered(tree, url, jsonld_blocks)
+    seconds = time.thread_time() - started
     cleaned = text.strip()
     if not cleaned:
         raise ExtractionError("Extracted text is empty.")
     trimmed = trim_text(cleaned, MAX_EXTRACT_CHARS)
     logger.info(
-        "Extracted %s characters from %s (source=%s)%s",
+        "Extracted %s characters from %s (source=%s tier=%s)%s",
         len(trimmed),
         url,
         source,
+        tier,
         "" if not hero_image_url else " (hero image detected)",
     )
-    return ExtractedContent(
+    content = ExtractedContent(
         text=trimmed,
         source=source,
         length=len(trimmed),
         hero_image_url=hero_image_url,
+        tier=tier,
     )
+    return content, seconds
+
+
+def _extract_tiered(tree: html.HtmlElement, url: str, jsonld_blocks: List[str]) -> Tuple[str, str]:
+    for tier, candidate in _iter_tiers(tree, jsonld_blocks):
+        text = candidate()
+        if text is not None:
+            return tier, text
+    return "readability", _extract_readability(tree, url)
+
+
+def _iter_tiers(
+    tree: html.HtmlElement, jsonld_blocks: List[str]
+) -> Iterator[Tuple[str, Callable[[], Optional[str]]]]:
+    # 安い順。各段は採用条件を満たさなければ None を返して次に譲る。
+    yield "jsonld", lambda: _extract_jsonld_article_body(jsonld_blocks)
+    yield "article", lambda: _extract_single_element(tree, "article")
+    yield "main", lambda: _extract_single_element(tree, "main")
+
+
+def _extract_jsonld_article_body(blocks: List[str]) -> str | None:
+    best = ""
+    for block in blocks:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        for node in _iter_jsonld_nodes(data):
+            body = node.get("articleBody")
+            if isinstance(body, str) and len(body) > len(best):
+                best = body
+    if "<" in best:
+        # articleBody に HTML を入れてくるサイトもあるので、テキストだけにする。
+        best = html.fromstring(best).text_content()
+    best = best.strip()
+    return best if len(best) >= _FAST_PATH_MIN_CHARS else None
+
+
+def _iter_jsonld_nodes(data: object) -> Iterator[dict]:
+    if isinstance(data, list):
+        for entry in data:
+            yield from _iter_jsonld_nodes(entry)
+    elif isinstance(data, dict):
+        yield data
+        graph = data.get("@graph")
+        if graph is not None:
+            yield from _iter_jsonld_nodes(graph)
+
+
+def _extract_single_element(tree: html.HtmlElement, tag: str) -> str | None:
+    # 複数あるのは一覧ページ（カードごとに <article>）のことが多いので、単独の場合だけ採用する。
+    elements = tree.findall(f".//{tag}")
+    if len(elements) != 1:
+        return None
+    element = elements[0]
+    text = "".join(_FAST_PATH_TEXT_XPATH(element)).strip()
+    if len(text) < _FAST_PATH_MIN_CHARS:
+        return None
+    link_chars = sum(len(part) for part in _FAST_PATH_LINK_TEXT_XPATH(element))
+    if link_chars / len(text) > _FAST_PATH_MAX_LINK_DENSITY:
+        return None
+    return text
 
 
 def _extract_youtube(html_text: str) -> Tuple[str, List[str]]:
@@ -157,28 +947,70 @@ def _extract_x(html_text: str) -> str:
     return description
 
 
-def _extract_readability(html_text: str, url: str) -> str:
-    doc = Document(html_text, url=url)
+def parse_html(document: str | bytes, encoding: str | None = None) -> html.HtmlElement:
+    """
+    Parse a page once and strip nodes that never contribute to the article text.
+
+    Bytes go straight to lxml with the sniffed encoding (no decode/re-encode pass). Text is
+    decoded the same way as readability's own `build_doc` (re-encode as UTF-8, replacing
+    broken characters), so handing the tree to readability does not change its result.
+    """
+    tree = _parse_tree(document, encoding)
+    _preclean(tree)
+    return tree
+
+
+def _parse_tree(document: str | bytes, encoding: str | None = None) -> html.HtmlElement:
+    if isinstance(document, str):
+        return html.document_fromstring(document.encode("utf-8", "replace"), parser=_UTF8_PARSER)
+    encoding = encoding or sniff_encoding(document)
+    if encoding == "utf-8-sig":
+        document, encoding = document[len(codecs.BOM_UTF8):], "utf-8"
+    parser = _UTF8_PARSER if encoding == "utf-8" else _parser_for(encoding)
+    if parser is None:
+        # libxml2 が扱えない文字コードだけは Python 側でデコードする。
+        return html.document_fromstring(document.decode(encoding, "replace").encode("utf-8"), parser=_UTF8_PARSER)
+    return html.document_fromstring(document, parser=parser)
+
+
+@functools.lru_cache(maxsize=None)
+def _parser_for(encoding: str) -> html.HTMLParser | None:
+    # libxml2 は "euc-jp" は知っていても Python 名の "euc_jp" は知らないことがある。
+    for name in (encoding, encoding.replace("_", "-")):
+        try:
+            return html.HTMLParser(encoding=name)
+        except LookupError:
+            continue
+    return None
+
+
+def _preclean(tree: html.HtmlElement) -> None:
+    etree.strip_elements(tree, *_PRECLEAN_TAGS, etree.Comment, with_tail=False)
+
+
+def _as_tree(page: str | html.HtmlElement) -> html.HtmlElement:
+    return parse_html(page) if isinstance(page, str) else page
+
+
+def _extract_readability(page: str | html.HtmlElement, url: str) -> str:
+    doc = Document(_as_tree(page), url=url)
     summary_html = doc.summary(html_partial=True)
+    # summary は本文部分だけの小さな断片なので、ここでの再パースは安い。
     tree = html.fromstring(summary_html)
     text = tree.text_content()
     return text
 
 
-def _extract_hero_image_url(html_text: str, page_url: str) -> str | None:
+def _extract_hero_image_url(page: str | html.HtmlElement, page_url: str) -> str | None:
     """
     Extract a representative header image URL for email display.
 
     Prefer Open Graph / Twitter card images. If the URL is relative, resolve it using the page URL.
     """
-    tree = html.fromstring(html_text)
+    tree = _as_tree(page)
     candidates: List[str] = []
-    candidates.extend(tree.xpath("//meta[@property='og:image']/@content"))
-    candidates.extend(tree.xpath("//meta[@property='og:image:url']/@content"))
-    candidates.extend(tree.xpath("//meta[@property='og:image:secure_url']/@content"))
-    candidates.extend(tree.xpath("//meta[@name='twitter:image']/@content"))
-    candidates.extend(tree.xpath("//meta[@name='twitter:image:src']/@content"))
-    candidates.extend(tree.xpath("//link[@rel='image_src']/@href"))
+    for xpath in _HERO_IMAGE_XPATHS:
+        candidates.extend(xpath(tree))
 
     for raw in candidates:
         if not raw:
@@ -41,10 +41,11 @@ def has_excluded_tag(tags: Iterable[str]) -> bool:
 def filter_new_items(items: List[RaindropItem], threshold_jst: datetime) -> List[RaindropItem]:
     filtered: List[RaindropItem] = []
     for item in items:
-        if not is_recent(item, threshold_jst):
-            continue
+        # タグ判定を先に行い、除外されるアイテムでは created の日時パースを省く。
         if has_excluded_tag(item.tags):
             continue
+        if not is_recent(item, threshold_jst):
+            continue
         filtered.append(item)
     return filtered
 
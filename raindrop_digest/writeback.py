@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Set, Tuple
+
+from .config import TAG_DELIVERED, TAG_FAILED
+from .models import SummaryResult
+from .raindrop_client import RaindropApiError, RaindropClient, RaindropConnectionError
+from .utils import append_note
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NoteWrite:
+    item_id: int
+    note: str
+
+
+@dataclass
+class WritebackPlan:
+    """
+    Raindrop updates derived from a batch of results.
+
+    Notes are per-item writes; tags are grouped by collection and the exact set of tags to
+    append so that each group maps to a single bulk request. Items whose note and tags are
+    already up to date appear in neither.
+    """
+
+    notes: List[NoteWrite] = field(default_factory=list)
+    tag_groups: Dict[Tuple[int, Tuple[str, ...]], List[int]] = field(default_factory=dict)
+    skipped: int = 0
+
+
+def build_writeback_plan(results: List[SummaryResult]) -> WritebackPlan:
+    plan = WritebackPlan()
+    for result in results:
+        item = result.item
+        if result.is_success() and result.summary:
+            note_addition = f"▼サマリー\n{result.summary}"
+            extra_tags = [TAG_DELIVERED]
+        else:
+            note_addition = f"要約失敗: {result.error}" if result.error else "要約失敗"
+            extra_tags = [TAG_DELIVERED, TAG_FAILED]
+
+        merged_note = append_note(item.note, note_addition)
+        missing_tags = tuple(tag for tag in extra_tags if tag not in item.tags)
+        if merged_note == (item.note or "") and not missing_tags:
+            plan.skipped += 1
+            continue
+        if merged_note != (item.note or ""):
+            plan.notes.append(NoteWrite(item_id=item.id, note=merged_note))
+        if missing_tags:
+            plan.tag_groups.setdefault((item.collection_id, missing_tags), []).append(item.id)
+    return plan
+
+
+def apply_writeback(raindrop: RaindropClient, results: List[SummaryResult], *, max_workers: int) -> Set[int]:
+    """
+    Write summaries and delivery tags back to Raindrop; returns ids whose writeback failed.
+
+    Notes go first through a bounded pool; an item whose note write failed is left untagged so
+    that it is picked up again by the next batch, as with the former per-item update.
+    """
+    plan = build_writeback_plan(results)
+    items_by_id = {result.item.id: result.item for result in results}
+    logger.info(
+        "Raindrop writeback: notes=%s tag_groups=%s skipped=%s",
+        len(plan.notes),
+        len(plan.tag_groups),
+        plan.skipped,
+    )
+
+    failed_ids: Set[int] = set()
+
+    def write_note(write: NoteWrite) -> None:
+        try:
+            raindrop.update_note(items_by_id[write.item_id], write.note)
+        except (RaindropConnectionError, RaindropApiError) as exc:
+            logger.exception("Failed to update Raindrop item %s: %s", write.item_id, exc)
+            failed_ids.add(write.item_id)
+
+    if plan.notes:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            list(executor.map(write_note, plan.notes))
+
+    for (collection_id, tags), item_ids in plan.tag_groups.items():
+        ids = [item_id for item_id in item_ids if item_id not in failed_ids]
+        if not ids:
+            continue
+        try:
+            raindrop.bulk_add_tags(ids, list(tags), collection_id)
+        except (RaindropConnectionError, RaindropApiError) as exc:
+            logger.exception("Failed to tag Raindrop items %s with %s: %s", ids, list(tags), exc)
+            failed_ids.update(ids)
+    return failed_ids
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import pytest
+
+from raindrop_digest.compaction import compact_text, estimate_tokens
+
+
+def test_estimate_tokens_counts_cjk_per_char_and_latin_per_four_chars() -> None:
+    assert estimate_tokens("日本語") == 3
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("") == 0
+
+
+def test_compaction_collapses_whitespace_and_drops_duplicate_and_boilerplate_lines() -> None:
+    text = "\n".join(
+        [
+            "広告業界の  変化",
+            "",
+            "この記事をシェアする",
+            "Share  Tweet  Email",
+            "本文の最初の段落です。",
+            "本文の最初の段落です。",
+            "We use cookies to improve your experience. By continuing you accept our cookie policy.",
+            "© 2024 Example Inc. All rights reserved.",
+            "Read more about how caching works in modern CPUs.",
+        ]
+    )
+
+    result = compact_text(text, max_tokens=1_000)
+
+    assert result.text.splitlines() == [
+        "広告業界の 変化",
+        "本文の最初の段落です。",
+        "Read more about how caching works in modern CPUs.",
+    ]
+    assert result.dropped_lines == 5
+    assert not result.truncated
+    assert result.tokens_saved == result.tokens_before - result.tokens_after > 0
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "Cookie の利用状況を分析した結果、サードパーティ Cookie を使用するサイトは減少した。",
+        "EU のクッキー規制では同意の取得が求められる。",
+        "Regulators say sites must let users accept or reject cookies.",
+    ],
+)
+def test_compaction_keeps_article_lines_about_cookies(line: str) -> None:
+    assert compact_text(line, max_tokens=1_000).text == line
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "当サイトでは Cookie を使用しています。同意する",
+        "This site uses cookies. Accept all",
+    ],
+)
+def test_compaction_drops_cookie_banners(line: str) -> None:
+    assert compact_text("本文の段落です。\n" + line, max_tokens=1_000).text == "本文の段落です。"
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        ("一文目です。二文目です。三文目です。", "一文目です。二文目です。"),
+        ("First sentence here. Second sentence here. Third one here.", "First sentence here. Second sentence here."),
+    ],
+)
+def test_compaction_truncates_at_sentence_boundary_within_budget(line: str, expected: str) -> None:
+    budget = estimate_tokens(expected) + 1
+
+    result = compact_text("見出し\n" + line, max_tokens=budget + estimate_tokens("見出し"))
+
+    assert result.text == "見出し\n" + expected
+    assert result.truncated
+    assert result.tokens_after <= budget + estimate_tokens("見出し")
+
+
+def test_compaction_cuts_a_single_unpunctuated_line_to_budget() -> None:
+    result = compact_text("あ" * 500, max_tokens=100)
+
+    assert result.text == "あ" * 100
+    assert result.truncated
+
+
+def test_compaction_does_not_send_more_english_tokens_than_the_old_char_cap() -> None:
+    text = "\n".join(f"Paragraph {i} explains how the cache keeps recent entries warm." for i in range(600))
+    baseline = estimate_tokens(text[:10_000])
+
+    result = compact_text(text, max_tokens=10_000, max_chars=10_000)
+
+    assert len(text) > 30_000
+    assert len(result.text) <= 10_000
+    assert result.tokens_after <= baseline
+    assert result.truncated
+
+
+def test_compaction_char_cap_still_lets_cjk_use_the_full_budget() -> None:
+    result = compact_text("本文です。" * 3_000, max_tokens=10_000, max_chars=10_000)
+
+    assert 9_990 <= len(result.text) <= 10_000
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from raindrop_digest.concurrency import HostLimitedExecutor
+
+
+def test_host_limited_executor_respects_global_and_per_host_caps():
+    lock = threading.Lock()
+    active_by_host: Counter[str] = Counter()
+    peak_by_host: Counter[str] = Counter()
+    active_total = 0
+    peak_total = 0
+
+    def work(url: str) -> str:
+        nonlocal active_total, peak_total
+        host = url.split("/")[2]
+        with lock:
+            active_by_host[host] += 1
+            active_total += 1
+            peak_by_host[host] = max(peak_by_host[host], active_by_host[host])
+            peak_total = max(peak_total, active_total)
+        time.sleep(0.02)
+        with lock:
+            active_by_host[host] -= 1
+            active_total -= 1
+        return url
+
+    urls = [f"https://slow.example/{i}" for i in range(8)] + [f"https://host{i}.example/" for i in range(6)]
+    with HostLimitedExecutor(4, 2) as executor:
+        futures = [executor.submit(url, work, url) for url in urls]
+        results = [future.result() for future in futures]
+
+    assert results == urls
+    assert peak_by_host["slow.example"] == 2
+    assert peak_total <= 4
+
+
+def test_host_limited_executor_does_not_let_one_host_starve_others():
+    release = threading.Event()
+    finished: list[str] = []
+
+    def blocked(url: str) -> None:
+        release.wait(timeout=5)
+        finished.append(url)
+
+    def quick(url: str) -> None:
+        finished.append(url)
+
+    with HostLimitedExecutor(4, 1) as executor:
+        slow = [executor.submit(f"https://slow.example/{i}", blocked, f"slow{i}") for i in range(3)]
+        fast = executor.submit("https://fast.example/", quick, "fast")
+        fast.result(timeout=2)
+        assert finished == ["fast"]
+        release.set()
+        for future in slow:
+            future.result(timeout=5)
+
+
+def test_host_limited_executor_propagates_exceptions():
+    def boom(url: str) -> None:
+        raise ValueError(url)
+
+    with HostLimitedExecutor(2, 1) as executor:
+        future = executor.submit("https://example.com/", boom, "x")
+        with pytest.raises(ValueError, match="x"):
+            future.result()
@@ -69,3 +69,30 @@ def test_batch_lookback_days_too_small_raises(monkeypatch: pytest.MonkeyPatch, v
         else:
             monkeypatch.setenv("BATCH_LOOKBACK_DAYS", original)
         _reload_config()
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(None, (-1,)), ("all", (0,)), ("ALL", (0,)), ("-1, 123,123 ,456", (-1, 123, 456))],
+)
+def test_raindrop_collection_ids_from_env(monkeypatch: pytest.MonkeyPatch, value, expected) -> None:
+    try:
+        if value is None:
+            monkeypatch.delenv("RAINDROP_COLLECTION_IDS", raising=False)
+        else:
+            monkeypatch.setenv("RAINDROP_COLLECTION_IDS", value)
+        reloaded = _reload_config()
+        assert reloaded.RAINDROP_COLLECTION_IDS == expected
+    finally:
+        monkeypatch.delenv("RAINDROP_COLLECTION_IDS", raising=False)
+        _reload_config()
+
+
+def test_raindrop_collection_ids_invalid_raises(monkeypatch: pytest.MonkeyPatch) -> None:
+    try:
+        monkeypatch.setenv("RAINDROP_COLLECTION_IDS", "unsorted")
+        with pytest.raises(ValueError, match=r"RAINDROP_COLLECTION_IDS must be 'all' or comma-separated integers"):
+            _reload_config()
+    finally:
+        monkeypatch.delenv("RAINDROP_COLLECTION_IDS", raising=False)
+        _reload_config()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from raindrop_digest import text_extractor
+from raindrop_digest.extraction_cache import ExtractionCache, content_hash
+from raindrop_digest.models import ExtractedContent
+from raindrop_digest.text_extractor import extract_cached
+
+
+def _page(word: str) -> str:
+    body = "".join(f"<p>{word} の段落 {i}。本文として十分な長さの文章を置いておきます。</p>" for i in range(20))
+    return f'<html><head><meta property="og:image" content="/hero.png" /></head><body><article>{body}</article></body></html>'
+
+
+def test_get_returns_stored_content_for_canonical_url_and_hash(tmp_path: Path) -> None:
+    cache = ExtractionCache(tmp_path / "x.sqlite3", max_entries=10)
+    content = ExtractedContent(text="本文", source="web", length=2, hero_image_url="https://example.com/h.png")
+    cache.put("https://example.com/a?utm_source=x", "h1", content)
+
+    assert cache.get("https://example.com/a", "h1") == content
+    assert cache.get("https://example.com/a", "h2") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+
+def test_other_variant_is_a_miss(tmp_path: Path) -> None:
+    path = tmp_path / "x.sqlite3"
+    old = ExtractionCache(path, max_entries=10, variant="v1")
+    old.put("https://example.com/a", "h1", ExtractedContent(text="t", source="web", length=1))
+    old.close()
+
+    assert ExtractionCache(path, max_entries=10, variant="v2").get("https://example.com/a", "h1") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    now = [0.0]
+
+    def clock() -> float:
+        now[0] += 1
+        return now[0]
+
+    cache = ExtractionCache(tmp_path / "x.sqlite3", max_entries=2, clock=clock)
+    for name in ("a", "b"):
+        cache.put(f"https://example.com/{name}", name, ExtractedContent(text=name, source="web", length=1))
+    cache.get("https://example.com/a", "a")
+    cache.put("https://example.com/c", "c", ExtractedContent(text="c", source="web", length=1))
+
+    assert cache.get("https://example.com/a", "a") is not None
+    assert cache.get("https://example.com/b", "b") is None
+    assert cache.stats().evicted == 1
+
+
+def test_extract_cached_skips_parsing_for_unchanged_page(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = ExtractionCache(tmp_path / "x.sqlite3", max_entries=10)
+    calls: list[str] = []
+    original = text_extractor.extract_from_html
+
+    def counting_extract(document, url: str, source: str = "web", **kwargs) -> ExtractedContent:
+        calls.append(url)
+        return original(document, url, source, **kwargs)
+
+    monkeypatch.setattr(text_extractor, "extract_from_html", counting_extract)
+    url = "https://example.com/post"
+    first = extract_cached(_page("初版"), url, "web", cache)
+    second = extract_cached(_page("初版"), url, "web", cache)
+    changed = extract_cached(_page("改訂"), url, "web", cache)
+
+    assert first == second
+    assert first.hero_image_url == "https://example.com/hero.png"
+    assert "改訂" in changed.text
+    assert calls == [url, url]
+    assert content_hash(_page("初版")) != content_hash(_page("改訂"))
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+from raindrop_digest import text_extractor
+from raindrop_digest.config import HOST_NEGATIVE_CACHE_MINUTES
+from raindrop_digest.host_memory import HostMemory
+from raindrop_digest.text_extractor import ExtractionError, fetch_html
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_host_is_negatively_cached_after_failures_in_consecutive_runs_until_ttl(tmp_path: Path) -> None:
+    clock = FakeClock()
+    path = tmp_path / "hosts.sqlite3"
+    first_run = HostMemory(path, negative_ttl_seconds=600, failure_threshold=2, clock=clock)
+
+    assert not first_run.record_failure("example.com", "status=403")
+    # 同じ実行内で何度失敗しても1回としか数えない
+    assert not first_run.record_failure("example.com", "timeout")
+    assert first_run.blocked_reason("example.com") is None
+    first_run.close()
+
+    hosts = HostMemory(path, negative_ttl_seconds=600, failure_threshold=2, clock=clock)
+    assert hosts.record_failure("example.com", "status=403")
+    assert hosts.blocked_reason("example.com") == "status=403"
+
+    clock.now += 601
+    assert hosts.blocked_reason("example.com") is None
+    hosts.record_success("example.com", "UA/1")
+    state = hosts.snapshot()["example.com"]
+    assert (state.user_agent, state.failures, state.blocked_until) == ("UA/1", 0, None)
+
+
+def test_default_negative_ttl_outlives_the_daily_schedule(tmp_path: Path) -> None:
+    clock = FakeClock()
+    path = tmp_path / "hosts.sqlite3"
+    for _ in range(2):
+        hosts = HostMemory(path, negative_ttl_seconds=HOST_NEGATIVE_CACHE_MINUTES * 60, clock=clock)
+        hosts.record_failure("example.com", "timeout")
+        hosts.close()
+        clock.now += 24 * 3600
+
+    # 翌日の実行でもまだスキップされる
+    hosts = HostMemory(path, negative_ttl_seconds=HOST_NEGATIVE_CACHE_MINUTES * 60, clock=clock)
+    assert hosts.blocked_reason("example.com") == "timeout"
+
+
+def test_fetch_starts_with_user_agent_that_last_succeeded(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("HTTP_USER_AGENT", raising=False)
+    hosts = HostMemory(tmp_path / "hosts.sqlite3", negative_ttl_seconds=600)
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers["User-Agent"])
+        if request.headers["User-Agent"] != text_extractor.DEFAULT_SECONDARY_USER_AGENT:
+            return httpx.Response(403, request=request, text="blocked")
+        return httpx.Response(200, request=request, text="<html>ok</html>")
+
+    transport = httpx.MockTransport(handler)
+    fetch_html("https://example.com/a", transport=transport, hosts=hosts)
+    fetch_html("https://example.com/b", transport=transport, hosts=hosts)
+
+    assert seen == [
+        text_extractor.DEFAULT_PRIMARY_USER_AGENT,
+        text_extractor.DEFAULT_SECONDARY_USER_AGENT,
+        text_extractor.DEFAULT_SECONDARY_USER_AGENT,
+    ]
+    assert hosts.preferred_user_agent("example.com") == text_extractor.DEFAULT_SECONDARY_USER_AGENT
+
+
+def test_blocked_host_fails_fast_with_cached_reason(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("HTTP_USER_AGENT", raising=False)
+    path = tmp_path / "hosts.sqlite3"
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/missing":
+            return httpx.Response(404, request=request, text="not found")
+        return httpx.Response(403, request=request, text="blocked")
+
+    transport = httpx.MockTransport(handler)
+    first_run = HostMemory(path, negative_ttl_seconds=600, failure_threshold=2)
+    with pytest.raises(ExtractionError):
+        fetch_html("https://example.com/missing", transport=transport, hosts=first_run)
+    for page in ("/a", "/b"):
+        with pytest.raises(ExtractionError):
+            fetch_html(f"https://example.com{page}", transport=transport, hosts=first_run)
+    first_run.close()
+
+    hosts = HostMemory(path, negative_ttl_seconds=600, failure_threshold=2)
+    with pytest.raises(ExtractionError):
+        fetch_html("https://example.com/d", transport=transport, hosts=hosts)
+    with pytest.raises(ExtractionError) as excinfo:
+        fetch_html("https://example.com/c", transport=transport, hosts=hosts)
+
+    # 404 はページ固有なので数えない。1回の実行内の 403 は何件でも1回と数え、
+    # 2回の実行で続けて失敗した時点でホストごとスキップする。
+    assert "Skipped: example.com" in str(excinfo.value)
+    assert "status=403" in str(excinfo.value)
+    assert "/b" in requests
+    assert "/c" not in requests
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+from raindrop_digest import text_extractor
+from raindrop_digest.http_cache import HttpCache
+from raindrop_digest.text_extractor import extract_text, fetch_html
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cache(tmp_path: Path, clock: FakeClock, *, max_bytes: int = 1_000, ttl_seconds: float = 3600) -> HttpCache:
+    return HttpCache(tmp_path / "http_cache.sqlite3", max_bytes=max_bytes, ttl_seconds=ttl_seconds, clock=clock)
+
+
+def test_store_and_lookup_via_request_url_alias(tmp_path: Path) -> None:
+    cache = _cache(tmp_path, FakeClock())
+    stored = cache.store(
+        "https://t.example/a", "https://example.com/final", b"<html>a</html>", "utf-8", etag='"v1"'
+    )
+
+    entry = cache.lookup("https://t.example/a")
+    assert stored
+    assert entry is not None
+    assert entry.url == "https://example.com/final"
+    assert (entry.body, entry.encoding) == (b"<html>a</html>", "utf-8")
+    assert entry.conditional_headers() == {"If-None-Match": '"v1"'}
+    assert cache.lookup("https://example.com/final") is not None
+
+
+def test_responses_without_validators_are_not_stored(tmp_path: Path) -> None:
+    cache = _cache(tmp_path, FakeClock())
+
+    assert not cache.store("https://example.com/a", "https://example.com/a", b"body", "utf-8")
+    assert cache.lookup("https://example.com/a") is None
+
+
+def test_entries_expire_after_ttl_and_persist_across_instances(tmp_path: Path) -> None:
+    clock = FakeClock()
+    cache = _cache(tmp_path, clock)
+    cache.store("https://example.com/a", "https://example.com/a", b"body", "utf-8", last_modified="Mon, 01 Jan 2024")
+    cache.close()
+
+    reopened = _cache(tmp_path, clock)
+    assert reopened.lookup("https://example.com/a") is not None
+    clock.now += 3601
+    assert reopened.lookup("https://example.com/a") is None
+
+
+def test_least_recently_used_entries_are_evicted_over_size_bound(tmp_path: Path) -> None:
+    clock = FakeClock()
+    cache = _cache(tmp_path, clock, max_bytes=250)
+    for name in ("a", "b"):
+        cache.store(f"https://example.com/{name}", f"https://example.com/{name}", b"x" * 100, "utf-8", etag=name)
+        clock.now += 1
+    cache.lookup("https://example.com/a")
+    clock.now += 1
+    cache.store("https://example.com/c", "https://example.com/c", b"x" * 100, "utf-8", etag="c")
+
+    assert cache.lookup("https://example.com/a") is not None
+    assert cache.lookup("https://example.com/b") is None
+    assert cache.lookup("https://example.com/c") is not None
+    assert cache.total_bytes() == 200
+
+
+def test_fetch_html_revalidates_and_reuses_body_on_304(tmp_path: Path) -> None:
+    cache = _cache(tmp_path, FakeClock(), max_bytes=10_000)
+    seen: list[dict[str, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(dict(request.headers))
+        if request.url.path == "/short":
+            return httpx.Response(301, request=request, headers={"Location": "https://example.com/article"})
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, request=request)
+        return httpx.Response(
+            200,
+            request=request,
+            headers={"Content-Type": "text/html; charset=utf-8", "ETag": '"v1"'},
+            content="<html>本文</html>".encode("utf-8"),
+        )
+
+    transport = httpx.MockTransport(handler)
+    first = fetch_html("https://example.com/short", transport=transport, cache=cache)
+    second = fetch_html("https://example.com/short", transport=transport, cache=cache)
+
+    assert first == second == "<html>本文</html>"
+    assert "if-none-match" not in seen[1]
+    assert seen[3]["if-none-match"] == '"v1"'
+
+
+def test_corrupt_cache_files_disable_caches_instead_of_failing_fetches(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for name in ("http_cache", "extraction_cache", "host_memory"):
+        (tmp_path / f"{name}.sqlite3").write_bytes(b"not a database" * 100)
+    body = "".join(f"<p>段落 {i}。本文として十分な長さの文章を置いておきます。</p>" for i in range(20))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, request=request, headers={"Content-Type": "text/html"}, text=f"<html><body><article>{body}</article></body></html>"
+        )
+
+    monkeypatch.setattr(text_extractor, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(text_extractor, "_shared_client", text_extractor.build_http_client(transport=httpx.MockTransport(handler)))
+    try:
+        for path in ("/a", "/b"):
+            assert "段落 0" in extract_text(f"https://example.com{path}").text
+        assert text_extractor.get_http_cache() is None
+        assert text_extractor.get_extraction_cache() is None
+        assert text_extractor.get_host_memory() is None
+    finally:
+        text_extractor.close_http_client()
+        text_extractor.close_extraction_cache()
+    assert text_extractor._unavailable_stores == set()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from raindrop_digest.link_resolver import LinkResolver, is_shortened
+from raindrop_digest.models import RaindropItem
+from raindrop_digest.orchestrator import _DuplicateGroups
+
+
+def _resolver(tmp_path: Path, handler) -> LinkResolver:
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    return LinkResolver(tmp_path / "short_links.sqlite3", ttl_seconds=3600, client=client)
+
+
+def test_resolve_many_follows_short_links_with_head_and_caches(tmp_path: Path) -> None:
+    seen: list[tuple[str, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.method, str(request.url)))
+        if request.url.host == "t.co":
+            return httpx.Response(301, headers={"Location": "https://example.com/article?utm_source=tw"})
+        return httpx.Response(200)
+
+    resolver = _resolver(tmp_path, handler)
+    first = resolver.resolve_many(["https://t.co/abc", "https://example.com/direct"])
+    second = resolver.resolve_many(["https://t.co/abc"])
+
+    assert first == {
+        "https://t.co/abc": "https://example.com/article?utm_source=tw",
+        "https://example.com/direct": "https://example.com/direct",
+    }
+    assert second == {"https://t.co/abc": "https://example.com/article?utm_source=tw"}
+    assert [method for method, _ in seen] == ["HEAD", "HEAD"]
+
+
+def test_resolve_falls_back_to_get_when_head_is_rejected_and_keeps_failures_unresolved(tmp_path: Path) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "lnkd.in":
+            raise httpx.ConnectError("down", request=request)
+        if request.url.host == "example.com":
+            return httpx.Response(200, text="<html>b</html>")
+        if request.method == "HEAD":
+            return httpx.Response(405)
+        return httpx.Response(302, headers={"Location": "https://example.com/b"})
+
+    resolver = _resolver(tmp_path, handler)
+
+    assert resolver.resolve_many(["https://bit.ly/x", "https://lnkd.in/y"]) == {
+        "https://bit.ly/x": "https://example.com/b",
+        "https://lnkd.in/y": "https://lnkd.in/y",
+    }
+
+
+def test_duplicate_groups_use_resolved_url_and_keep_the_direct_link() -> None:
+    created = datetime(2024, 12, 7, tzinfo=timezone.utc)
+    short = RaindropItem(id=1, link="https://t.co/abc", title="t", created=created, tags=[])
+    direct = RaindropItem(id=2, link="https://example.com/article", title="t", created=created, tags=[])
+    groups = _DuplicateGroups()
+
+    assert groups.add(short, "https://example.com/article?utm_source=tw") is True
+    assert groups.add(direct) is False
+
+    kept, duplicates = groups.resolve(short)
+    assert kept.id == 2
+    assert [d.id for d in duplicates] == [1]
+    assert is_shortened(short.link) and not is_shortened(direct.link)
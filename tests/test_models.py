@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from raindrop_digest.models import ExtractedContent, RaindropItem, SummaryResult
+
+
+def test_raindrop_item_parses_created_lazily():
+    item = RaindropItem(id=1, link="https://example.com", title="t", created="2024-12-07T00:00:00.000Z", tags=[])
+
+    assert item._created is None
+    assert item.created == datetime(2024, 12, 7, tzinfo=timezone.utc)
+    assert item._created_raw is None
+
+
+def test_raindrop_item_invalid_created_raises_on_access():
+    item = RaindropItem(id=1, link="https://example.com", title="t", created="yesterday", tags=[])
+
+    with pytest.raises(ValueError, match="Invalid datetime format"):
+        _ = item.created
+
+
+def test_models_are_slotted_and_compare_by_value():
+    created = datetime(2024, 12, 7, tzinfo=timezone.utc)
+    a = RaindropItem(id=1, link="https://example.com", title="t", created=created, tags=[])
+    b = RaindropItem(id=1, link="https://example.com", title="t", created="2024-12-07T00:00:00Z", tags=[])
+
+    assert a == b
+    assert not hasattr(a, "__dict__")
+    assert SummaryResult(item=a, status="success") == SummaryResult(item=b, status="success")
+    assert "RaindropItem(id=1" in repr(a)
+
+
+def test_extracted_content_release_text_keeps_length():
+    content = ExtractedContent(text="本文", source="web", length=2)
+
+    content.release_text()
+
+    assert content.text == ""
+    assert content.length == 2
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import threading
+from datetime import timedelta
+from pathlib import Path
+from typing import List
+
+import httpx
+import pytest
+
+from raindrop_digest import orchestrator
+from raindrop_digest.config import Settings
+from raindrop_digest.models import ExtractedContent, RaindropItem
+from raindrop_digest.raindrop_client import RaindropClient
+from raindrop_digest.state_store import SyncStateStore
+from raindrop_digest.summarizer import Summarizer
+from raindrop_digest.utils import utc_now
+
+
+class FakeRaindrop:
+    pages: List[List[RaindropItem]] = []
+
+    def __init__(self, token: str):
+        pass
+
+    def iter_collections_pages(self, collection_ids, **kwargs):
+        yield from self.pages
+
+    def incomplete_listings(self):
+        return set()
+
+    def rate_limit_stats(self):
+        return type("stats", (), {"requests": 0, "throttled_seconds": 0.0, "throttle_count": 0, "rate_limited_responses": 0})
+
+    def close(self) -> None:
+        pass
+
+
+class FakeOpenAI:
+    def __init__(self, texts: List[str]):
+        outer_texts = texts
+
+        class Completions:
+            def create(self, model, messages, temperature):
+                text = messages[1]["content"]
+                outer_texts.append(text)
+                FakeSummarizer.on_request(text)
+                message = type("msg", (), {"content": f"summary:{text}"})
+                return type("resp", (), {"choices": [type("choice", (), {"message": message})]})
+
+        self.chat = type("chat", (), {"completions": Completions()})()
+
+
+class FakeSummarizer(Summarizer):
+    texts: List[str] = []
+    on_request = staticmethod(lambda text: None)
+
+    def __init__(self, **kwargs):
+        super().__init__(client=FakeOpenAI(FakeSummarizer.texts), **kwargs)
+
+
+class FakeMailer:
+    provider = "fake"
+
+    def __init__(self):
+        self.sent: List[str] = []
+
+    def send(self, subject, text_body, html_body=None):
+        self.sent.append(subject)
+
+
+def _item(item_id: int, hours_ago: float) -> RaindropItem:
+    return RaindropItem(
+        id=item_id,
+        link=f"https://example.com/{item_id}",
+        title=f"t{item_id}",
+        created=utc_now() - timedelta(hours=hours_ago),
+        tags=[],
+    )
+
+
+@pytest.fixture
+def harness(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    mailer = FakeMailer()
+    FakeSummarizer.texts = []
+    FakeSummarizer.on_request = staticmethod(lambda text: None)
+    monkeypatch.setattr(orchestrator, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(orchestrator, "RaindropClient", FakeRaindrop)
+    monkeypatch.setattr(orchestrator, "Summarizer", FakeSummarizer)
+    monkeypatch.setattr(orchestrator, "build_mailer", lambda **_: mailer)
+    monkeypatch.setattr(orchestrator, "apply_writeback", lambda raindrop, results, max_workers: set())
+    monkeypatch.setattr(orchestrator, "SUMMARY_CACHE_MAX_ENTRIES", 0)
+    monkeypatch.setattr(
+        orchestrator,
+        "extract_text",
+        lambda url: ExtractedContent(text=f"body of {url}", source="web", length=len(url) + 8),
+    )
+    settings = Settings(
+        raindrop_token="r",
+        openai_api_key="o",
+        sendgrid_api_key=None,
+        brevo_api_key="b",
+        to_email="to@example.com",
+        from_email="from@example.com",
+        from_name="digest",
+    )
+    return settings, mailer, tmp_path
+
+
+def test_run_skips_items_before_cursor_and_already_processed(harness) -> None:
+    settings, mailer, cache_dir = harness
+    processed = _item(1, hours_ago=3)
+    state = SyncStateStore(cache_dir / "sync_state.sqlite3")
+    state.record_run(processed=[processed], unprocessed=[], processed_at=utc_now())
+    state.close()
+    newer = _item(3, hours_ago=1)
+    FakeRaindrop.pages = [[newer, processed, _item(2, hours_ago=5)]]
+
+    results = orchestrator.run(settings, collection_ids=[0])
+
+    assert [r.item.id for r in results] == [3]
+    assert results[0].summary == "summary:body of https://example.com/3"
+    assert FakeSummarizer.texts == ["body of https://example.com/3"]
+    assert len(mailer.sent) == 1
+    state = SyncStateStore(cache_dir / "sync_state.sqlite3")
+    # カーソルが新しい項目まで進み、それより古い処理済み id は捨てられる
+    assert state.created_cursor() == newer.created
+    assert state.processed_ids() == {3}
+    state.close()
+
+
+def test_run_continues_without_state_when_cache_files_are_corrupt(harness) -> None:
+    settings, mailer, cache_dir = harness
+    (cache_dir / "sync_state.sqlite3").write_bytes(b"not a database" * 100)
+    (cache_dir / "short_links.sqlite3").write_bytes(b"not a database" * 100)
+    FakeRaindrop.pages = [[_item(1, hours_ago=1), _item(2, hours_ago=2)]]
+
+    results = orchestrator.run(settings, collection_ids=[0])
+
+    assert sorted(r.item.id for r in results) == [1, 2]
+    assert all(r.is_success() for r in results)
+    assert len(mailer.sent) == 1
+
+
+def test_run_summarizes_items_as_their_extraction_finishes(harness, monkeypatch: pytest.MonkeyPatch) -> None:
+    settings, _mailer, _cache_dir = harness
+    second_summarized = threading.Event()
+    FakeSummarizer.on_request = staticmethod(
+        lambda text: second_summarized.set() if text.endswith("/2") else None
+    )
+
+    def extract(url: str) -> ExtractedContent:
+        if url.endswith("/1"):
+            # 1件目の抽出が終わる前に、2件目の要約が始まっていること
+            assert second_summarized.wait(timeout=5)
+        return ExtractedContent(text=f"body of {url}", source="web", length=len(url) + 8)
+
+    monkeypatch.setattr(orchestrator, "extract_text", extract)
+    FakeRaindrop.pages = [[_item(1, hours_ago=1), _item(2, hours_ago=2)]]
+
+    results = orchestrator.run(settings, collection_ids=[0])
+
+    assert [r.item.id for r in results] == [1, 2]
+    assert all(r.is_success() for r in results)
+    assert FakeSummarizer.texts == ["body of https://example.com/2", "body of https://example.com/1"]
+
+
+def test_run_keeps_cursor_when_a_middle_page_could_not_be_listed(harness, monkeypatch: pytest.MonkeyPatch) -> None:
+    settings, _mailer, cache_dir = harness
+    base = utc_now()
+    raw_items = [
+        {
+            "_id": idx,
+            "link": f"https://example.com/{idx}",
+            "title": f"t{idx}",
+            "created": (base - timedelta(minutes=idx)).isoformat(),
+            "tags": [],
+        }
+        for idx in range(120)
+    ]
+    failing_pages = {1}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        perpage = int(request.url.params["perpage"])
+        if page in failing_pages:
+            return httpx.Response(503)
+        chunk = raw_items[page * perpage : (page + 1) * perpage]
+        return httpx.Response(200, json={"result": True, "items": chunk, "count": len(raw_items)})
+
+    monkeypatch.setattr(
+        orchestrator, "RaindropClient", lambda token: RaindropClient(token, transport=httpx.MockTransport(handler))
+    )
+
+    first = orchestrator.run(settings, collection_ids=[0])
+
+    assert sorted(r.item.id for r in first) == list(range(50))
+    state = SyncStateStore(cache_dir / "sync_state.sqlite3")
+    assert state.created_cursor() is None
+    state.close()
+
+    # 次の実行では読めなかったページの項目も対象になる
+    failing_pages.clear()
+    second = orchestrator.run(settings, collection_ids=[0])
+
+    assert {r.item.id for r in second} >= set(range(50, 100))
+    state = SyncStateStore(cache_dir / "sync_state.sqlite3")
+    assert state.created_cursor() is not None
+    state.close()
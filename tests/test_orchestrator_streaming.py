@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timezone
+
+import httpx
+
+from raindrop_digest.models import RaindropItem
+from raindrop_digest.orchestrator import _DuplicateGroups
+from raindrop_digest.raindrop_client import RaindropClient
+
+
+def _item(item_id: int, link: str) -> RaindropItem:
+    return RaindropItem(
+        id=item_id,
+        link=link,
+        title="t",
+        created=datetime(2024, 12, 7, tzinfo=timezone.utc),
+        tags=[],
+    )
+
+
+def test_duplicate_groups_processes_first_and_keeps_preferred():
+    groups = _DuplicateGroups()
+    first = _item(1, "https://example.com/a?utm_source=x")
+    other = _item(2, "https://example.com/b")
+    preferred = _item(3, "https://example.com/a")
+
+    assert groups.add(first) is True
+    assert groups.add(other) is True
+    assert groups.add(preferred) is False
+
+    kept, duplicates = groups.resolve(first)
+    assert kept.id == 3
+    assert [d.id for d in duplicates] == [1]
+    assert groups.resolve(other) == (other, [])
+
+
+def test_iter_unsorted_pages_yields_first_page_while_next_is_in_flight():
+    release = threading.Event()
+    requested: list[int] = []
+    completed_late_pages: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        requested.append(page)
+        if page > 0:
+            release.wait(timeout=5)
+            completed_late_pages.append(page)
+        items = [
+            {"_id": page * 2 + i, "link": f"https://example.com/{page}/{i}", "created": "2024-12-07T00:00:00Z"}
+            for i in range(2)
+        ]
+        return httpx.Response(200, json={"result": True, "items": items, "count": 4})
+
+    client = RaindropClient(token="t", transport=httpx.MockTransport(handler))
+    pages = client.iter_unsorted_pages(perpage=2)
+
+    first = next(pages)
+    assert [item.id for item in first] == [0, 1]
+    assert completed_late_pages == []
+    release.set()
+
+    rest = list(pages)
+    assert [[item.id for item in page] for page in rest] == [[2, 3]]
+    assert requested == [0, 1]
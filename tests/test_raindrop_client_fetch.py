@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from raindrop_digest.raindrop_client import RaindropApiError, RaindropClient, build_search_query
+
+JST = timezone(timedelta(hours=9))
+
+
+def _raw_item(idx: int) -> dict:
+    return {
+        "_id": idx,
+        "link": f"https://example.com/{idx}",
+        "title": f"title {idx}",
+        "created": f"2024-12-07T00:{idx // 60:02d}:{idx % 60:02d}Z",
+        "tags": [],
+    }
+
+
+def _collection_handler(total: int, seen_pages: list[int]):
+    # -created 順を模すため、id が大きいほど新しい扱いにする。
+    all_items = [_raw_item(idx) for idx in reversed(range(total))]
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        perpage = int(request.url.params["perpage"])
+        with lock:
+            seen_pages.append(page)
+        chunk = all_items[page * perpage : (page + 1) * perpage]
+        return httpx.Response(200, json={"result": True, "items": chunk, "count": total})
+
+    return handler
+
+
+def test_fetch_unsorted_items_concurrent_matches_sequential_order() -> None:
+    sequential_pages: list[int] = []
+    concurrent_pages: list[int] = []
+    sequential = RaindropClient(
+        token="t", transport=httpx.MockTransport(_collection_handler(23, sequential_pages))
+    )
+    concurrent = RaindropClient(
+        token="t", transport=httpx.MockTransport(_collection_handler(23, concurrent_pages))
+    )
+
+    expected = sequential.fetch_unsorted_items(perpage=5)
+    actual = concurrent.fetch_unsorted_items(perpage=5, concurrency=4)
+
+    assert [item.id for item in actual] == [item.id for item in expected]
+    assert len(actual) == 23
+    assert sorted(concurrent_pages) == [0, 1, 2, 3, 4]
+
+
+def test_fetch_unsorted_items_concurrent_respects_max_pages() -> None:
+    seen_pages: list[int] = []
+    client = RaindropClient(token="t", transport=httpx.MockTransport(_collection_handler(100, seen_pages)))
+
+    items = client.fetch_unsorted_items(perpage=10, max_pages=3, concurrency=4)
+
+    assert len(items) == 30
+    assert sorted(seen_pages) == [0, 1, 2]
+
+
+def test_fetch_unsorted_items_concurrent_single_page_skips_fan_out() -> None:
+    seen_pages: list[int] = []
+    client = RaindropClient(token="t", transport=httpx.MockTransport(_collection_handler(3, seen_pages)))
+
+    items = client.fetch_unsorted_items(perpage=10, concurrency=4)
+
+    assert [item.id for item in items] == [2, 1, 0]
+    assert seen_pages == [0]
+
+
+def test_build_search_query_widens_date_and_excludes_tags() -> None:
+    since = datetime(2024, 12, 7, 9, 0, tzinfo=JST)  # 2024-12-07T00:00Z
+
+    query = build_search_query(since, ["配信済み", "確認済み"])
+
+    assert query == "created:>2024-12-06 -#確認済み -#配信済み"
+    assert build_search_query(None) is None
+
+
+def test_fetch_unsorted_items_sends_search_and_stops_after_threshold() -> None:
+    # 1 分刻みで古くなる 100 件。閾値は先頭から 12 件目付近。
+    newest = datetime(2024, 12, 7, 12, 0, tzinfo=timezone.utc)
+    all_items = [
+        {
+            "_id": idx,
+            "link": f"https://example.com/{idx}",
+            "title": "t",
+            "created": (newest - timedelta(minutes=idx)).isoformat(),
+            "tags": [],
+        }
+        for idx in range(100)
+    ]
+    seen: list[tuple[int, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        seen.append((page, request.url.params.get("search", "")))
+        chunk = all_items[page * 5 : (page + 1) * 5]
+        return httpx.Response(200, json={"result": True, "items": chunk, "count": len(all_items)})
+
+    client = RaindropClient(token="t", transport=httpx.MockTransport(handler))
+    since = newest - timedelta(minutes=12)
+
+    items = client.fetch_unsorted_items(perpage=5, created_since=since, exclude_tags=["配信済み"])
+
+    assert [page for page, _ in seen] == [0, 1, 2]
+    assert all("-#配信済み" in search and "created:>" in search for _, search in seen)
+    assert len(items) == 15
+
+
+def test_iter_collections_pages_lists_each_collection_and_tags_origin() -> None:
+    seen_paths: list[str] = []
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        with lock:
+            seen_paths.append(request.url.path)
+        collection_id = int(request.url.path.rsplit("/", 1)[-1])
+        items = [
+            {"_id": collection_id * 10 + i, "link": f"https://example.com/{collection_id}/{i}", "created": "2024-12-07T00:00:00Z"}
+            for i in range(2)
+        ]
+        return httpx.Response(200, json={"result": True, "items": items, "count": 2})
+
+    client = RaindropClient(token="t", transport=httpx.MockTransport(handler))
+    items = [item for page in client.iter_collections_pages([-1, 5, 7], perpage=10) for item in page]
+
+    assert sorted(seen_paths) == ["/rest/v1/raindrops/-1", "/rest/v1/raindrops/5", "/rest/v1/raindrops/7"]
+    assert {(item.id, item.collection_id) for item in items} == {
+        (-10, -1),
+        (-9, -1),
+        (50, 5),
+        (51, 5),
+        (70, 7),
+        (71, 7),
+    }
+
+
+def test_iter_collections_pages_propagates_errors() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/5"):
+            return httpx.Response(401, json={"result": False})
+        return httpx.Response(200, json={"result": True, "items": [], "count": 0})
+
+    client = RaindropClient(token="t", transport=httpx.MockTransport(handler))
+    with pytest.raises(RaindropApiError):
+        list(client.iter_collections_pages([-1, 5]))
+
+
+def test_iter_pages_reports_skipped_page_and_max_pages_cap_as_incomplete() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params["page"] == "1":
+            return httpx.Response(503)
+        return _collection_handler(30, [])(request)
+
+    client = RaindropClient(token="t", transport=httpx.MockTransport(handler))
+    assert len(client.fetch_unsorted_items(perpage=10)) == 10
+    assert client.incomplete_listings() == {-1}
+
+    client = RaindropClient(token="t", transport=httpx.MockTransport(_collection_handler(30, [])))
+    assert len(client.fetch_unsorted_items(perpage=10, max_pages=2)) == 20
+    assert client.incomplete_listings() == {-1}
+
+    assert len(client.fetch_unsorted_items(perpage=10)) == 30
+    assert client.incomplete_listings() == set()
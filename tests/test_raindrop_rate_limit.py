@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import httpx
+
+from raindrop_digest.raindrop_client import RaindropClient, RateLimitScheduler
+
+
+class FakeClock:
+    def __init__(self, start: float = 1_000.0):
+        self.now = start
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _scheduler(clock: FakeClock, limit: int = 120) -> RateLimitScheduler:
+    return RateLimitScheduler(limit=limit, clock=clock, wall_clock=clock, sleep=clock.sleep)
+
+
+def test_scheduler_paces_when_bucket_is_empty():
+    clock = FakeClock()
+    scheduler = _scheduler(clock, limit=2)
+
+    for _ in range(3):
+        scheduler.acquire()
+
+    # 2 リクエスト/分 → 1 トークン回復に 30 秒
+    assert clock.sleeps == [30.0]
+    stats = scheduler.stats()
+    assert stats.requests == 3
+    assert stats.throttled_seconds == 30.0
+
+
+def test_scheduler_waits_for_reset_when_remaining_is_zero():
+    clock = FakeClock()
+    scheduler = _scheduler(clock)
+    response = httpx.Response(
+        200,
+        headers={"X-RateLimit-Limit": "120", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(clock.now) + 12)},
+    )
+
+    scheduler.observe(response)
+    scheduler.acquire()
+
+    assert clock.sleeps == [12.0]
+
+
+def test_client_sleeps_until_reset_on_429_and_retries():
+    clock = FakeClock()
+    calls: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"X-RateLimit-Reset": str(int(clock.now) + 20)})
+        return httpx.Response(200, json={"result": True, "items": []})
+
+    client = RaindropClient(token="t", transport=httpx.MockTransport(handler), scheduler=_scheduler(clock))
+    items = client.fetch_unsorted_items()
+
+    assert items == []
+    assert len(calls) == 2
+    assert clock.sleeps == [20.0]
+    stats = client.rate_limit_stats()
+    assert stats.rate_limited_responses == 1
+    assert stats.throttled_seconds == 20.0
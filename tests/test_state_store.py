@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from raindrop_digest.models import RaindropItem
+from raindrop_digest.state_store import SyncStateStore
+
+NOW = datetime(2024, 12, 7, 12, 0, tzinfo=timezone.utc)
+
+
+def _item(item_id: int, minutes_ago: int) -> RaindropItem:
+    return RaindropItem(
+        id=item_id,
+        link=f"https://example.com/{item_id}",
+        title="t",
+        created=NOW - timedelta(minutes=minutes_ago),
+        tags=[],
+    )
+
+
+def test_state_survives_reopen(tmp_path):
+    path = tmp_path / "state" / "sync.sqlite3"
+    store = SyncStateStore(path)
+    store.record_run(processed=[_item(1, 30), _item(2, 10)], unprocessed=[], processed_at=NOW)
+    store.close()
+
+    reopened = SyncStateStore(path)
+    assert reopened.created_cursor() == NOW - timedelta(minutes=10)
+    assert reopened.processed_ids() == {2}
+    reopened.close()
+
+
+def test_cursor_does_not_pass_items_that_need_retry(tmp_path):
+    store = SyncStateStore(tmp_path / "sync.sqlite3")
+
+    cursor = store.record_run(
+        processed=[_item(1, 30), _item(3, 5)],
+        unprocessed=[_item(2, 20)],
+        processed_at=NOW,
+    )
+
+    assert cursor == NOW - timedelta(minutes=20)
+    assert store.processed_ids() == {3}
+
+
+def test_cursor_never_moves_backwards(tmp_path):
+    store = SyncStateStore(tmp_path / "sync.sqlite3")
+    store.record_run(processed=[_item(1, 5)], unprocessed=[], processed_at=NOW)
+
+    cursor = store.record_run(processed=[_item(2, 60)], unprocessed=[], processed_at=NOW)
+
+    assert cursor == NOW - timedelta(minutes=5)
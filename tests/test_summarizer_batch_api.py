@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import json
+from typing import Dict, List, Optional
+
+import httpx
+import openai
+
+from raindrop_digest.summarizer import Summarizer
+
+
+def _chat_completion(content: str) -> dict:
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4.1-mini",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+    }
+
+
+class StandInServer:
+    """Minimal stand-in for the OpenAI files/batches/chat endpoints."""
+
+    def __init__(
+        self,
+        *,
+        finish_after_polls: Optional[int] = 1,
+        answer: Optional[List[int]] = None,
+        fail_upload: bool = False,
+        cancelling_polls: int = 2,
+    ):
+        self.fail_upload = fail_upload
+        self.cancelling_polls = cancelling_polls
+        self.finish_after_polls = finish_after_polls
+        self.answer = answer
+        self.requests: List[dict] = []
+        self.polls = 0
+        self.cancelled = False
+        self.chat_calls: List[str] = []
+        self.files: Dict[str, str] = {}
+
+    def client(self) -> openai.OpenAI:
+        http_client = httpx.Client(transport=httpx.MockTransport(self.handle))
+        return openai.OpenAI(api_key="dummy", base_url="https://stand-in.test/v1", http_client=http_client, max_retries=0)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == "POST" and path == "/v1/files":
+            if self.fail_upload:
+                return httpx.Response(400, json={"error": {"message": "batch API not enabled"}})
+            body = request.read().decode("utf-8")
+            self.requests = [json.loads(line) for line in body.splitlines() if line.startswith('{"custom_id"')]
+            return httpx.Response(200, json=self._file("file-in"))
+        if request.method == "POST" and path == "/v1/batches":
+            assert json.loads(request.content)["input_file_id"] == "file-in"
+            return httpx.Response(200, json=self._batch("validating"))
+        if request.method == "GET" and path == "/v1/batches/batch_1":
+            if self.cancelled:
+                # 実 API と同じく、キャンセル直後はしばらく cancelling のまま出力ファイルもない
+                self.cancelling_polls -= 1
+                return httpx.Response(200, json=self._batch("cancelling" if self.cancelling_polls >= 0 else "cancelled"))
+            self.polls += 1
+            done = self.finish_after_polls is not None and self.polls >= self.finish_after_polls
+            return httpx.Response(200, json=self._batch("completed" if done else "in_progress"))
+        if request.method == "POST" and path == "/v1/batches/batch_1/cancel":
+            self.cancelled = True
+            return httpx.Response(200, json=self._batch("cancelling"))
+        if request.method == "GET" and path == "/v1/files/file-out/content":
+            return httpx.Response(200, content=self._output().encode("utf-8"))
+        if request.method == "POST" and path == "/v1/chat/completions":
+            text = json.loads(request.content)["messages"][1]["content"]
+            self.chat_calls.append(text)
+            return httpx.Response(200, json=_chat_completion(f"sync:{text}"))
+        return httpx.Response(404, json={"error": {"message": f"unexpected {request.method} {path}"}})
+
+    def _file(self, file_id: str) -> dict:
+        return {"id": file_id, "object": "file", "bytes": 1, "created_at": 0, "filename": "f.jsonl", "purpose": "batch", "status": "processed"}
+
+    def _batch(self, status: str) -> dict:
+        has_output = status in {"completed", "cancelled"} and self.answer != []
+        return {
+            "id": "batch_1",
+            "object": "batch",
+            "endpoint": "/v1/chat/completions",
+            "input_file_id": "file-in",
+            "completion_window": "24h",
+            "created_at": 0,
+            "status": status,
+            "output_file_id": "file-out" if has_output else None,
+        }
+
+    def _output(self) -> str:
+        lines = []
+        for request in self.requests:
+            idx = int(request["custom_id"])
+            if self.answer is not None and idx not in self.answer:
+                continue
+            text = request["body"]["messages"][1]["content"]
+            lines.append(
+                json.dumps(
+                    {
+                        "id": f"req-{idx}",
+                        "custom_id": request["custom_id"],
+                        "response": {"status_code": 200, "body": _chat_completion(f"batch:{text}")},
+                        "error": None,
+                    }
+                )
+            )
+        return "\n".join(lines)
+
+
+def _summarizer(server: StandInServer) -> Summarizer:
+    return Summarizer(api_key="dummy", model="gpt-4.1-mini", client=server.client(), system_prompt="要約して")
+
+
+def test_batch_results_are_mapped_back_in_input_order():
+    server = StandInServer(finish_after_polls=2)
+    summarizer = _summarizer(server)
+
+    outcomes = summarizer.summarize_batch(["a", "b", "c"], deadline_seconds=60, sleep=lambda _: None)
+
+    assert [o.summary for o in outcomes] == ["batch:a", "batch:b", "batch:c"]
+    assert [r["body"]["messages"][0]["content"] for r in server.requests] == ["要約して"] * 3
+    assert server.chat_calls == []
+
+
+def test_unfinished_batch_is_cancelled_and_missing_items_fall_back_to_sync():
+    now = [0.0]
+
+    def sleep(seconds: float) -> None:
+        now[0] += seconds
+
+    server = StandInServer(finish_after_polls=None, answer=[1])
+    summarizer = _summarizer(server)
+
+    outcomes = summarizer.summarize_batch(
+        ["a", "b", "c"], deadline_seconds=90, poll_interval_seconds=30, clock=lambda: now[0], sleep=sleep
+    )
+
+    assert server.cancelled
+    assert server.cancelling_polls < 0
+    assert [o.summary for o in outcomes] == ["sync:a", "batch:b", "sync:c"]
+    assert sorted(server.chat_calls) == ["a", "c"]
+
+
+def test_batch_stuck_in_cancelling_falls_back_after_grace_period():
+    now = [0.0]
+
+    def sleep(seconds: float) -> None:
+        now[0] += seconds
+
+    server = StandInServer(finish_after_polls=None, answer=[1], cancelling_polls=100)
+    summarizer = _summarizer(server)
+
+    outcomes = summarizer.summarize_batch(
+        ["a", "b"],
+        deadline_seconds=60,
+        poll_interval_seconds=30,
+        cancel_grace_seconds=120,
+        clock=lambda: now[0],
+        sleep=sleep,
+    )
+
+    assert [o.summary for o in outcomes] == ["sync:a", "sync:b"]
+    assert now[0] == 180
+
+
+def test_batch_submission_failure_falls_back_to_sync():
+    server = StandInServer(fail_upload=True)
+    summarizer = _summarizer(server)
+
+    outcomes = summarizer.summarize_batch(["a", "b"], deadline_seconds=60, sleep=lambda _: None)
+
+    assert [o.summary for o in outcomes] == ["sync:a", "sync:b"]
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional
+
+import httpx
+import openai
+
+from raindrop_digest.summarizer import AdaptiveConcurrency, Summarizer, SummaryRateLimitError
+
+
+def _response(content: str):
+    class Choice:
+        def __init__(self):
+            self.message = type("msg", (), {"content": content})
+
+    class Response:
+        def __init__(self):
+            self.choices = [Choice()]
+
+    return Response()
+
+
+def _rate_limit_error(headers: Optional[Dict[str, str]] = None, code: Optional[str] = None) -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers or {}, request=request)
+    body = {"code": code} if code else None
+    return openai.RateLimitError("rate limited", response=response, body=body)
+
+
+class RawResponse:
+    def __init__(self, headers: Dict[str, str], parsed):
+        self.headers = headers
+        self._parsed = parsed
+
+    def parse(self):
+        return self._parsed
+
+
+class ScriptedOpenAI:
+    """Fake client whose raw responses carry rate-limit headers; `failures` maps text -> errors to raise first."""
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, failures: Optional[Dict[str, List[Exception]]] = None):
+        self.headers = headers or {}
+        self.failures = failures or {}
+        self.calls: List[str] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        outer = self
+
+        class RawCompletions:
+            def create(self, model, messages, temperature):
+                return RawResponse(outer.headers, outer._complete(messages[1]["content"]))
+
+        class Completions:
+            with_raw_response = RawCompletions()
+
+            def create(self, model, messages, temperature):
+                return outer._complete(messages[1]["content"])
+
+        self.chat = type("chat", (), {"completions": Completions()})()
+
+    def _complete(self, text: str):
+        with self._lock:
+            self.calls.append(text)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            pending = self.failures.get(text)
+            error = pending.pop(0) if pending else None
+        try:
+            # 呼び出しが重なるよう少しだけ待つ
+            time.sleep(0.01)
+            if error is not None:
+                raise error
+            return _response(f"summary:{text}")
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_summarize_many_keeps_input_order_and_runs_concurrently():
+    client = ScriptedOpenAI()
+    summarizer = Summarizer(api_key="dummy", client=client, max_concurrency=4)
+
+    texts = [f"t{i}" for i in range(8)]
+    outcomes = summarizer.summarize_many(texts)
+
+    assert [o.summary for o in outcomes] == [f"summary:t{i}" for i in range(8)]
+    assert all(o.is_success() for o in outcomes)
+    assert 1 < client.max_active <= 4
+
+
+def test_summarize_many_backs_off_on_429_and_retries():
+    client = ScriptedOpenAI(failures={"b": [_rate_limit_error({"retry-after-ms": "10"})]})
+    summarizer = Summarizer(api_key="dummy", client=client, max_concurrency=4)
+    limiter = AdaptiveConcurrency(4)
+
+    outcomes = summarizer.summarize_many(["a", "b", "c"], limiter=limiter)
+
+    assert [o.summary for o in outcomes] == ["summary:a", "summary:b", "summary:c"]
+    assert client.calls.count("b") == 2
+
+
+def test_summarize_many_does_not_retry_exhausted_quota():
+    client = ScriptedOpenAI(failures={"b": [_rate_limit_error(code="insufficient_quota")]})
+    summarizer = Summarizer(api_key="dummy", client=client)
+
+    outcomes = summarizer.summarize_many(["a", "b"])
+
+    assert outcomes[0].summary == "summary:a"
+    assert isinstance(outcomes[1].error, SummaryRateLimitError)
+    assert client.calls.count("b") == 1
+
+
+def test_summarize_many_follows_remaining_request_headers():
+    client = ScriptedOpenAI(headers={"x-ratelimit-remaining-requests": "1", "x-ratelimit-remaining-tokens": "900000"})
+    summarizer = Summarizer(api_key="dummy", client=client, max_concurrency=4)
+    limiter = AdaptiveConcurrency(4)
+
+    outcomes = summarizer.summarize_many([f"t{i}" for i in range(6)], limiter=limiter)
+
+    assert all(o.is_success() for o in outcomes)
+    assert limiter.limit == 1
+
+
+def test_adaptive_concurrency_halves_on_rate_limit_and_recovers():
+    now = [100.0]
+    limiter = AdaptiveConcurrency(8, clock=lambda: now[0])
+
+    assert limiter.on_rate_limited(retry_after=None, attempt=1) == 4.0
+    assert limiter.limit == 4
+    limiter.on_rate_limited(retry_after=0.5, attempt=0)
+    assert limiter.limit == 2
+
+    limiter.observe_headers({"x-ratelimit-remaining-requests": "50"})
+    assert limiter.limit == 3
+    limiter.observe_headers({"x-ratelimit-remaining-tokens": "100", "x-ratelimit-reset-tokens": "6m0s"})
+    assert limiter.limit == 1
+
+
+def test_asummarize_many_awaits_results():
+    client = ScriptedOpenAI()
+    summarizer = Summarizer(api_key="dummy", client=client)
+
+    outcomes = asyncio.run(summarizer.asummarize_many(["x", "y"]))
+
+    assert [o.summary for o in outcomes] == ["summary:x", "summary:y"]
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+from raindrop_digest.summarizer import Summarizer
+from raindrop_digest.summary_cache import SummaryCache
+
+
+def _response(content: str):
+    message = type("msg", (), {"content": content})
+    return type("resp", (), {"choices": [type("choice", (), {"message": message})]})
+
+
+class PackingOpenAI:
+    """Answers packed requests with JSON (or `packed_reply` when set) and single requests with plain text."""
+
+    def __init__(self, packed_reply: Optional[str] = None):
+        self.packed_reply = packed_reply
+        self.packed_calls: List[List[str]] = []
+        self.single_calls: List[str] = []
+        self._lock = threading.Lock()
+        outer = self
+
+        class Completions:
+            def create(self, model, messages, temperature, response_format=None):
+                user = messages[1]["content"]
+                with outer._lock:
+                    if response_format is None:
+                        outer.single_calls.append(user)
+                        return _response(f"single:{user}")
+                    articles = re.split(r"^### Article \d+\n", user, flags=re.MULTILINE)[1:]
+                    articles = [article.strip() for article in articles]
+                    outer.packed_calls.append(articles)
+                assert response_format == {"type": "json_object"}
+                assert "### Article <id>" in messages[0]["content"]
+                if outer.packed_reply is not None:
+                    return _response(outer.packed_reply)
+                summaries = [{"id": idx, "summary": f"packed:{text}"} for idx, text in enumerate(articles)]
+                return _response(json.dumps({"summaries": summaries[::-1]}))
+
+        self.chat = type("chat", (), {"completions": Completions()})()
+
+
+def test_short_texts_share_a_request_and_long_ones_go_alone():
+    client = PackingOpenAI()
+    summarizer = Summarizer(api_key="dummy", client=client)
+    long_text = "長" * 50
+
+    outcomes = summarizer.summarize_packed(["a", long_text, "b", "c"], max_tokens=1000, short_chars=20)
+
+    assert [o.summary for o in outcomes] == ["packed:a", f"single:{long_text}", "packed:b", "packed:c"]
+    assert client.packed_calls == [["a", "b", "c"]]
+    assert client.single_calls == [long_text]
+
+
+def test_packs_are_split_by_token_budget():
+    client = PackingOpenAI()
+    summarizer = Summarizer(api_key="dummy", client=client)
+    texts = ["x" * 40 for _ in range(5)]
+
+    outcomes = summarizer.summarize_packed(texts, max_tokens=60, short_chars=1000)
+
+    # 40 文字 ≒ 10 トークン + 見出しの 20 トークンなので 2 件ずつ。余った 1 件は単独で要約する
+    assert [o.summary.split(":")[0] for o in outcomes] == ["packed"] * 4 + ["single"]
+    assert sorted(len(call) for call in client.packed_calls) == [2, 2]
+    assert len(client.single_calls) == 1
+
+
+def test_unparseable_packed_response_falls_back_to_single_requests():
+    client = PackingOpenAI(packed_reply='{"summaries": [{"id": 0, "summary": "only one"}]}')
+    summarizer = Summarizer(api_key="dummy", client=client)
+
+    outcomes = summarizer.summarize_packed(["a", "b"], max_tokens=1000)
+
+    assert [o.summary for o in outcomes] == ["single:a", "single:b"]
+    assert sorted(client.single_calls) == ["a", "b"]
+
+
+def test_packed_summaries_are_cached_apart_from_single_ones(tmp_path: Path):
+    cache = SummaryCache(tmp_path / "summaries.sqlite3", ttl_seconds=3600, max_entries=100)
+    client = PackingOpenAI()
+    summarizer = Summarizer(api_key="dummy", client=client, cache=cache)
+    summarizer.summarize_packed(["a", "b"], max_tokens=1000)
+
+    # まとめて要約した結果を単独の要約として返さない
+    assert summarizer.summarize("a") == "single:a"
+    assert [o.summary for o in summarizer.summarize_packed(["a", "b"], max_tokens=1000)] == ["packed:a", "packed:b"]
+    assert client.packed_calls == [["a", "b"]]
+    assert client.single_calls == ["a"]
+
+
+def test_short_text_summarized_alone_is_served_from_cache_in_pack_mode(tmp_path: Path):
+    cache = SummaryCache(tmp_path / "summaries.sqlite3", ttl_seconds=3600, max_entries=100)
+    client = PackingOpenAI()
+    summarizer = Summarizer(api_key="dummy", client=client, cache=cache)
+
+    first = summarizer.summarize_packed(["only"], max_tokens=1000)
+    second = summarizer.summarize_packed(["only"], max_tokens=1000)
+
+    assert [o.summary for o in first] == [o.summary for o in second] == ["single:only"]
+    assert client.single_calls == ["only"]
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 1)
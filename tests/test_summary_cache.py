@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+from raindrop_digest.summarizer import Summarizer
+from raindrop_digest.summary_cache import SummaryCache, summary_key
+
+
+class CountingOpenAI:
+    def __init__(self):
+        self.calls: List[str] = []
+        outer = self
+
+        class Completions:
+            def create(self, model, messages, temperature):
+                outer.calls.append(messages[1]["content"])
+                message = type("msg", (), {"content": f"summary:{messages[1]['content']}"})
+                return type("resp", (), {"choices": [type("choice", (), {"message": message})]})
+
+        self.chat = type("chat", (), {"completions": Completions()})()
+
+
+def _cache(path: Path, **kwargs) -> SummaryCache:
+    kwargs.setdefault("ttl_seconds", 3600)
+    kwargs.setdefault("max_entries", 100)
+    return SummaryCache(path, **kwargs)
+
+
+def test_key_depends_on_model_prompt_and_text() -> None:
+    base = summary_key("gpt-4.1-mini", "prompt", "text")
+
+    assert base == summary_key("gpt-4.1-mini", "prompt", "text")
+    assert base != summary_key("gpt-4.1", "prompt", "text")
+    assert base != summary_key("gpt-4.1-mini", "prompt2", "text")
+    assert base != summary_key("gpt-4.1-mini", "prompt", "text2")
+
+
+def test_summarize_reuses_cached_summary_across_runs(tmp_path: Path) -> None:
+    path = tmp_path / "summaries.sqlite3"
+    client = CountingOpenAI()
+    first = _cache(path)
+    Summarizer(api_key="dummy", client=client, cache=first).summarize("本文")
+    first.close()
+
+    second = _cache(path)
+    summary = Summarizer(api_key="dummy", client=client, cache=second).summarize("本文")
+
+    assert summary == "summary:本文"
+    assert client.calls == ["本文"]
+    stats = second.stats()
+    assert (stats.hits, stats.misses) == (1, 0)
+    assert stats.tokens_saved > 0
+
+
+def test_changing_the_prompt_invalidates_cached_summaries(tmp_path: Path) -> None:
+    cache = _cache(tmp_path / "summaries.sqlite3")
+    client = CountingOpenAI()
+    Summarizer(api_key="dummy", client=client, cache=cache, system_prompt="A").summarize("本文")
+    Summarizer(api_key="dummy", client=client, cache=cache, system_prompt="B").summarize("本文")
+
+    assert client.calls == ["本文", "本文"]
+
+
+def test_summarize_many_only_requests_misses(tmp_path: Path) -> None:
+    cache = _cache(tmp_path / "summaries.sqlite3")
+    client = CountingOpenAI()
+    summarizer = Summarizer(api_key="dummy", client=client, cache=cache)
+    summarizer.summarize("b")
+
+    outcomes = summarizer.summarize_many(["a", "b", "c"])
+
+    assert [o.summary for o in outcomes] == ["summary:a", "summary:b", "summary:c"]
+    assert sorted(client.calls) == ["a", "b", "c"]
+    assert client.calls.count("b") == 1
+
+
+def test_entries_expire_and_least_recently_used_are_evicted(tmp_path: Path) -> None:
+    now = [0.0]
+    cache = _cache(tmp_path / "summaries.sqlite3", ttl_seconds=100, max_entries=2, clock=lambda: now[0])
+    for key in ("k1", "k2"):
+        cache.put(key, key, tokens=1)
+        now[0] += 1
+    cache.get("k1")
+    cache.put("k3", "k3", tokens=1)
+
+    assert cache.get("k2") is None
+    assert cache.get("k1") == "k1"
+    assert cache.stats().evicted == 1
+
+    now[0] += 200
+    assert cache.get("k1") is None
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import codecs
+
+import httpx
+import pytest
+
+from raindrop_digest.text_extractor import extract_from_html, fetch_page, parse_html, sniff_encoding
+
+
+@pytest.mark.parametrize(
+    ("content", "header", "expected"),
+    [
+        (codecs.BOM_UTF8 + b"<meta charset='shift_jis'>", "euc-jp", "utf-8-sig"),
+        (b"<meta charset='utf-8'>", "EUC-JP", "euc_jp"),
+        (b"<html><head><meta charset=\"Shift_JIS\"></head>", None, "cp932"),
+        (b'<meta http-equiv="Content-Type" content="text/html; charset=euc-jp">', None, "euc_jp"),
+        (b"<meta charset='utf-16'>", None, "utf-8"),
+        (b"<meta charset='no-such-charset'>", "bogus", "utf-8"),
+        (b"<html>plain</html>", None, "utf-8"),
+    ],
+)
+def test_sniff_encoding_prefers_bom_then_header_then_meta(content: bytes, header: str | None, expected: str) -> None:
+    assert sniff_encoding(content, header) == expected
+
+
+def test_parse_html_reads_shift_jis_bytes_with_vendor_characters() -> None:
+    page = "<html><head><meta charset='Shift_JIS'></head><body><p>丸数字①を含む本文</p></body></html>"
+
+    tree = parse_html(page.encode("cp932"))
+
+    assert tree.findtext(".//p") == "丸数字①を含む本文"
+
+
+def test_parse_html_strips_utf8_bom_and_falls_back_for_encodings_unknown_to_libxml2() -> None:
+    bom_tree = parse_html(codecs.BOM_UTF8 + "<p>本文</p>".encode("utf-8"))
+    python_only = parse_html("<p>本文</p>".encode("utf-16-le"), encoding="utf-16-le")
+
+    assert bom_tree.text_content() == "本文"
+    assert python_only.text_content() == "本文"
+
+
+def test_fetch_page_keeps_bytes_and_sniffs_meta_charset() -> None:
+    paragraphs = "".join(f"<p>日本語の段落 {i}。本文として十分な長さの文章をここに置いておきます。</p>" for i in range(20))
+    body = f"<html><head><meta charset='euc-jp'></head><body><article>{paragraphs}</article></body></html>".encode(
+        "euc-jp"
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, request=request, headers={"Content-Type": "text/html"}, content=body)
+
+    page = fetch_page("https://example.com/jp", transport=httpx.MockTransport(handler))
+    content = extract_from_html(page.content, page.url, encoding=page.encoding)
+
+    assert page.content == body
+    assert page.encoding == "euc_jp"
+    assert "日本語の段落 0" in content.text
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import time
+
 import httpx
 import pytest
 
-from raindrop_digest.text_extractor import ExtractionError, fetch_html
+from raindrop_digest import text_extractor
+from raindrop_digest.text_extractor import (
+    ExtractionError,
+    build_http_client,
+    close_http_client,
+    fetch_html,
+    get_http_client,
+)
 
 
 def test_fetch_html_retries_with_alternate_user_agent_on_403(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -64,3 +73,162 @@ def test_fetch_html_wraps_request_error(monkeypatch: pytest.MonkeyPatch) -> None
         fetch_html("https://example.com/article", transport=transport)
 
     assert "HTTP request failed" in str(excinfo.value)
+
+
+def test_fetch_html_reuses_injected_client_across_urls_and_user_agents(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("HTTP_USER_AGENT", raising=False)
+
+    seen: list[tuple[str, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.path, request.headers.get("User-Agent", "")))
+        if request.url.path == "/blocked-once" and len(seen) == 1:
+            return httpx.Response(403, request=request, text="blocked")
+        return httpx.Response(200, request=request, text="<html>ok</html>")
+
+    client = build_http_client(transport=httpx.MockTransport(handler))
+    try:
+        fetch_html("https://example.com/blocked-once", client=client)
+        fetch_html("https://example.com/other", client=client)
+        assert not client.is_closed
+    finally:
+        client.close()
+
+    assert [path for path, _ in seen] == ["/blocked-once", "/blocked-once", "/other"]
+    assert seen[0][1] != seen[1][1]
+    assert seen[2][1] == seen[0][1]
+
+
+def test_shared_http_client_is_reused_until_closed() -> None:
+    first = get_http_client()
+    try:
+        assert get_http_client() is first
+    finally:
+        close_http_client()
+    assert first.is_closed
+    second = get_http_client()
+    try:
+        assert second is not first
+    finally:
+        close_http_client()
+
+
+def test_fetch_html_rejects_declared_non_html_without_reading_body() -> None:
+    consumed: list[bytes] = []
+
+    def body():
+        for chunk in (b"%PDF-1.7", b"0" * 1024):
+            consumed.append(chunk)
+            yield chunk
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, request=request, headers={"Content-Type": "application/pdf"}, content=body())
+
+    with pytest.raises(ExtractionError) as excinfo:
+        fetch_html("https://example.com/paper.pdf", transport=httpx.MockTransport(handler))
+
+    assert "application/pdf" in str(excinfo.value)
+    assert consumed == []
+
+
+def test_fetch_html_sniffs_binary_served_as_html() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            request=request,
+            headers={"Content-Type": "text/html"},
+            content=b"\x89PNG\r\n\x1a\n" + b"\x00" * 2048,
+        )
+
+    with pytest.raises(ExtractionError) as excinfo:
+        fetch_html("https://example.com/image", transport=httpx.MockTransport(handler))
+
+    assert "image/png" in str(excinfo.value)
+
+
+def test_fetch_html_accepts_unlabeled_markup_and_rejects_unlabeled_binary() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/page":
+            return httpx.Response(200, request=request, content=b"  <!doctype html><html>ok</html>")
+        return httpx.Response(200, request=request, content=b"\x00\x01\x02binary")
+
+    transport = httpx.MockTransport(handler)
+    assert fetch_html("https://example.com/page", transport=transport) == "  <!doctype html><html>ok</html>"
+    with pytest.raises(ExtractionError):
+        fetch_html("https://example.com/blob", transport=transport)
+
+
+def test_fetch_html_stops_reading_at_byte_cap(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(text_extractor, "MAX_FETCH_BYTES", 4096)
+    consumed: list[bytes] = []
+
+    def body():
+        yield b"<html><body>"
+        for _ in range(1000):
+            chunk = b"<p>" + b"a" * 1020 + b"</p>"
+            consumed.append(chunk)
+            yield chunk
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, request=request, headers={"Content-Type": "text/html; charset=utf-8"}, content=body())
+
+    html_text = fetch_html("https://example.com/endless", transport=httpx.MockTransport(handler))
+
+    assert len(html_text) == 4096
+    assert html_text.startswith("<html><body><p>")
+    assert len(consumed) < 10
+
+
+def test_fetch_html_deadline_covers_slow_body_reads(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(text_extractor, "FETCH_DEADLINE_SECONDS", 0.2)
+
+    def body():
+        yield b"<html><body>"
+        while True:
+            time.sleep(0.05)
+            yield b"<p>slow</p>"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, request=request, headers={"Content-Type": "text/html"}, content=body())
+
+    started = time.monotonic()
+    with pytest.raises(ExtractionError) as excinfo:
+        fetch_html("https://example.com/slow", transport=httpx.MockTransport(handler))
+
+    assert "deadline" in str(excinfo.value)
+    assert time.monotonic() - started < 1.0
+
+
+def test_hedged_fetch_takes_the_faster_user_agent(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("HTTP_USER_AGENT", raising=False)
+    monkeypatch.setattr(text_extractor, "FETCH_HEDGE_DELAY_MS", 50)
+    seen_user_agents: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        user_agent = request.headers["User-Agent"]
+        seen_user_agents.append(user_agent)
+        if user_agent == text_extractor.DEFAULT_PRIMARY_USER_AGENT:
+            time.sleep(0.5)
+            return httpx.Response(200, request=request, text="<html>slow</html>")
+        return httpx.Response(200, request=request, text="<html>fast</html>")
+
+    started = time.monotonic()
+    html_text = fetch_html("https://example.com/article", transport=httpx.MockTransport(handler))
+
+    assert html_text == "<html>fast</html>"
+    assert time.monotonic() - started < 0.4
+    assert seen_user_agents == [text_extractor.DEFAULT_PRIMARY_USER_AGENT, text_extractor.DEFAULT_SECONDARY_USER_AGENT]
+
+
+def test_hedged_fetch_reports_block_when_every_user_agent_is_refused(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("HTTP_USER_AGENT", raising=False)
+    monkeypatch.setattr(text_extractor, "FETCH_HEDGE_DELAY_MS", 50)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(403, request=request, text="blocked")
+
+    with pytest.raises(ExtractionError) as excinfo:
+        fetch_html("https://example.com/article", transport=httpx.MockTransport(handler))
+
+    assert "403" in str(excinfo.value)
+    assert "HTTP_USER_AGENT" in str(excinfo.value)
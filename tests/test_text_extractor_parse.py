@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from lxml import etree
+
+from raindrop_digest.text_extractor import extract_from_html, parse_html
+
+
+def _article(paragraphs: int = 20) -> str:
+    return "".join(f"<p>本文の段落 {i} です。十分な長さの文章をここに置きます。</p>" for i in range(paragraphs))
+
+
+def test_parse_html_strips_non_content_nodes_but_keeps_tail_text() -> None:
+    tree = parse_html(
+        "<html><head><style>p{}</style><script>var a=1;</script></head>"
+        "<body><nav>menu</nav><p>前<script>x()</script>後<!-- note --></p><noscript>js</noscript></body></html>"
+    )
+
+    assert tree.xpath("//script|//style|//nav|//noscript") == []
+    assert tree.xpath("//comment()") == []
+    assert tree.findtext(".//p") == "前後"
+    assert isinstance(tree, etree._Element)
+
+
+def test_extract_from_html_reads_hero_image_and_text_from_one_tree() -> None:
+    page = (
+        '<html><head><meta property="og:image" content="/img/hero.png" />'
+        "<script>tracking()</script></head><body><nav>メニュー</nav>"
+        f"<article>{_article()}</article></body></html>"
+    )
+
+    content = extract_from_html(page, "https://example.com/posts/1")
+
+    assert content.hero_image_url == "https://example.com/img/hero.png"
+    assert "本文の段落 0" in content.text
+    assert "tracking" not in content.text
+    assert "メニュー" not in content.text
+    assert content.length == len(content.text)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from raindrop_digest.text_extractor import EXTRACTION_METRICS, extract_cached, extract_from_html, get_extraction_pool
+
+URL = "https://example.com/posts/1"
+
+
+def _paragraphs(label: str, count: int = 20) -> str:
+    return "".join(f"<p>{label} の段落 {i}。本文として十分な長さの文章をここに置いておきます。</p>" for i in range(count))
+
+
+def test_jsonld_article_body_is_used_first() -> None:
+    body = "JSON-LD の本文です。" * 60
+    ld = json.dumps({"@context": "https://schema.org", "@graph": [{"@type": "NewsArticle", "articleBody": body}]})
+    page = (
+        f'<html><head><script type="application/ld+json">{ld}</script></head>'
+        f"<body><article>{_paragraphs('記事')}</article></body></html>"
+    )
+
+    content = extract_from_html(page, URL)
+
+    assert content.tier == "jsonld"
+    assert content.text == body.strip()
+
+
+def test_single_article_element_skips_boilerplate_inside_it() -> None:
+    page = (
+        "<html><body><header>サイト名</header><article><header>タグ一覧</header>"
+        f"{_paragraphs('記事')}<aside>関連記事</aside></article><footer>著作権</footer></body></html>"
+    )
+
+    content = extract_from_html(page, URL)
+
+    assert content.tier == "article"
+    assert "記事 の段落 0" in content.text
+    assert "関連記事" not in content.text
+    assert "タグ一覧" not in content.text
+
+
+def test_listing_page_with_many_articles_falls_through_to_main() -> None:
+    cards = "".join(f"<article><a href='/p/{i}'>カード {i}</a></article>" for i in range(5))
+    page = f"<html><body><main>{cards}{_paragraphs('メイン')}</main></body></html>"
+
+    assert extract_from_html(page, URL).tier == "main"
+
+
+def test_short_or_link_heavy_candidates_fall_back_to_readability() -> None:
+    links = "".join(f"<a href='/p/{i}'>リンクのテキストがずっと続きます {i}</a> " for i in range(40))
+    page = (
+        f"<html><body><main>{links}</main>"
+        f"<div class='content'>{_paragraphs('本文')}</div></body></html>"
+    )
+
+    EXTRACTION_METRICS.reset()
+    content = extract_from_html(page, URL)
+
+    assert content.tier == "readability"
+    assert EXTRACTION_METRICS.snapshot()["readability"].count == 1
+
+
+def test_extraction_in_worker_process_matches_inline_and_records_tier_in_parent() -> None:
+    page = f"<html><body><article>{_paragraphs('記事')}</article></body></html>".encode("utf-8")
+
+    EXTRACTION_METRICS.reset()
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pooled = extract_cached(page, URL, "web", None, encoding="utf-8", pool=pool)
+    inline = extract_from_html(page, URL, encoding="utf-8")
+
+    assert pooled == inline
+    assert EXTRACTION_METRICS.snapshot()["article"].count == 2
+
+
+def test_no_process_pool_by_default() -> None:
+    assert get_extraction_pool() is None
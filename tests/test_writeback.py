@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+import httpx
+
+from raindrop_digest.models import RaindropItem, SummaryResult
+from raindrop_digest.raindrop_client import RaindropClient
+from raindrop_digest.writeback import apply_writeback, build_writeback_plan
+
+
+def _item(item_id: int, tags=None, note=None) -> RaindropItem:
+    return RaindropItem(
+        id=item_id,
+        link=f"https://example.com/{item_id}",
+        title="t",
+        created=datetime(2024, 12, 7, tzinfo=timezone.utc),
+        tags=tags or [],
+        note=note,
+    )
+
+
+def test_build_writeback_plan_groups_tags_and_skips_noops():
+    results = [
+        SummaryResult(item=_item(1), status="success", summary="s1"),
+        SummaryResult(item=_item(2), status="success", summary="s2"),
+        SummaryResult(item=_item(3), status="failed", error="boom"),
+        SummaryResult(item=_item(4, tags=["配信済み"], note="▼サマリー\ns4"), status="success", summary="s4"),
+    ]
+
+    plan = build_writeback_plan(results)
+
+    assert [write.item_id for write in plan.notes] == [1, 2, 3]
+    assert plan.tag_groups == {(-1, ("配信済み",)): [1, 2], (-1, ("配信済み", "要約失敗")): [3]}
+    assert plan.skipped == 1
+
+
+def test_apply_writeback_uses_bulk_tags_and_skips_items_with_failed_notes():
+    requests: list[tuple[str, str, dict]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content) if request.content else {}
+        requests.append((request.method, request.url.path, body))
+        if request.url.path == "/rest/v1/raindrop/2":
+            return httpx.Response(400, json={"result": False})
+        return httpx.Response(200, json={"result": True})
+
+    client = RaindropClient(token="t", transport=httpx.MockTransport(handler))
+    results = [
+        SummaryResult(item=_item(1), status="success", summary="s1"),
+        SummaryResult(item=_item(2), status="success", summary="s2"),
+        SummaryResult(item=_item(3), status="success", summary="s3"),
+    ]
+
+    apply_writeback(client, results, max_workers=3)
+
+    note_paths = sorted(path for method, path, _ in requests if path.startswith("/rest/v1/raindrop/"))
+    assert note_paths == ["/rest/v1/raindrop/1", "/rest/v1/raindrop/2", "/rest/v1/raindrop/3"]
+    bulk = [(method, body) for method, path, body in requests if path == "/rest/v1/raindrops/-1"]
+    assert bulk == [("PUT", {"ids": [1, 3], "tags": ["配信済み"]})]
+
+
+def test_delete_items_sends_chunked_bulk_delete(monkeypatch):
+    monkeypatch.setattr("raindrop_digest.raindrop_client.BULK_CHUNK_SIZE", 2)
+    bodies: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.method == "DELETE"
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200, json={"result": True})
+
+    client = RaindropClient(token="t", transport=httpx.MockTransport(handler))
+    client.delete_items([10, 11, 12])
+
+    assert bodies == [{"ids": [10, 11]}, {"ids": [12]}]
+
+
+def test_build_writeback_plan_groups_tags_per_collection():
+    first = _item(1)
+    second = _item(2)
+    second.collection_id = 42
+
+    plan = build_writeback_plan(
+        [
+            SummaryResult(item=first, status="success", summary="s1"),
+            SummaryResult(item=second, status="success", summary="s2"),
+        ]
+    )
+
+    assert plan.tag_groups == {(-1, ("配信済み",)): [1], (42, ("配信済み",)): [2]}